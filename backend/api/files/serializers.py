@@ -1,9 +1,10 @@
-import filetype
 from django.conf import settings
 from django.core.files.uploadedfile import UploadedFile
+from django.urls import reverse
 from rest_framework import serializers
 
-from apps.files.models import FileAttachment
+from apps.files.models import FileAttachment, UploadSession, sniff_mime_type
+from apps.files.usage import get_user_quota, quota_exceeded
 from apps.projects.models import Project
 from apps.tasks.models import Task
 
@@ -18,6 +19,8 @@ class FileAttachmentSerializer(serializers.ModelSerializer):
     )
     is_image = serializers.SerializerMethodField()
     is_document = serializers.SerializerMethodField()
+    thumbnail_url = serializers.SerializerMethodField()
+    preview_url = serializers.SerializerMethodField()
 
     class Meta:
         model = FileAttachment
@@ -40,6 +43,8 @@ class FileAttachmentSerializer(serializers.ModelSerializer):
             "is_public",
             "is_image",
             "is_document",
+            "thumbnail_url",
+            "preview_url",
         ]
         read_only_fields = [
             "id",
@@ -61,6 +66,23 @@ class FileAttachmentSerializer(serializers.ModelSerializer):
         """Проверяет, является ли файл документом"""
         return obj.file_type == "document"
 
+    def get_thumbnail_url(self, obj):
+        """URL миниатюры изображения (None, пока она не создана)"""
+        return self._get_rendition_url(obj, "thumbnail")
+
+    def get_preview_url(self, obj):
+        """URL превью изображения (None, пока оно не создано)"""
+        return self._get_rendition_url(obj, "preview")
+
+    def _get_rendition_url(self, obj, name):
+        blob = obj.blob
+        if blob is None or not getattr(blob, name):
+            return None
+
+        url = reverse(f"file-{name}", args=[obj.pk])
+        request = self.context.get("request")
+        return request.build_absolute_uri(url) if request else url
+
     def to_representation(self, instance):
         """Добавляем URL файла в ответ"""
         representation = super().to_representation(instance)
@@ -114,23 +136,11 @@ class FileUploadSerializer(serializers.Serializer):
                 f"Файл слишком большой. Максимальный размер: {settings.MAX_UPLOAD_SIZE // (1024 * 1024)}MB"
             )
 
-        # Определяем MIME тип с помощью filetype
-        try:
-            # Читаем начало файла для определения типа
-            file_content = value.read(2048)  # ← ПЕРВОЕ: читаем файл
-            value.seek(0)  # Возвращаем указатель на начало
+        # Квота проверяется по готовому счётчику пользователя
+        self._check_quota(value.size)
 
-            # Используем filetype для определения MIME типа
-            kind = filetype.guess(file_content)  # ← ВТОРОЕ: определяем тип
-            if kind:
-                mime_type = kind.mime
-            else:
-                # Если filetype не смог определить
-                mime_type = value.content_type or "application/octet-stream"
-        except Exception as e:
-            # Если ошибка, используем content_type из файла
-            print(f"Error determining file type: {e}")
-            mime_type = value.content_type or "application/octet-stream"
+        # Тип определяется один раз и запоминается на файле для модели
+        mime_type = sniff_mime_type(value) or "application/octet-stream"
 
         # Проверяем разрешенные типы
         if mime_type not in settings.ALLOWED_FILE_TYPES:
@@ -141,6 +151,14 @@ class FileUploadSerializer(serializers.Serializer):
 
         return value
 
+    def _check_quota(self, size):
+        request = self.context.get("request")
+        if request and quota_exceeded(request.user, size):
+            raise serializers.ValidationError(
+                f"Превышена квота хранилища: "
+                f"{get_user_quota() // (1024 * 1024)}MB на пользователя"
+            )
+
     def validate(self, data):
         """Валидация данных"""
         # Проверяем, что файл прикреплен либо к задаче, либо к проекту, либо к пользователю
@@ -201,6 +219,58 @@ class FileUploadSerializer(serializers.Serializer):
         return file_attachment
 
 
+class UploadSessionCreateSerializer(FileUploadSerializer):
+    """Создание сессии загрузки частями: те же параметры, но без самого файла"""
+
+    file = None
+    filename = serializers.CharField(max_length=255, help_text="Имя файла")
+    size = serializers.IntegerField(min_value=1, help_text="Размер файла в байтах")
+
+    def validate_size(self, value):
+        if value > settings.CHUNKED_UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(
+                f"Файл слишком большой. Максимальный размер: "
+                f"{settings.CHUNKED_UPLOAD_MAX_SIZE // (1024 * 1024)}MB"
+            )
+        self._check_quota(value)
+        return value
+
+    def create(self, validated_data):
+        request = self.context["request"]
+        return UploadSession.objects.create(
+            uploaded_by=request.user,
+            filename=validated_data["filename"],
+            size=validated_data["size"],
+            task=validated_data.get("task"),
+            project=validated_data.get("project"),
+            description=validated_data.get("description", ""),
+            is_public=validated_data.get("is_public", False),
+        )
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    """Состояние сессии загрузки частями"""
+
+    chunk_size = serializers.SerializerMethodField()
+
+    class Meta:
+        model = UploadSession
+        fields = [
+            "id",
+            "filename",
+            "size",
+            "received",
+            "chunk_size",
+            "status",
+            "attachment",
+            "created_at",
+        ]
+        read_only_fields = fields
+
+    def get_chunk_size(self, obj):
+        return settings.CHUNKED_UPLOAD_CHUNK_SIZE
+
+
 class FileUpdateSerializer(serializers.ModelSerializer):
     """Сериализатор для обновления файла (только метаданные)"""
 
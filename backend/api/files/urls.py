@@ -4,14 +4,39 @@ from .views import (
     FileDetailView,
     FileDownloadView,
     FileListView,
+    FileRenditionView,
     FileUploadView,
     StorageStatsView,
+    UploadSessionCompleteView,
+    UploadSessionCreateView,
+    UploadSessionDetailView,
 )
 
 urlpatterns = [
     path("upload/", FileUploadView.as_view(), name="file-upload"),
+    path("uploads/", UploadSessionCreateView.as_view(), name="upload-session-create"),
+    path(
+        "uploads/<uuid:pk>/",
+        UploadSessionDetailView.as_view(),
+        name="upload-session-detail",
+    ),
+    path(
+        "uploads/<uuid:pk>/complete/",
+        UploadSessionCompleteView.as_view(),
+        name="upload-session-complete",
+    ),
     path("", FileListView.as_view(), name="file-list"),
     path("<int:pk>/", FileDetailView.as_view(), name="file-detail"),
     path("<int:pk>/download/", FileDownloadView.as_view(), name="file-download"),
+    path(
+        "<int:pk>/thumbnail/",
+        FileRenditionView.as_view(rendition="thumbnail"),
+        name="file-thumbnail",
+    ),
+    path(
+        "<int:pk>/preview/",
+        FileRenditionView.as_view(rendition="preview"),
+        name="file-preview",
+    ),
     path("stats/", StorageStatsView.as_view(), name="storage-stats"),
 ]
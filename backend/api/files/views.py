@@ -1,18 +1,32 @@
-from django.db.models import Q
+from django.core.exceptions import ValidationError
 from django.shortcuts import get_object_or_404
 from rest_framework import generics, permissions, status
 from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from apps.files.models import FileAttachment
-from apps.users.models import User
-from apps.users.permissions import IsAdminUser, IsManagerOrAdmin
+from api.pagination import StandardPagination
+from api.permissions import IsFileOwnerOrAdmin
+from apps.files.access import get_file_access
+from apps.files.counters import counts_as_download, record_download
+from apps.files.downloads import build_download_response, build_rendition_response
+from apps.files.models import FileAttachment, UploadSession
+from apps.files.uploads import (
+    OffsetMismatch,
+    UploadError,
+    abort_upload,
+    append_chunk,
+    complete_upload,
+)
+from apps.files.usage import get_storage_summary, get_top_users
+from apps.users.permissions import IsAdminUser
 
 from .serializers import (
     FileAttachmentSerializer,
     FileUpdateSerializer,
     FileUploadSerializer,
+    UploadSessionCreateSerializer,
+    UploadSessionSerializer,
 )
 
 
@@ -43,15 +57,95 @@ class FileUploadView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+class UploadSessionCreateView(APIView):
+    """Начало загрузки файла частями"""
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        serializer = UploadSessionCreateSerializer(
+            data=request.data, context={"request": request}
+        )
+        serializer.is_valid(raise_exception=True)
+        session = serializer.save()
+        return Response(
+            UploadSessionSerializer(session).data, status=status.HTTP_201_CREATED
+        )
+
+
+class UploadSessionDetailView(APIView):
+    """
+    Состояние загрузки (GET), отправка части (PUT с Content-Range)
+    и отмена (DELETE)
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_session(self, request, pk):
+        return get_object_or_404(UploadSession, pk=pk, uploaded_by=request.user)
+
+    def get(self, request, pk):
+        return Response(UploadSessionSerializer(self.get_session(request, pk)).data)
+
+    def put(self, request, pk):
+        session = self.get_session(request, pk)
+        try:
+            # Тело запроса читается потоком, без request.data
+            session = append_chunk(
+                session.pk, request.META.get("HTTP_CONTENT_RANGE", ""), request.stream
+            )
+        except OffsetMismatch as e:
+            return Response(
+                {"error": str(e), "received": e.offset}, status=status.HTTP_409_CONFLICT
+            )
+        except UploadError as e:
+            return Response(
+                {"error": str(e), "received": e.offset},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(UploadSessionSerializer(session).data)
+
+    def delete(self, request, pk):
+        abort_upload(self.get_session(request, pk))
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class UploadSessionCompleteView(APIView):
+    """Завершение загрузки частями: создаётся FileAttachment"""
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, pk):
+        session = get_object_or_404(UploadSession, pk=pk, uploaded_by=request.user)
+        try:
+            file_attachment = complete_upload(session.pk)
+        except UploadError as e:
+            return Response(
+                {"error": str(e), "received": e.offset},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        except ValidationError as e:
+            return Response({"file": e.messages}, status=status.HTTP_400_BAD_REQUEST)
+
+        response_serializer = FileAttachmentSerializer(
+            file_attachment, context={"request": request}
+        )
+        return Response(
+            {"message": "Файл успешно загружен", "file": response_serializer.data},
+            status=status.HTTP_201_CREATED,
+        )
+
+
 class FileListView(generics.ListAPIView):
     """Список файлов с фильтрацией"""
 
     serializer_class = FileAttachmentSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = StandardPagination
+    keyset_field = "upload_date"
 
     def get_queryset(self):
-        user = self.request.user
-        queryset = FileAttachment.objects.all()
+        queryset = FileAttachment.objects.select_related("blob", "uploaded_by")
 
         # Фильтрация по задачам
         task_id = self.request.query_params.get("task_id")
@@ -73,33 +167,13 @@ class FileListView(generics.ListAPIView):
         if file_type:
             queryset = queryset.filter(file_type=file_type)
 
-        # Фильтрация по публичным файлам или файлам пользователя
-        if user.is_admin:
-            # Админы видят все файлы
-            return queryset
-
-        # Менеджеры видят файлы своих проектов и публичные файлы
-        if user.is_manager:
-            return queryset.filter(
-                Q(is_public=True)
-                | Q(project__members=user)
-                | Q(project__creator=user)
-                | Q(uploaded_by=user)
-            ).distinct()
-
-        # Сотрудники видят только свои файлы и публичные файлы
-        return queryset.filter(
-            Q(is_public=True)
-            | Q(uploaded_by=user)
-            | Q(task__assignee=user)
-            | Q(project__members=user)
-        ).distinct()
+        # Доступные пользователю файлы - одно условие на подзапросах, без DISTINCT
+        return get_file_access(self.request).filter(queryset)
 
 
 class FileDetailView(generics.RetrieveUpdateDestroyAPIView):
     """Детали, обновление и удаление файла"""
 
-    queryset = FileAttachment.objects.all()
     serializer_class = FileAttachmentSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -110,39 +184,22 @@ class FileDetailView(generics.RetrieveUpdateDestroyAPIView):
 
     def get_permissions(self):
         if self.request.method in ["PUT", "PATCH", "DELETE"]:
-            # Для изменения/удаления нужны особые права
-            return [IsManagerOrAdmin()]
+            # Менять и удалять файл может загрузивший его, создатель проекта
+            # или администратор; остальным файл доступен только для чтения
+            return [permissions.IsAuthenticated(), IsFileOwnerOrAdmin()]
         return [permissions.IsAuthenticated()]
 
     def get_queryset(self):
-        user = self.request.user
-
         # Проверяем, не является ли это фейковым представлением для генерации схемы
         if getattr(self, "swagger_fake_view", False):
-            return User.objects.none()  # Возвращаем пустой queryset
-
-        # Безопасная проверка is_admin
-        if hasattr(user, "is_admin") and user.is_admin:
-            return User.objects.all()
-
-        # Для аутентифицированных не-админов
-        if user.is_authenticated:
-            return User.objects.filter(id=user.id)
-
-        if user.is_manager:
-            return FileAttachment.objects.filter(
-                Q(is_public=True)
-                | Q(project__members=user)
-                | Q(project__creator=user)
-                | Q(uploaded_by=user)
-            ).distinct()
+            return FileAttachment.objects.none()  # Возвращаем пустой queryset
 
-        return FileAttachment.objects.filter(
-            Q(is_public=True)
-            | Q(uploaded_by=user)
-            | Q(task__assignee=user)
-            | Q(project__members=user)
-        ).distinct()
+        # Права проверяются в том же запросе, что и выборка файла; проекты
+        # пользователя запоминаются на время запроса (get_file_access)
+        queryset = FileAttachment.objects.select_related(
+            "uploaded_by", "task__project", "project", "blob"
+        )
+        return get_file_access(self.request).filter(queryset)
 
 
 class FileDownloadView(APIView):
@@ -151,52 +208,38 @@ class FileDownloadView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request, pk):
-        file_attachment = get_object_or_404(FileAttachment, pk=pk)
+        file_attachment = get_object_or_404(
+            FileAttachment.objects.select_related("blob", "task"), pk=pk
+        )
 
         # Проверяем права доступа
-        user = request.user
-        can_access = False
-
-        if user.is_admin:
-            can_access = True
-        elif file_attachment.is_public:
-            can_access = True
-        elif user == file_attachment.uploaded_by:
-            can_access = True
-        elif file_attachment.task and file_attachment.task.assignee == user:
-            can_access = True
-        elif (
-            file_attachment.project
-            and file_attachment.project.members.filter(id=user.id).exists()
-        ):
-            can_access = True
-
-        if not can_access:
+        if not get_file_access(request).can_access(file_attachment):
             return Response(
                 {"error": "Нет доступа к этому файлу"}, status=status.HTTP_403_FORBIDDEN
             )
 
-        # Открываем файл для чтения
         try:
-            file = open(file_attachment.file.path, "rb")
-            response = Response(file)
-
-            # Устанавливаем заголовки для скачивания
-            response["Content-Disposition"] = (
-                f'attachment; filename="{file_attachment.original_filename}"'
-            )
-            response["Content-Type"] = file_attachment.mime_type
-            response["Content-Length"] = file_attachment.file_size
-
-            return response
-        except FileNotFoundError:
+            return self.build_response(request, file_attachment)
+        except (FileNotFoundError, ValueError):
             return Response(
                 {"error": "Файл не найден на сервере"}, status=status.HTTP_404_NOT_FOUND
             )
-        except Exception as e:
-            return Response(
-                {"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
+
+    def build_response(self, request, file_attachment):
+        response = build_download_response(request, file_attachment)
+        if counts_as_download(request, response):
+            # Счётчик пишется в БД пачкой, а не блокировкой строки на каждый запрос
+            record_download(file_attachment)
+        return response
+
+
+class FileRenditionView(FileDownloadView):
+    """Миниатюра или превью изображения (с теми же правами, что и скачивание)"""
+
+    rendition = "thumbnail"
+
+    def build_response(self, request, file_attachment):
+        return build_rendition_response(request, file_attachment, self.rendition)
 
 
 class StorageStatsView(APIView):
@@ -205,30 +248,15 @@ class StorageStatsView(APIView):
     permission_classes = [IsAdminUser]
 
     def get(self, request):
-        from django.db.models import Count, Sum
-
-        stats = FileAttachment.objects.aggregate(
-            total_files=Count("id"),
-            total_size=Sum("file_size"),
-            image_count=Count("id", filter=Q(file_type="image")),
-            document_count=Count("id", filter=Q(file_type="document")),
-        )
-
-        # Добавляем человекочитаемый размер
-        total_size = stats["total_size"] or 0
-        stats["total_size_human"] = self._human_readable_size(total_size)
-
-        # Статистика по пользователям
-        user_stats = (
-            FileAttachment.objects.values("uploaded_by__username")
-            .annotate(file_count=Count("id"), total_size=Sum("file_size"))
-            .order_by("-total_size")[:10]
-        )
+        # Готовые счётчики вместо агрегатов по всей таблице файлов
+        stats = get_storage_summary()
+        stats["total_size_human"] = self._human_readable_size(stats["total_size"])
+        stats["stored_size_human"] = self._human_readable_size(stats["stored_size"])
 
         return Response(
             {
                 "storage_stats": stats,
-                "top_users": user_stats,
+                "top_users": get_top_users(10),
             }
         )
 
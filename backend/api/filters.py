@@ -0,0 +1,20 @@
+from rest_framework.filters import SearchFilter
+
+from apps.tasks.search import search
+
+
+class FullTextSearchFilter(SearchFilter):
+    """
+    Параметр ``?search=`` через полнотекстовый поиск (apps.tasks.search).
+
+    Ищет по названию и описанию, самые подходящие сверху. Поле названия
+    задаётся атрибутом ``search_title_field`` у view (по умолчанию
+    ``title``).
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(self.search_param, "").strip()
+        if not text:
+            return queryset
+        title = getattr(view, "search_title_field", "title")
+        return search(queryset, text, title=title)
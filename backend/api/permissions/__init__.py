@@ -1,5 +1,6 @@
 from .permissions import (
     IsAdminUser,
+    IsFileOwnerOrAdmin,
     IsManagerOrAdmin,
     IsProjectMemberOrAdmin,
     IsTaskAssigneeOrAdmin,
@@ -7,6 +8,7 @@ from .permissions import (
 
 __all__ = [
     "IsAdminUser",
+    "IsFileOwnerOrAdmin",
     "IsManagerOrAdmin",
     "IsProjectMemberOrAdmin",
     "IsTaskAssigneeOrAdmin",
@@ -31,3 +31,19 @@ class IsTaskAssigneeOrAdmin(permissions.BasePermission):
         if request.user.is_admin:
             return True
         return request.user == obj.assignee
+
+
+class IsFileOwnerOrAdmin(permissions.BasePermission):
+    """Разрешает доступ загрузившему файл, создателю его проекта или администраторам"""
+
+    def has_object_permission(self, request, view, obj):
+        user = request.user
+        if user.is_admin or user.is_superuser:
+            return True
+        if obj.uploaded_by_id == user.pk:
+            return True
+        # Проект файла или задачи, к которой он прикреплён
+        project = obj.project
+        if project is None and obj.task_id:
+            project = obj.task.project
+        return project is not None and project.creator_id == user.pk
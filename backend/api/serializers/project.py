@@ -24,3 +24,12 @@ class ProjectSerializer(serializers.ModelSerializer):
             "updated_at",
         ]
         read_only_fields = ["id", "creator", "created_at", "updated_at"]
+
+
+class ProjectSummarySerializer(serializers.ModelSerializer):
+    """Краткая информация о проекте для вложения в задачи."""
+
+    class Meta:
+        model = Project
+        fields = ["id", "name", "status"]
+        read_only_fields = fields
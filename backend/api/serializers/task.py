@@ -1,9 +1,52 @@
 from rest_framework import serializers
 
-from apps.tasks.models import Task
+from api.serializers.project import ProjectSummarySerializer
+from api.serializers.user import UserSummarySerializer
+from apps.tasks.models import Task, TaskEvent
 
 
 class TaskSerializer(serializers.ModelSerializer):
+    # Вложенные объекты только для чтения, связи берутся из select_related
+    project_info = ProjectSummarySerializer(source="project", read_only=True)
+    assignee = UserSummarySerializer(read_only=True)
+    creator = UserSummarySerializer(read_only=True)
+    is_overdue = serializers.BooleanField(read_only=True)
+
     class Meta:
         model = Task
-        fields = ["id", "title", "description", "project", "status"]
+        fields = [
+            "id",
+            "title",
+            "description",
+            "project",
+            "project_info",
+            "status",
+            "priority",
+            "due_date",
+            "assignee",
+            "creator",
+            "is_overdue",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = ["priority", "due_date", "created_at", "updated_at"]
+
+
+class TaskEventSerializer(serializers.ModelSerializer):
+    """Запись журнала изменений задачи"""
+
+    actor = UserSummarySerializer(read_only=True)
+    kind_display = serializers.CharField(source="get_kind_display", read_only=True)
+
+    class Meta:
+        model = TaskEvent
+        fields = [
+            "id",
+            "kind",
+            "kind_display",
+            "old_value",
+            "new_value",
+            "actor",
+            "created_at",
+        ]
+        read_only_fields = fields
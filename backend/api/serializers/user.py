@@ -31,3 +31,14 @@ class UserSerializer(serializers.ModelSerializer):
             user.set_password(password)
         user.save()
         return user
+
+
+class UserSummarySerializer(serializers.ModelSerializer):
+    """Краткая информация о пользователе для вложения в другие объекты."""
+
+    full_name = serializers.CharField(source="get_full_name", read_only=True)
+
+    class Meta:
+        model = User
+        fields = ["id", "username", "full_name"]
+        read_only_fields = fields
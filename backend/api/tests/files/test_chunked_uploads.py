@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+import shutil
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.files.models import FileAttachment, UploadSession
+from apps.files.uploads import cleanup_expired_uploads
+from apps.projects.models import Project
+
+User = get_user_model()
+
+CONTENT = b"0123456789" * 3
+
+
+@override_settings(CHUNKED_UPLOAD_CHUNK_SIZE=10)
+class ChunkedUploadTestCase(TestCase):
+    """Тесты загрузки файлов частями"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="uploader", password="testpass123", role="manager"
+        )
+        self.project = Project.objects.create(name="Проект", creator=self.user)
+        self.project.members.add(self.user)
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def tearDown(self):
+        shutil.rmtree(settings.CHUNKED_UPLOAD_DIR, ignore_errors=True)
+        for attachment in FileAttachment.objects.all():
+            attachment.file.delete(save=False)
+
+    def start_upload(self, size=len(CONTENT), filename="notes.txt"):
+        return self.client.post(
+            "/api/files/uploads/",
+            {"filename": filename, "size": size, "project_id": self.project.id},
+            format="json",
+        )
+
+    def put_chunk(self, session_id, start, data, total=len(CONTENT)):
+        return self.client.put(
+            f"/api/files/uploads/{session_id}/",
+            data,
+            content_type="application/octet-stream",
+            HTTP_CONTENT_RANGE=f"bytes {start}-{start + len(data) - 1}/{total}",
+        )
+
+    def test_upload_in_chunks(self):
+        """Файл собирается из частей и переносится в хранилище"""
+        response = self.start_upload()
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["chunk_size"], 10)
+        session_id = response.data["id"]
+
+        for start in range(0, len(CONTENT), 10):
+            response = self.put_chunk(session_id, start, CONTENT[start : start + 10])
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["received"], len(CONTENT))
+
+        response = self.client.post(f"/api/files/uploads/{session_id}/complete/")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        attachment = FileAttachment.objects.get(pk=response.data["file"]["id"])
+        self.assertEqual(attachment.original_filename, "notes.txt")
+        self.assertEqual(attachment.file_size, len(CONTENT))
+        self.assertEqual(attachment.project, self.project)
+        with attachment.file.open("rb") as f:
+            self.assertEqual(f.read(), CONTENT)
+
+        session = UploadSession.objects.get(pk=session_id)
+        self.assertEqual(session.status, "complete")
+        self.assertFalse(session.temp_path.exists())
+
+    def test_resume_after_wrong_offset(self):
+        """Часть не с того смещения отклоняется, клиент продолжает с received"""
+        session_id = self.start_upload().data["id"]
+        self.put_chunk(session_id, 0, CONTENT[:10])
+
+        response = self.put_chunk(session_id, 20, CONTENT[20:])
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data["received"], 10)
+
+        # Повтор уже принятой части тоже не портит файл
+        response = self.put_chunk(session_id, 0, CONTENT[:10])
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+        received = self.client.get(f"/api/files/uploads/{session_id}/").data["received"]
+        self.put_chunk(session_id, received, CONTENT[received:20])
+        self.put_chunk(session_id, 20, CONTENT[20:])
+
+        response = self.client.post(f"/api/files/uploads/{session_id}/complete/")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_chunk_validation(self):
+        """Без Content-Range, больше лимита части или размера файла - 400"""
+        session_id = self.start_upload().data["id"]
+
+        response = self.client.put(
+            f"/api/files/uploads/{session_id}/",
+            CONTENT[:10],
+            content_type="application/octet-stream",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.put_chunk(session_id, 0, CONTENT[:20])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.put_chunk(session_id, 0, CONTENT[:10], total=100)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_complete_requires_all_bytes(self):
+        """Завершить неполную загрузку нельзя"""
+        session_id = self.start_upload().data["id"]
+        self.put_chunk(session_id, 0, CONTENT[:10])
+
+        response = self.client.post(f"/api/files/uploads/{session_id}/complete/")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["received"], 10)
+        self.assertFalse(FileAttachment.objects.exists())
+
+    def test_forbidden_file_type(self):
+        """Собранный файл проходит ту же проверку типа, что и обычная загрузка"""
+        session_id = self.start_upload(filename="script.php").data["id"]
+        for start in range(0, len(CONTENT), 10):
+            self.put_chunk(session_id, start, CONTENT[start : start + 10])
+
+        response = self.client.post(f"/api/files/uploads/{session_id}/complete/")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("file", response.data)
+
+    @override_settings(CHUNKED_UPLOAD_MAX_SIZE=20)
+    def test_size_limit(self):
+        """Размер файла ограничен CHUNKED_UPLOAD_MAX_SIZE"""
+        response = self.start_upload(size=21)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("size", response.data)
+
+    def test_other_user_session(self):
+        """Чужая сессия загрузки не видна"""
+        session_id = self.start_upload().data["id"]
+        other = User.objects.create_user(username="other", password="testpass123")
+        client = APIClient()
+        client.force_authenticate(user=other)
+
+        response = client.get(f"/api/files/uploads/{session_id}/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_abort_and_cleanup(self):
+        """Отмена и очистка удаляют временные файлы"""
+        session_id = self.start_upload().data["id"]
+        self.put_chunk(session_id, 0, CONTENT[:10])
+        session = UploadSession.objects.get(pk=session_id)
+        self.assertTrue(session.temp_path.exists())
+
+        response = self.client.delete(f"/api/files/uploads/{session_id}/")
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(session.temp_path.exists())
+
+        stale_id = self.start_upload().data["id"]
+        self.put_chunk(stale_id, 0, CONTENT[:10])
+        UploadSession.objects.filter(pk=stale_id).update(
+            updated_at=session.updated_at - timedelta(days=2)
+        )
+        self.start_upload()
+
+        self.assertEqual(cleanup_expired_uploads(), 1)
+        self.assertEqual(UploadSession.objects.count(), 1)
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+import hashlib
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import DatabaseError
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.files.models import FileAttachment, FileBlob
+from apps.projects.models import Project
+from apps.tasks.models import Task
+
+User = get_user_model()
+
+PDF = b"%PDF-1.4 duplicate document"
+
+
+class FileDedupTestCase(TestCase):
+    """Тесты дедупликации содержимого файлов"""
+
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            username="admin_dedup", password="testpass123", role="admin"
+        )
+        self.project = Project.objects.create(name="Проект", creator=self.admin)
+        self.task = Task.objects.create(
+            title="Задача", project=self.project, creator=self.admin
+        )
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def tearDown(self):
+        for blob in FileBlob.objects.all():
+            blob.file.delete(save=False)
+
+    def attach(self, name="report.pdf", content=PDF, **kwargs):
+        return FileAttachment.objects.create(
+            file=SimpleUploadedFile(name, content),
+            uploaded_by=self.admin,
+            project=self.project,
+            **kwargs,
+        )
+
+    def test_same_content_stored_once(self):
+        """Одинаковые файлы ссылаются на один блоб"""
+        first = self.attach()
+        second = self.attach(name="copy.pdf", task=self.task)
+        other = self.attach(name="other.pdf", content=b"%PDF-1.4 other")
+
+        self.assertEqual(first.blob_id, second.blob_id)
+        self.assertEqual(first.file.name, second.file.name)
+        self.assertNotEqual(first.blob_id, other.blob_id)
+        self.assertEqual(second.original_filename, "copy.pdf")
+        self.assertEqual(FileBlob.objects.get(pk=first.blob_id).ref_count, 2)
+        with second.file.open("rb") as f:
+            self.assertEqual(f.read(), PDF)
+
+    def test_delete_releases_blob(self):
+        """Файл удаляется вместе с последней ссылкой"""
+        first = self.attach()
+        second = self.attach(task=self.task)
+        name = first.file.name
+
+        first.delete()
+        blob = FileBlob.objects.get(pk=second.blob_id)
+        self.assertEqual(blob.ref_count, 1)
+        self.assertTrue(default_storage.exists(name))
+
+        # Каскадное удаление вместе с задачей тоже освобождает ссылку
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task.delete()
+        self.assertFalse(FileBlob.objects.exists())
+        self.assertFalse(default_storage.exists(name))
+
+    def test_failed_insert_keeps_ref_count(self):
+        """Если вложение не записалось, ссылка на блоб не остаётся"""
+        first = self.attach()
+
+        with mock.patch.object(
+            FileAttachment, "save_base", side_effect=DatabaseError("insert failed")
+        ):
+            with self.assertRaises(DatabaseError):
+                self.attach(name="copy.pdf")
+
+        self.assertEqual(FileBlob.objects.get(pk=first.blob_id).ref_count, 1)
+        self.assertEqual(FileAttachment.objects.count(), 1)
+
+    def test_concurrent_upload_removes_losing_copy(self):
+        """Проигравшая гонку загрузка удаляет свою копию файла"""
+        winner = FileBlob.objects.create(
+            sha256=hashlib.sha256(PDF).hexdigest(),
+            file=default_storage.save("blobs/winner.pdf", ContentFile(PDF)),
+            size=len(PDF),
+            ref_count=1,
+        )
+
+        # Блоб ещё не виден в момент проверки: как у параллельной транзакции
+        with mock.patch("django.db.models.query.QuerySet.first", return_value=None):
+            with mock.patch.object(
+                default_storage, "delete", wraps=default_storage.delete
+            ) as delete:
+                attachment = self.attach()
+
+        self.assertEqual(attachment.blob_id, winner.pk)
+        self.assertEqual(attachment.file.name, winner.file.name)
+        self.assertEqual(FileBlob.objects.get(pk=winner.pk).ref_count, 2)
+        (lost,) = delete.call_args.args
+        self.assertNotEqual(lost, winner.file.name)
+        self.assertFalse(default_storage.exists(lost))
+
+    def test_storage_stats_dedup_ratio(self):
+        """Статистика показывает коэффициент дедупликации"""
+        for _ in range(3):
+            self.attach()
+
+        response = self.client.get("/api/files/stats/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        stats = response.data["storage_stats"]
+        self.assertEqual(stats["total_size"], 3 * len(PDF))
+        self.assertEqual(stats["stored_size"], len(PDF))
+        self.assertEqual(stats["blob_count"], 1)
+        self.assertEqual(stats["dedup_ratio"], 3.0)
+
+    def test_dedupe_legacy_files(self):
+        """Команда dedupe_files объединяет старые файлы без блоба"""
+        names = [
+            default_storage.save(f"uploads/general/legacy_{i}.pdf", ContentFile(PDF))
+            for i in range(2)
+        ]
+        legacy = [
+            FileAttachment.objects.create(file=name, uploaded_by=self.admin)
+            for name in names
+        ]
+        self.assertIsNone(legacy[0].blob_id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("dedupe_files", stdout=StringIO())
+
+        blob = FileBlob.objects.get()
+        self.assertEqual(blob.ref_count, 2)
+        self.assertEqual(blob.file.name, names[0])
+        self.assertFalse(default_storage.exists(names[1]))
+        for attachment in legacy:
+            attachment.refresh_from_db()
+            self.assertEqual(attachment.blob, blob)
+            self.assertEqual(attachment.file.name, names[0])
@@ -0,0 +1,131 @@
+import threading
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from apps.files.counters import DownloadCounter, download_counter
+from apps.files.models import FileAttachment
+
+User = get_user_model()
+
+CONTENT = b"0123456789" * 10
+
+
+@override_settings(
+    FILE_DOWNLOAD_COUNTER_FLUSH_SECONDS=3600, FILE_DOWNLOAD_COUNTER_MAX_PENDING=1000
+)
+class DownloadCounterTestCase(TestCase):
+    """Тесты буферизованного счётчика скачиваний"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="counter", password="x")
+        self.first, self.second = (
+            FileAttachment.objects.create(
+                file=SimpleUploadedFile(name, CONTENT, content_type="text/plain"),
+                uploaded_by=self.user,
+                is_public=True,
+            )
+            for name in ("first.txt", "second.txt")
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        download_counter.flush()
+
+    def tearDown(self):
+        self.first.file.delete(save=False)
+
+    def test_hits_flushed_in_bulk(self):
+        """Скачивания копятся в памяти и пишутся одним UPDATE на число"""
+        counter = DownloadCounter()
+        for _ in range(3):
+            counter.record(self.first.pk)
+            counter.record(self.second.pk)
+        counter.record(self.first.pk)
+
+        self.first.refresh_from_db()
+        self.assertEqual(self.first.download_count, 0)
+        self.assertEqual(counter.pending(), 7)
+
+        with self.assertNumQueries(2):
+            self.assertEqual(counter.flush(), 7)
+
+        self.first.refresh_from_db()
+        self.second.refresh_from_db()
+        self.assertEqual(self.first.download_count, 4)
+        self.assertEqual(self.second.download_count, 3)
+        self.assertIsNotNone(self.first.last_accessed)
+        self.assertEqual(counter.pending(), 0)
+
+    @override_settings(FILE_DOWNLOAD_COUNTER_MAX_PENDING=3)
+    def test_flush_when_buffer_full(self):
+        """Буфер сбрасывается, когда накоплено MAX_PENDING скачиваний"""
+        counter = DownloadCounter()
+        for _ in range(3):
+            counter.record(self.first.pk)
+
+        self.first.refresh_from_db()
+        self.assertEqual(self.first.download_count, 3)
+        self.assertEqual(counter.pending(), 0)
+
+    def test_download_view_records_hits(self):
+        """Полные скачивания считаются, докачка и 304 - нет"""
+        url = f"/api/files/{self.first.pk}/download/"
+
+        response = self.client.get(url)
+        etag = response["ETag"]
+        response.close()
+        self.client.get(url, HTTP_RANGE="bytes=0-9").close()
+        self.client.get(url, HTTP_RANGE="bytes=10-19").close()
+        self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(download_counter.pending(), 2)
+        download_counter.flush()
+        self.first.refresh_from_db()
+        self.assertEqual(self.first.download_count, 2)
+
+    @override_settings(FILE_DOWNLOAD_X_ACCEL_REDIRECT=True)
+    def test_x_accel_range_requests(self):
+        """С X-Accel-Redirect докачка определяется по заголовку Range"""
+        url = f"/api/files/{self.first.pk}/download/"
+
+        self.client.get(url)
+        self.client.get(url, HTTP_RANGE="bytes=0-9")
+        response = self.client.get(url, HTTP_RANGE="bytes=10-19")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("X-Accel-Redirect", response)
+        self.assertEqual(download_counter.pending(), 2)
+
+    @override_settings(
+        FILE_DOWNLOAD_COUNTER_FLUSH_THREAD=True,
+        FILE_DOWNLOAD_COUNTER_FLUSH_SECONDS=0.01,
+    )
+    def test_background_flush(self):
+        """Буфер сбрасывает фоновый поток, без следующего скачивания"""
+        counter = DownloadCounter()
+        flushed = threading.Event()
+
+        def flush():
+            if threading.current_thread().name == "download-counter":
+                flushed.set()
+
+        with mock.patch.object(counter, "flush", side_effect=flush):
+            counter.record(self.first.pk)
+            self.assertTrue(flushed.wait(5))
+            # Поток завершается, как в процессе, унаследовавшем его после fork
+            counter._flusher_pid = None
+            counter._flusher.join(5)
+        self.assertFalse(counter._flusher.is_alive())
+
+    def test_increment_download_count(self):
+        """Прямое увеличение счётчика атомарно"""
+        stale = FileAttachment.objects.get(pk=self.first.pk)
+        with self.assertNumQueries(1):
+            self.first.increment_download_count()
+        with self.assertNumQueries(2):
+            stale.increment_download_count(refresh=True)
+
+        self.assertEqual(stale.download_count, 2)
@@ -0,0 +1,102 @@
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from apps.files.models import FileAttachment
+
+User = get_user_model()
+
+CONTENT = b"0123456789" * 100
+
+
+class FileDownloadTestCase(TestCase):
+    """Тесты скачивания файлов: Range, условные запросы, X-Accel-Redirect"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="download_user",
+            email="download@test.com",
+            password="password123",
+        )
+        self.attachment = FileAttachment.objects.create(
+            file=SimpleUploadedFile("report.txt", CONTENT, content_type="text/plain"),
+            uploaded_by=self.user,
+        )
+        self.url = f"/api/files/{self.attachment.pk}/download/"
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def tearDown(self):
+        self.attachment.file.delete(save=False)
+
+    def test_full_download(self):
+        """Полный файл стримится с ETag и Last-Modified"""
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(b"".join(response.streaming_content), CONTENT)
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertIn("ETag", response)
+        self.assertIn("Last-Modified", response)
+        self.assertIn("attachment", response["Content-Disposition"])
+
+    def test_range_request(self):
+        """Запрос диапазона возвращает 206 и нужные байты"""
+        response = self.client.get(self.url, HTTP_RANGE="bytes=10-19")
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b"".join(response.streaming_content), CONTENT[10:20])
+        self.assertEqual(response["Content-Range"], f"bytes 10-19/{len(CONTENT)}")
+        self.assertEqual(response["Content-Length"], "10")
+
+    def test_suffix_range(self):
+        """bytes=-N - последние N байт"""
+        response = self.client.get(self.url, HTTP_RANGE="bytes=-5")
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b"".join(response.streaming_content), CONTENT[-5:])
+
+    def test_unsatisfiable_range(self):
+        """Диапазон за пределами файла - 416"""
+        response = self.client.get(self.url, HTTP_RANGE="bytes=5000-")
+
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], f"bytes */{len(CONTENT)}")
+
+    def test_if_range_mismatch_returns_full_file(self):
+        """Устаревший If-Range - отдаётся весь файл"""
+        response = self.client.get(
+            self.url, HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE='"stale"'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), CONTENT)
+
+    def test_if_none_match(self):
+        """Совпавший ETag - 304 без тела"""
+        etag = self.client.get(self.url)["ETag"]
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+
+    @override_settings(FILE_DOWNLOAD_X_ACCEL_REDIRECT=True)
+    def test_x_accel_redirect(self):
+        """В продакшене файл передаётся nginx"""
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response["X-Accel-Redirect"],
+            f"/protected-media/{self.attachment.file.name}",
+        )
+        self.assertEqual(response.content, b"")
+        self.assertIn("ETag", response)
+
+    def test_missing_file(self):
+        """Файл удалён с диска - 404"""
+        self.attachment.file.storage.delete(self.attachment.file.name)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 404)
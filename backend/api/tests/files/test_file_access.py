@@ -0,0 +1,128 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.files.access import FileAccess
+from apps.files.models import FileAttachment
+from apps.projects.models import Project
+from apps.tasks.models import Task
+
+User = get_user_model()
+
+
+class FileAccessTestCase(TestCase):
+    """Тесты единого правила доступа к файлам"""
+
+    def setUp(self):
+        self.employee = User.objects.create_user(username="employee", password="x")
+        self.owner = User.objects.create_user(username="owner", password="x")
+        self.admin = User.objects.create_user(
+            username="admin_access", password="x", role="admin"
+        )
+
+        self.member_project = Project.objects.create(name="Свой", creator=self.owner)
+        self.member_project.members.add(self.employee)
+        self.own_project = Project.objects.create(
+            name="Созданный", creator=self.employee
+        )
+        self.foreign_project = Project.objects.create(name="Чужой", creator=self.owner)
+
+        self.assigned_task = Task.objects.create(
+            title="Назначена",
+            project=self.foreign_project,
+            creator=self.owner,
+            assignee=self.employee,
+        )
+        self.member_task = Task.objects.create(
+            title="В своём проекте", project=self.member_project, creator=self.owner
+        )
+        self.foreign_task = Task.objects.create(
+            title="Чужая", project=self.foreign_project, creator=self.owner
+        )
+
+        self.visible = {
+            "public": self.make(is_public=True),
+            "uploaded": self.make(uploaded_by=self.employee),
+            "personal": self.make(user=self.employee),
+            "member_project": self.make(project=self.member_project),
+            "own_project": self.make(project=self.own_project),
+            "assigned_task": self.make(task=self.assigned_task),
+            "member_task": self.make(task=self.member_task),
+        }
+        self.hidden = {
+            "foreign_project": self.make(project=self.foreign_project),
+            "foreign_task": self.make(task=self.foreign_task),
+            "private": self.make(),
+        }
+
+    def make(self, **kwargs):
+        # bulk_create не вызывает save(), файл на диске не нужен
+        kwargs.setdefault("uploaded_by", self.owner)
+        (attachment,) = FileAttachment.objects.bulk_create(
+            [
+                FileAttachment(
+                    file="uploads/general/file.txt",
+                    original_filename="file.txt",
+                    file_type="document",
+                    mime_type="text/plain",
+                    file_size=1,
+                    **kwargs,
+                )
+            ]
+        )
+        return attachment
+
+    def test_queryset_and_object_checks_agree(self):
+        """Фильтр списка и проверка одного файла дают один результат"""
+        visible_ids = set(
+            FileAttachment.objects.visible_to(self.employee).values_list(
+                "pk", flat=True
+            )
+        )
+        self.assertEqual(visible_ids, {f.pk for f in self.visible.values()})
+
+        access = FileAccess(self.employee)
+        for name, attachment in self.visible.items():
+            self.assertTrue(access.can_access(attachment), name)
+            self.assertTrue(attachment.can_access(self.employee), name)
+        for name, attachment in self.hidden.items():
+            self.assertFalse(access.can_access(attachment), name)
+
+        admin_ids = FileAttachment.objects.visible_to(self.admin).values_list(
+            "pk", flat=True
+        )
+        self.assertEqual(len(admin_ids), len(self.visible) + len(self.hidden))
+
+    def test_predicate_without_joins(self):
+        """Условие строится на подзапросах: без JOIN и DISTINCT"""
+        with CaptureQueriesContext(connection) as queries:
+            list(FileAttachment.objects.visible_to(self.employee))
+
+        sql = queries[0]["sql"].upper()
+        self.assertNotIn("DISTINCT", sql)
+        self.assertNotIn("JOIN", sql)
+
+    def test_membership_loaded_once(self):
+        """Проверка многих файлов - один запрос проектов пользователя"""
+        for _ in range(100):
+            self.make(task=self.member_task)
+        attachments = list(FileAttachment.objects.select_related("task"))
+
+        access = FileAccess(self.employee)
+        with self.assertNumQueries(1):
+            allowed = [a for a in attachments if access.can_access(a)]
+        self.assertEqual(len(allowed), 100 + len(self.visible))
+
+    def test_list_and_download(self):
+        """Список и скачивание используют то же правило"""
+        client = APIClient()
+        client.force_authenticate(user=self.employee)
+
+        response = client.get("/api/files/?page_size=100")
+        ids = {item["id"] for item in response.data["results"]}
+        self.assertEqual(ids, {f.pk for f in self.visible.values()})
+
+        response = client.get(f"/api/files/{self.hidden['foreign_task'].pk}/download/")
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,97 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.files.models import FileAttachment
+from apps.projects.models import Project
+from apps.tasks.models import Task
+
+User = get_user_model()
+
+
+class FileDetailTestCase(TestCase):
+    """Тесты деталей, обновления и удаления файла"""
+
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            username="admin_detail", password="x", role="admin"
+        )
+        self.manager = User.objects.create_user(
+            username="manager_detail", password="x", role="manager"
+        )
+        self.outsider = User.objects.create_user(username="outsider", password="x")
+
+        self.project = Project.objects.create(name="Проект", creator=self.manager)
+        self.task = Task.objects.create(
+            title="Задача", project=self.project, creator=self.manager
+        )
+        # bulk_create не вызывает save(), файл на диске не нужен
+        (self.attachment,) = FileAttachment.objects.bulk_create(
+            [
+                FileAttachment(
+                    file="uploads/general/spec.txt",
+                    original_filename="spec.txt",
+                    file_type="document",
+                    mime_type="text/plain",
+                    file_size=10,
+                    uploaded_by=self.manager,
+                    project=self.project,
+                    task=self.task,
+                )
+            ]
+        )
+        self.url = f"/api/files/{self.attachment.pk}/"
+
+    def client_for(self, user):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+    def test_retrieve_single_query(self):
+        """Файл и права проверяются одним запросом"""
+        for user in (self.admin, self.manager):
+            client = self.client_for(user)
+            with self.assertNumQueries(1):
+                response = client.get(self.url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data["id"], self.attachment.pk)
+            self.assertEqual(response.data["uploaded_by_username"], "manager_detail")
+
+    def test_hidden_file_not_found(self):
+        """Недоступный файл не найден"""
+        response = self.client_for(self.outsider).get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_update(self):
+        """Менеджер проекта меняет описание: выборка и UPDATE"""
+        client = self.client_for(self.manager)
+        with self.assertNumQueries(2):
+            response = client.patch(self.url, {"description": "Новое"}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.attachment.refresh_from_db()
+        self.assertEqual(self.attachment.description, "Новое")
+
+    def test_other_project_manager_forbidden(self):
+        """Менеджер другого проекта видит публичный файл, но не меняет его"""
+        other = User.objects.create_user(
+            username="other_manager", password="x", role="manager"
+        )
+        Project.objects.create(name="Другой проект", creator=other)
+        FileAttachment.objects.filter(pk=self.attachment.pk).update(is_public=True)
+        client = self.client_for(other)
+
+        self.assertEqual(client.get(self.url).status_code, status.HTTP_200_OK)
+        response = client.patch(self.url, {"description": "Чужое"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        response = client.delete(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertTrue(FileAttachment.objects.filter(pk=self.attachment.pk).exists())
+
+    def test_delete(self):
+        """Удаление файла администратором"""
+        response = self.client_for(self.admin).delete(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(FileAttachment.objects.filter(pk=self.attachment.pk).exists())
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+from io import StringIO
+from unittest import mock
+
+import filetype
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.files.models import FileAttachment, FileBlob, sniff_mime_type
+from apps.projects.models import Project
+
+User = get_user_model()
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+
+
+class MimeSniffingTestCase(TestCase):
+    """Тесты однократного определения MIME типа"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="sniffer", password="testpass123", role="manager"
+        )
+        self.project = Project.objects.create(name="Проект", creator=self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def tearDown(self):
+        for blob in FileBlob.objects.all():
+            blob.file.delete(save=False)
+
+    def test_upload_sniffs_once(self):
+        """Сериализатор и модель используют один результат определения"""
+        upload = SimpleUploadedFile("picture.png", PNG, content_type="image/png")
+
+        with mock.patch(
+            "apps.files.models.filetype.guess", wraps=filetype.guess
+        ) as guess:
+            response = self.client.post(
+                "/api/files/upload/",
+                {"file": upload, "project_id": self.project.id},
+                format="multipart",
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(guess.call_count, 1)
+        attachment = FileAttachment.objects.get()
+        self.assertEqual(attachment.mime_type, "image/png")
+        self.assertEqual(attachment.file_type, "image")
+
+    def test_signature_wins_over_extension(self):
+        """Тип по содержимому важнее расширения и Content-Type клиента"""
+        upload = SimpleUploadedFile("notes.txt", PNG, content_type="text/plain")
+        self.assertEqual(sniff_mime_type(upload), "image/png")
+
+    def test_fallbacks(self):
+        """Без сигнатуры - расширение, затем Content-Type клиента"""
+        by_extension = SimpleUploadedFile("notes.txt", b"hello")
+        self.assertEqual(sniff_mime_type(by_extension), "text/plain")
+
+        by_header = SimpleUploadedFile(
+            "noextension", b"hello", content_type="application/pdf"
+        )
+        self.assertEqual(sniff_mime_type(by_header), "application/pdf")
+
+    def test_benchmark_command(self):
+        """Команда benchmark_mime_sniffing выводит замеры по образцам"""
+        out = StringIO()
+        call_command("benchmark_mime_sniffing", iterations=10, stdout=out)
+        self.assertIn("PDF", out.getvalue())
+        self.assertIn("на загрузку", out.getvalue())
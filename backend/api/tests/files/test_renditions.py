@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+from io import BytesIO, StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.files.models import FileAttachment, FileBlob
+from apps.files.renditions import process_pending
+from apps.projects.models import Project
+
+User = get_user_model()
+
+
+def make_png(size=(2000, 1000), mode="RGBA"):
+    buffer = BytesIO()
+    Image.new(mode, size, (200, 10, 10, 128)[: len(mode)]).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+class RenditionTestCase(TestCase):
+    """Тесты фонового создания миниатюр и превью"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="photographer", password="testpass123", role="manager"
+        )
+        self.project = Project.objects.create(name="Проект", creator=self.user)
+        self.project.members.add(self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def tearDown(self):
+        for blob in FileBlob.objects.all():
+            for field in (blob.file, blob.thumbnail, blob.preview):
+                if field:
+                    field.delete(save=False)
+
+    def upload(self, name="photo.png", content=None):
+        response = self.client.post(
+            "/api/files/upload/",
+            {
+                "file": SimpleUploadedFile(name, content or make_png()),
+                "project_id": self.project.id,
+            },
+            format="multipart",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response.data["file"]
+
+    def test_upload_queues_without_rendering(self):
+        """Загрузка только ставит изображение в очередь"""
+        data = self.upload()
+        self.assertIsNone(data["thumbnail_url"])
+
+        blob = FileAttachment.objects.get(pk=data["id"]).blob
+        self.assertEqual(blob.rendition_status, "pending")
+        self.assertFalse(blob.thumbnail)
+
+        document = self.upload(name="notes.txt", content=b"plain text")
+        blob = FileAttachment.objects.get(pk=document["id"]).blob
+        self.assertEqual(blob.rendition_status, "none")
+
+    def test_worker_creates_renditions(self):
+        """Воркер создаёт копии, API отдаёт thumbnail_url"""
+        data = self.upload()
+        self.assertEqual(process_pending(), (1, 0))
+
+        blob = FileAttachment.objects.get(pk=data["id"]).blob
+        self.assertEqual(blob.rendition_status, "ready")
+        with blob.thumbnail.open("rb") as f, Image.open(f) as image:
+            self.assertEqual(image.format, "JPEG")
+            self.assertEqual(image.size, (256, 128))
+        with blob.preview.open("rb") as f, Image.open(f) as image:
+            self.assertEqual(image.size, (1024, 512))
+
+        response = self.client.get(f"/api/files/?project_id={self.project.id}")
+        item = response.data["results"][0]
+        self.assertTrue(
+            item["thumbnail_url"].endswith(f"/api/files/{data['id']}/thumbnail/")
+        )
+        self.assertTrue(
+            item["preview_url"].endswith(f"/api/files/{data['id']}/preview/")
+        )
+
+        response = self.client.get(f"/api/files/{data['id']}/thumbnail/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "image/jpeg")
+        self.assertTrue(response["Content-Disposition"].startswith("inline"))
+        self.assertIn("max-age", response["Cache-Control"])
+        response.close()
+
+    def test_rendition_access(self):
+        """Миниатюра закрыта так же, как и сам файл"""
+        data = self.upload()
+        process_pending()
+
+        outsider = User.objects.create_user(username="outsider", password="x")
+        client = APIClient()
+        client.force_authenticate(user=outsider)
+        response = client.get(f"/api/files/{data['id']}/thumbnail/")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_broken_image_marked_failed(self):
+        """Повреждённое изображение не блокирует очередь"""
+        data = self.upload(content=make_png()[:100])
+        self.assertEqual(process_pending(), (0, 1))
+
+        blob = FileAttachment.objects.get(pk=data["id"]).blob
+        self.assertEqual(blob.rendition_status, "failed")
+        response = self.client.get(f"/api/files/{data['id']}/thumbnail/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_generate_renditions_command(self):
+        """Команда generate_renditions обрабатывает очередь"""
+        self.upload()
+        self.upload(name="second.png", content=make_png((300, 300), "RGB"))
+
+        out = StringIO()
+        call_command("generate_renditions", stdout=out)
+        self.assertIn("Обработано: 2", out.getvalue())
+        self.assertFalse(FileBlob.objects.filter(rendition_status="pending").exists())
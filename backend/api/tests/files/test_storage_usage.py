@@ -0,0 +1,146 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.files.models import FileAttachment, FileBlob, StorageUsage
+from apps.files.usage import get_usage, summed_usage
+from apps.projects.models import Project
+
+User = get_user_model()
+
+
+class StorageUsageTestCase(TestCase):
+    """Тесты счётчиков использования хранилища"""
+
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            username="admin_usage", password="x", role="admin"
+        )
+        self.user = User.objects.create_user(username="uploader", password="x")
+        self.project = Project.objects.create(name="Проект", creator=self.admin)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def tearDown(self):
+        for blob in FileBlob.objects.all():
+            blob.file.delete(save=False)
+
+    def attach(self, name, content, user=None, **kwargs):
+        return FileAttachment.objects.create(
+            file=SimpleUploadedFile(name, content),
+            uploaded_by=user or self.user,
+            **kwargs,
+        )
+
+    def snapshot(self):
+        """Ненулевые счётчики (шарды сложены)"""
+        return {
+            (u.scope, u.key): (u.file_count, u.total_size)
+            for u in summed_usage(StorageUsage.objects.all())
+            if u.file_count or u.total_size
+        }
+
+    def test_counters_follow_uploads_and_deletes(self):
+        """Счётчики меняются при загрузке и удалении"""
+        doc = self.attach("a.txt", b"x" * 100, project=self.project)
+        self.attach("b.txt", b"x" * 100)
+        self.attach("c.png", b"\x89PNG\r\n\x1a\n" + b"\x00" * 50, user=self.admin)
+
+        self.assertEqual(get_usage("total").file_count, 3)
+        self.assertEqual(get_usage("user", self.user.pk).total_size, 200)
+        self.assertEqual(get_usage("project", self.project.pk).file_count, 1)
+        self.assertEqual(get_usage("file_type", "document").file_count, 2)
+        self.assertEqual(get_usage("file_type", "image").file_count, 1)
+        # Одинаковое содержимое хранится один раз
+        self.assertEqual(get_usage("blobs").file_count, 2)
+        self.assertEqual(get_usage("blobs").total_size, 158)
+
+        doc.delete()
+        self.assertEqual(get_usage("total").file_count, 2)
+        self.assertEqual(get_usage("user", self.user.pk).total_size, 100)
+        self.assertEqual(get_usage("project", self.project.pk).file_count, 0)
+        self.assertEqual(get_usage("blobs").file_count, 2)
+
+    def test_stats_read_counters(self):
+        """Статистика хранилища читает счётчики, не агрегирует файлы"""
+        self.attach("a.txt", b"x" * 100)
+        self.attach("b.txt", b"x" * 100)
+
+        with self.assertNumQueries(3):
+            response = self.client.get("/api/files/stats/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        stats = response.data["storage_stats"]
+        self.assertEqual(stats["total_files"], 2)
+        self.assertEqual(stats["total_size"], 200)
+        self.assertEqual(stats["document_count"], 2)
+        self.assertEqual(stats["stored_size"], 100)
+        self.assertEqual(stats["dedup_ratio"], 2.0)
+        self.assertEqual(
+            response.data["top_users"],
+            [
+                {
+                    "uploaded_by__username": "uploader",
+                    "file_count": 2,
+                    "total_size": 200,
+                }
+            ],
+        )
+
+    def test_rebuild_matches_incremental(self):
+        """Пересчёт даёт те же значения, что и инкрементальные счётчики"""
+        self.attach("a.txt", b"x" * 100, project=self.project)
+        self.attach("b.txt", b"y" * 10, user=self.admin)
+        self.attach("c.txt", b"x" * 100).delete()
+        expected = self.snapshot()
+
+        call_command("rebuild_storage_usage", stdout=StringIO())
+        self.assertEqual(self.snapshot(), expected)
+
+    @override_settings(STORAGE_USAGE_SHARDS=4)
+    def test_total_is_sharded(self):
+        """Общий счётчик разнесён по шардам, при чтении они складываются"""
+        for i in range(20):
+            self.attach(f"{i}.txt", b"x" * (i + 1))
+
+        shards = StorageUsage.objects.filter(scope="total")
+        self.assertGreater(shards.count(), 1)
+        self.assertLessEqual(shards.count(), 4)
+        total = get_usage("total")
+        self.assertEqual((total.file_count, total.total_size), (20, 210))
+        # По пользователю - одна строка
+        self.assertEqual(StorageUsage.objects.filter(scope="user").count(), 1)
+
+    @override_settings(FILE_USER_QUOTA_BYTES=150)
+    def test_user_quota(self):
+        """Загрузка сверх квоты отклоняется без подсчёта по таблице файлов"""
+        self.attach("a.txt", b"x" * 100)
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+
+        response = client.post(
+            "/api/files/upload/",
+            {"file": SimpleUploadedFile("b.txt", b"y" * 100)},
+            format="multipart",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("квота", str(response.data["file"][0]))
+
+        response = client.post(
+            "/api/files/uploads/",
+            {"filename": "big.txt", "size": 100},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = client.post(
+            "/api/files/upload/",
+            {"file": SimpleUploadedFile("c.txt", b"z" * 50)},
+            format="multipart",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
@@ -171,6 +171,32 @@ class FileAPITestCase(TransactionTestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertGreaterEqual(len(response.data), 3)
 
+    def test_file_list_cursor_pagination(self):
+        """Тест keyset пагинации списка файлов (?cursor=)"""
+        ids = []
+        for i in range(3):
+            attachment = FileAttachment.objects.create(
+                file=self.test_image,
+                original_filename=f"cursor_{i}.jpg",
+                file_type="image",
+                mime_type="image/jpeg",
+                file_size=1000,
+                project=self.project,
+                uploaded_by=self.admin_user,
+            )
+            ids.append(attachment.id)
+
+        first = self.admin_client.get("/api/files/?cursor=&page_size=2")
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(first.data["results"]), 2)
+
+        second = self.admin_client.get(first.data["next"])
+        self.assertEqual(len(second.data["results"]), 1)
+        self.assertIsNone(second.data["next"])
+
+        results = first.data["results"] + second.data["results"]
+        self.assertEqual([f["id"] for f in results], ids[::-1])
+
     def test_file_update_as_non_owner(self):
         """Тест обновления файла не-владельцем"""
         file_attachment = FileAttachment.objects.create(
@@ -0,0 +1,65 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.projects.models import Project
+from apps.tasks.models import Task
+
+User = get_user_model()
+
+
+class ProjectListQueryCountTestCase(TestCase):
+    """Счётчики задач и участники проектов без запросов на каждую строку"""
+
+    def setUp(self):
+        self.manager = User.objects.create_user(
+            username="project_query_manager",
+            email="project_query_manager@test.com",
+            password="password123",
+            role="manager",
+        )
+        self.member = User.objects.create_user(
+            username="project_query_member",
+            email="project_query_member@test.com",
+            password="password123",
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.manager)
+
+    def create_projects(self, count):
+        for i in range(count):
+            project = Project.objects.create(name=f"Project {i}", creator=self.manager)
+            project.members.add(self.manager, self.member)
+            for status in ["todo", "done", "done"]:
+                Task.objects.create(
+                    title="Task", project=project, creator=self.manager, status=status
+                )
+
+    def get_projects(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get("/api/projects/")
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries), response
+
+    def test_constant_queries(self):
+        """Число запросов не растёт с количеством проектов на странице"""
+        self.create_projects(2)
+        small, _ = self.get_projects()
+
+        self.create_projects(10)
+        large, response = self.get_projects()
+
+        self.assertEqual(small, large)
+        self.assertEqual(len(response.data["results"]), 12)
+
+    def test_counts_not_multiplied_by_members(self):
+        """Участники не умножают количество задач"""
+        self.create_projects(1)
+        _, response = self.get_projects()
+
+        project = response.data["results"][0]
+        self.assertEqual(project["task_count"], 3)
+        self.assertEqual(project["completed_task_count"], 2)
+        self.assertEqual(len(project["members"]), 2)
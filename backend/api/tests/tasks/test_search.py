@@ -0,0 +1,109 @@
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.projects.models import Project
+from apps.tasks.models import Task
+from apps.tasks.search import search_tasks
+
+User = get_user_model()
+
+
+class SearchTestCase(TestCase):
+    """Тесты поиска по задачам и проектам (в тестах - вариант для SQLite)"""
+
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            username="search_admin", password="password123", role="admin"
+        )
+        self.employee = User.objects.create_user(
+            username="search_employee", password="password123", role="employee"
+        )
+        self.project = Project.objects.create(
+            name="Отчётность", description="Квартальные отчёты", creator=self.admin
+        )
+        self.other = Project.objects.create(name="Сайт", creator=self.admin)
+
+        self.in_title = Task.objects.create(
+            title="Подготовить отчёт",
+            description="По продажам",
+            project=self.project,
+            assignee=self.employee,
+        )
+        self.in_description = Task.objects.create(
+            title="Созвон с клиентом",
+            description="Обсудить отчёт",
+            project=self.project,
+        )
+        Task.objects.create(title="Вёрстка", project=self.other)
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def test_title_matches_ranked_first(self):
+        """Совпадения в названии выше совпадений в описании"""
+        found = list(search_tasks(Task.objects.all(), "отчёт"))
+        self.assertEqual(found, [self.in_title, self.in_description])
+
+        # Все слова запроса должны найтись
+        found = list(search_tasks(Task.objects.all(), "отчёт продажам"))
+        self.assertEqual(found, [self.in_title])
+
+    def test_search_endpoint(self):
+        """/api/search/ ищет по задачам и проектам"""
+        response = self.client.get("/api/search/", {"q": "отчёт"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [t["id"] for t in response.data["tasks"]],
+            [self.in_title.pk, self.in_description.pk],
+        )
+        self.assertEqual(
+            [p["id"] for p in response.data["projects"]], [self.project.pk]
+        )
+
+        response = self.client.get("/api/search/", {"q": "отчёт", "limit": 1})
+        self.assertEqual(len(response.data["tasks"]), 1)
+
+    def test_search_respects_visibility(self):
+        """Поиск возвращает только доступные пользователю задачи и проекты"""
+        client = APIClient()
+        client.force_authenticate(user=self.employee)
+
+        response = client.get("/api/search/", {"q": "отчёт"})
+
+        self.assertEqual([t["id"] for t in response.data["tasks"]], [self.in_title.pk])
+        self.assertEqual(response.data["projects"], [])
+
+    def test_empty_query(self):
+        """Без строки поиска - ошибка 400"""
+        response = self.client.get("/api/search/", {"q": "  "})
+        self.assertEqual(response.status_code, 400)
+
+    def test_project_list_search(self):
+        """?search= в списке проектов использует тот же поиск"""
+        response = self.client.get("/api/projects/", {"search": "Квартальные"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([p["id"] for p in response.data["results"]], [self.project.pk])
+        self.assertEqual(response.data["results"][0]["task_count"], 2)
+
+
+@skipUnless(connection.vendor == "postgresql", "Нужен PostgreSQL с pg_trgm")
+class PostgresSearchTestCase(TestCase):
+    """Тесты поиска в PostgreSQL (в CI на SQLite пропускаются)"""
+
+    def setUp(self):
+        self.project = Project.objects.create(name="Отчётность")
+        self.task = Task.objects.create(
+            title="Подготовить квартальный отчёт по продажам для руководства",
+            project=self.project,
+        )
+
+    def test_fragment_of_long_title(self):
+        """Часть слова длинного названия находится по сходству слова"""
+        found = list(search_tasks(Task.objects.all(), "квартал"))
+        self.assertEqual(found, [self.task])
@@ -0,0 +1,50 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.projects.models import Project
+from apps.tasks.models import Task, TaskEvent
+
+User = get_user_model()
+
+
+class TaskHistoryAPITestCase(TestCase):
+    """Тесты журнала изменений задачи в API (/api/tasks/<id>/history/)"""
+
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            username="history_admin", password="password123", role="admin"
+        )
+        self.employee = User.objects.create_user(
+            username="history_employee", password="password123", role="employee"
+        )
+        self.project = Project.objects.create(name="История", creator=self.admin)
+        self.task = Task.objects.create(
+            title="Задача", project=self.project, creator=self.admin
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def test_update_records_actor(self):
+        """Изменение через API записывается с автором запроса"""
+        response = self.client.patch(
+            f"/api/tasks/{self.task.pk}/", {"status": "in_progress"}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+
+        event = TaskEvent.objects.get(task_id=self.task.pk, kind=TaskEvent.Kind.STATUS)
+        self.assertEqual(event.actor, self.admin)
+
+        response = self.client.get(f"/api/tasks/{self.task.pk}/history/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([e["kind"] for e in response.data], ["created", "status"])
+        self.assertEqual(response.data[1]["new_value"], "in_progress")
+        self.assertEqual(response.data[1]["actor"]["username"], "history_admin")
+
+    def test_history_of_invisible_task(self):
+        """Историю чужой задачи получить нельзя"""
+        client = APIClient()
+        client.force_authenticate(user=self.employee)
+
+        response = client.get(f"/api/tasks/{self.task.pk}/history/")
+        self.assertEqual(response.status_code, 404)
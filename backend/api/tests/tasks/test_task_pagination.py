@@ -0,0 +1,82 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.projects.models import Project
+from apps.tasks.models import Task
+
+User = get_user_model()
+
+
+class TaskKeysetPaginationTestCase(TestCase):
+    """Тесты keyset пагинации списка задач (?cursor=)"""
+
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            username="cursor_admin",
+            email="cursor_admin@test.com",
+            password="password123",
+            role="admin",
+        )
+        self.project = Project.objects.create(name="Cursor", creator=self.admin)
+        Task.objects.bulk_create(
+            Task(title=f"Task {i}", project=self.project, creator=self.admin)
+            for i in range(25)
+        )
+        # Часть задач с одинаковой датой создания - порядок решает id
+        Task.objects.filter(title__in=["Task 3", "Task 4", "Task 5", "Task 6"]).update(
+            created_at=timezone.now()
+        )
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def test_walk_all_pages(self):
+        """Обход всех страниц возвращает каждую задачу ровно один раз"""
+        url = "/api/tasks/?cursor=&page_size=7"
+        seen = []
+        pages = 0
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn("count", response.data)
+            seen.extend(task["id"] for task in response.data["results"])
+            url = response.data["next"]
+            pages += 1
+
+        self.assertEqual(pages, 4)
+        self.assertEqual(len(seen), 25)
+        self.assertEqual(len(set(seen)), 25)
+
+        expected = list(
+            Task.objects.order_by("-created_at", "-id").values_list("id", flat=True)
+        )
+        self.assertEqual(seen, expected)
+
+    def test_new_tasks_do_not_shift_pages(self):
+        """Новые задачи не сдвигают уже начатую выгрузку"""
+        first = self.client.get("/api/tasks/?cursor=&page_size=10")
+        Task.objects.create(title="Newest", project=self.project, creator=self.admin)
+
+        second = self.client.get(first.data["next"])
+        titles = [task["title"] for task in second.data["results"]]
+        self.assertNotIn("Newest", titles)
+        self.assertEqual(len(titles), 10)
+
+    def test_invalid_cursor(self):
+        """Неверный курсор - 404"""
+        response = self.client.get("/api/tasks/?cursor=garbage")
+        self.assertEqual(response.status_code, 404)
+
+    def test_page_number_by_default(self):
+        """Без ?cursor= остаётся обычная постраничная пагинация"""
+        response = self.client.get("/api/tasks/")
+        self.assertEqual(response.data["count"], 25)
+
+    def test_projects_cursor(self):
+        """Keyset пагинация доступна и для проектов"""
+        response = self.client.get("/api/projects/?cursor=")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertIsNone(response.data["next"])
@@ -0,0 +1,96 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.projects.models import Project
+from apps.tasks.models import Task
+
+User = get_user_model()
+
+
+class TaskListQueryCountTestCase(TestCase):
+    """Число запросов списка задач не зависит от размера страницы"""
+
+    def setUp(self):
+        self.manager = User.objects.create_user(
+            username="query_manager",
+            email="query_manager@test.com",
+            password="password123",
+            role="manager",
+        )
+        self.admin = User.objects.create_user(
+            username="query_admin",
+            email="query_admin@test.com",
+            password="password123",
+            role="admin",
+        )
+        employees = [
+            User.objects.create_user(
+                username=f"query_employee_{i}",
+                email=f"query_employee_{i}@test.com",
+                password="password123",
+            )
+            for i in range(5)
+        ]
+
+        own_project = Project.objects.create(name="Own", creator=self.manager)
+        member_project = Project.objects.create(name="Member", creator=self.admin)
+        member_project.members.add(self.manager, *employees)
+        hidden_project = Project.objects.create(name="Hidden", creator=self.admin)
+
+        tasks = []
+        for i in range(210):
+            project = own_project if i % 2 else member_project
+            tasks.append(
+                Task(
+                    title=f"Task {i}",
+                    project=project,
+                    creator=employees[i % 5],
+                    assignee=employees[(i + 1) % 5],
+                )
+            )
+        tasks.append(Task(title="Hidden", project=hidden_project, creator=self.admin))
+        Task.objects.bulk_create(tasks)
+
+    def count_queries(self, user, page_size):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(f"/api/tasks/?page_size={page_size}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["results"]), page_size)
+        return len(context.captured_queries), response
+
+    def test_constant_queries_for_manager(self):
+        """Менеджер: 20 и 200 задач за одинаковое число запросов"""
+        small, response = self.count_queries(self.manager, 20)
+        large, _ = self.count_queries(self.manager, 200)
+
+        self.assertEqual(small, large)
+        self.assertEqual(response.data["count"], 210)
+
+        task = response.data["results"][0]
+        self.assertIn("username", task["assignee"])
+        self.assertIn("username", task["creator"])
+        self.assertIn("name", task["project_info"])
+
+    def test_constant_queries_for_admin(self):
+        """Администратор: 20 и 200 задач за одинаковое число запросов"""
+        small, response = self.count_queries(self.admin, 20)
+        large, _ = self.count_queries(self.admin, 200)
+
+        self.assertEqual(small, large)
+        self.assertEqual(response.data["count"], 211)
+
+    def test_manager_queryset_without_distinct(self):
+        """Фильтр по участию в проекте не использует DISTINCT"""
+        client = APIClient()
+        client.force_authenticate(user=self.manager)
+        with CaptureQueriesContext(connection) as context:
+            client.get("/api/tasks/")
+
+        sql = " ".join(query["sql"] for query in context.captured_queries).upper()
+        self.assertNotIn("DISTINCT", sql)
+        self.assertIn("EXISTS", sql)
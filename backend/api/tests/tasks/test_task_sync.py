@@ -0,0 +1,202 @@
+import base64
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.projects.models import Project
+from apps.tasks.models import Task, TaskTombstone
+from apps.tasks.sync import SyncCursor
+
+User = get_user_model()
+
+
+class TaskSyncTestCase(TestCase):
+    """Тесты инкрементальной синхронизации задач (/api/tasks/sync/)"""
+
+    def setUp(self):
+        self.manager = User.objects.create_user(
+            username="sync_manager",
+            email="sync_manager@test.com",
+            password="password123",
+            role="manager",
+        )
+        self.employee = User.objects.create_user(
+            username="sync_employee",
+            email="sync_employee@test.com",
+            password="password123",
+        )
+        self.project = Project.objects.create(name="Sync", creator=self.manager)
+        self.other_project = Project.objects.create(name="Other", creator=self.employee)
+        self.task = self.create_task("First")
+        self.create_task("Hidden", project=self.other_project)
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.manager)
+
+    def create_task(self, title, project=None):
+        return Task.objects.create(
+            title=title,
+            project=project or self.project,
+            creator=self.manager,
+            assignee=self.employee,
+        )
+
+    def sync(self, cursor=None, client=None):
+        url = "/api/tasks/sync/" + (f"?since={cursor}" if cursor else "")
+        response = (client or self.client).get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def old_cursor(self):
+        """Курсор "минуту назад" - как после давней синхронизации"""
+        return SyncCursor(timezone.now() - timedelta(minutes=1)).encode()
+
+    def test_initial_sync_returns_visible_tasks(self):
+        """Первая синхронизация: все видимые задачи и курсор"""
+        data = self.sync()
+
+        self.assertEqual([task["title"] for task in data["changed"]], ["First"])
+        self.assertEqual(data["deleted"], [])
+        self.assertFalse(data["has_more"])
+        self.assertTrue(data["cursor"])
+
+    def test_only_changes_after_cursor(self):
+        """Возвращаются только изменения после курсора"""
+        cursor = self.old_cursor()
+        Task.objects.filter(pk=self.task.pk).update(
+            updated_at=timezone.now() - timedelta(hours=1)
+        )
+        new_task = self.create_task("Second")
+
+        data = self.sync(cursor)
+        self.assertEqual([task["id"] for task in data["changed"]], [new_task.id])
+
+    def test_deleted_tasks(self):
+        """Удаление задачи попадает в deleted через tombstone"""
+        cursor = self.old_cursor()
+        task_id = self.task.id
+        self.task.delete()
+
+        self.assertTrue(TaskTombstone.objects.filter(task_id=task_id).exists())
+        data = self.sync(cursor)
+        self.assertEqual(data["deleted"], [task_id])
+
+    def test_deleted_hidden_tasks_not_exposed(self):
+        """Удаления чужих задач не видны"""
+        cursor = self.old_cursor()
+        hidden = Task.objects.get(title="Hidden")
+        hidden.delete()
+
+        self.assertEqual(self.sync(cursor)["deleted"], [])
+
+    def test_employee_sees_assigned_deletions(self):
+        """Исполнитель узнаёт об удалении своих задач"""
+        client = APIClient()
+        client.force_authenticate(user=self.employee)
+        cursor = self.old_cursor()
+        task_id = self.task.id
+        self.task.delete()
+
+        self.assertEqual(self.sync(cursor, client)["deleted"], [task_id])
+
+    def test_reassigned_task_removed_for_previous_assignee(self):
+        """Переназначенная задача попадает в deleted прежнего исполнителя"""
+        other = User.objects.create_user(username="sync_other", password="x")
+        employee_client = APIClient()
+        employee_client.force_authenticate(user=self.employee)
+        other_client = APIClient()
+        other_client.force_authenticate(user=other)
+        cursor = self.old_cursor()
+
+        self.task.assignee = other
+        self.task.save()
+
+        data = self.sync(cursor, employee_client)
+        self.assertEqual(data["deleted"], [self.task.id])
+        self.assertNotIn(self.task.id, [task["id"] for task in data["changed"]])
+
+        # Новый исполнитель и менеджер проекта видят задачу как изменённую
+        for client in (other_client, self.client):
+            data = self.sync(cursor, client)
+            self.assertEqual(data["deleted"], [])
+            self.assertIn(self.task.id, [task["id"] for task in data["changed"]])
+
+    def test_removed_member_drops_project_tasks(self):
+        """Исключённый из проекта менеджер получает его задачи в deleted"""
+        member = User.objects.create_user(
+            username="sync_member", password="x", role="manager"
+        )
+        self.project.members.add(member)
+        client = APIClient()
+        client.force_authenticate(user=member)
+        cursor = self.old_cursor()
+
+        self.project.members.remove(member)
+
+        self.assertEqual(self.sync(cursor, client)["deleted"], [self.task.id])
+        self.assertEqual(self.sync(cursor)["deleted"], [])
+
+        # Обратная сторона связи и clear() тоже учитываются
+        member.projects.add(self.project)
+        cursor = self.old_cursor()
+        member.projects.clear()
+        self.assertEqual(self.sync(cursor, client)["deleted"], [self.task.id])
+
+    @override_settings(TASK_SYNC_PAGE_SIZE=2)
+    def test_has_more(self):
+        """Большой объём изменений отдаётся частями"""
+        for i in range(3):
+            self.create_task(f"Batch {i}")
+
+        seen = []
+        cursor = None
+        while True:
+            data = self.sync(cursor)
+            seen.extend(task["id"] for task in data["changed"])
+            cursor = data["cursor"]
+            if not data["has_more"]:
+                break
+
+        self.assertEqual(len(seen), 4)
+        self.assertEqual(len(set(seen)), 4)
+
+    @override_settings(TASK_SYNC_PAGE_SIZE=2)
+    def test_has_more_with_old_tasks(self):
+        """Продолжение выдачи давно изменённых задач не считается устаревшим"""
+        for i in range(4):
+            self.create_task(f"Old {i}")
+        Task.objects.update(updated_at=timezone.now() - timedelta(days=60))
+
+        seen = []
+        cursor = None
+        while True:
+            data = self.sync(cursor)
+            seen.extend(task["id"] for task in data["changed"])
+            cursor = data["cursor"]
+            if not data["has_more"]:
+                break
+
+        self.assertEqual(len(set(seen)), 5)
+
+    def test_legacy_cursor(self):
+        """Курсор старого формата (без начала синхронизации) принимается"""
+        cursor = SyncCursor.decode(self.old_cursor())
+        raw = f"{cursor.updated_at.isoformat()}|{cursor.pk}".encode("ascii")
+        legacy = base64.urlsafe_b64encode(raw).decode("ascii")
+
+        self.assertEqual(SyncCursor.decode(legacy).started_at, cursor.updated_at)
+        self.sync(legacy)
+
+    def test_invalid_cursor(self):
+        """Неверный курсор - 400"""
+        response = self.client.get("/api/tasks/sync/?since=garbage")
+        self.assertEqual(response.status_code, 400)
+
+    def test_expired_cursor(self):
+        """Курсор старше срока хранения удалений - 410"""
+        cursor = SyncCursor(timezone.now() - timedelta(days=365)).encode()
+        response = self.client.get(f"/api/tasks/sync/?since={cursor}")
+        self.assertEqual(response.status_code, 410)
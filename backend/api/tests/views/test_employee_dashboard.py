@@ -0,0 +1,59 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from apps.projects.models import Project
+from apps.tasks.models import Task
+
+User = get_user_model()
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+DONE_SECTION = "✅ Последние выполненные задачи"
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class EmployeeDashboardTestCase(TestCase):
+    """Тесты счётчиков дашборда сотрудника"""
+
+    def setUp(self):
+        cache.clear()
+        self.manager = User.objects.create_user(
+            username="manager", password="x", role="manager"
+        )
+        self.worker = User.objects.create_user(username="worker", password="x")
+        self.project = Project.objects.create(name="Проект", creator=self.manager)
+        self.task = Task.objects.create(
+            title="Задача", project=self.project, creator=self.manager
+        )
+        self.client.force_login(self.worker)
+
+    def dashboard(self):
+        response = self.client.get("/dashboard/")
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_counters_follow_task_changes(self):
+        """Назначение, выполнение и переназначение задачи сразу видны"""
+        response = self.dashboard()
+        self.assertEqual(response.context["stats"].total, 0)
+        self.assertContains(response, "Все задачи выполнены")
+
+        self.task.assignee = self.worker
+        self.task.save()
+        response = self.dashboard()
+        self.assertEqual(response.context["stats"].active, 1)
+        self.assertNotContains(response, "Все задачи выполнены")
+        self.assertNotContains(response, DONE_SECTION)
+
+        self.task.status = Task.Status.DONE
+        self.task.save()
+        response = self.dashboard()
+        self.assertEqual(response.context["stats"].done, 1)
+        self.assertContains(response, DONE_SECTION)
+
+        # Задачу забрали: счётчики прежнего исполнителя тоже сбрасываются
+        self.task.assignee = self.manager
+        self.task.save()
+        response = self.dashboard()
+        self.assertEqual(response.context["stats"].total, 0)
+        self.assertNotContains(response, DONE_SECTION)
@@ -1,7 +1,14 @@
 ﻿# -*- coding: utf-8 -*-
 import json
 
-from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from apps.projects.models import Project
+from apps.tasks.models import Task
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
 
 
 class HomeViewTest(TestCase):
@@ -72,3 +79,42 @@ class HomeViewTest(TestCase):
             print(f"Корень API: {response.status_code} (ожидаемо)")
         else:
             print(f"Корень API: неожиданный статус {response.status_code}")
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class HomeCountersTest(TestCase):
+    """Тесты счётчиков главной страницы."""
+
+    def setUp(self):
+        cache.clear()
+        user = get_user_model().objects.create_user(
+            username="home_user", email="home@example.com", password="pass12345"
+        )
+        self.project = Project.objects.create(name="Home", creator=user)
+        self.user = user
+        for status in ["todo", "todo", "in_progress", "done", "blocked"]:
+            Task.objects.create(
+                title="Task", project=self.project, creator=user, status=status
+            )
+
+    def test_counters(self):
+        """Счётчики по статусам считаются в БД."""
+        response = self.client.get("/")
+
+        self.assertEqual(response.context["total_tasks"], 5)
+        self.assertEqual(response.context["todo_count"], 2)
+        self.assertEqual(response.context["completed_tasks_count"], 1)
+        self.assertEqual(response.context["active_tasks_count"], 3)
+        self.assertEqual(response.context["projects_count"], 1)
+
+    def test_counters_cached(self):
+        """Повторный запрос берёт счётчики из кэша."""
+        self.client.get("/")
+        Task.objects.create(title="New", project=self.project, creator=self.user)
+
+        response = self.client.get("/")
+        self.assertEqual(response.context["total_tasks"], 5)
+
+        cache.clear()
+        response = self.client.get("/")
+        self.assertEqual(response.context["total_tasks"], 6)
@@ -10,6 +10,7 @@ from api.views.auth import (
 )
 from api.views.home import home_view
 from api.views.project import ProjectViewSet
+from api.views.search import SearchView
 from api.views.task import TaskViewSet
 from api.views.user import UserViewSet
 from . import views
@@ -28,6 +29,7 @@ urlpatterns = [
     path("auth/logout/", LogoutView.as_view(), name="logout"),
     path("auth/me/", UserProfileView.as_view(), name="user_profile"),
     path("files/", include("api.files.urls")),
+    path("search/", SearchView.as_view(), name="search"),
     path("telegram-webhook/", telegram.telegram_webhook, name="telegram_webhook"),
     path("telegram-info/", telegram.get_bot_info, name="telegram_info"),
     path(
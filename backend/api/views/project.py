@@ -1,18 +1,33 @@
-from django.db.models import Q
+from django.db.models import Exists, OuterRef, Q
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import filters, permissions, viewsets
+from rest_framework import permissions, viewsets
 
+from api.filters import FullTextSearchFilter
+from api.pagination import StandardPagination
 from api.permissions import IsAdminUser, IsManagerOrAdmin, IsProjectMemberOrAdmin
 from api.serializers.project import ProjectSerializer
 from apps.projects.models import Project
 
 
+def visible_projects(user):
+    """Проекты, доступные пользователю (создатель или участник, админ - все)"""
+    if user.is_admin:
+        return Project.objects.all()
+
+    # EXISTS вместо JOIN по участникам: не нужен DISTINCT
+    membership = Project.members.through.objects.filter(
+        project_id=OuterRef("pk"), user_id=user.pk
+    )
+    return Project.objects.filter(Q(creator=user) | Exists(membership))
+
+
 class ProjectViewSet(viewsets.ModelViewSet):
     serializer_class = ProjectSerializer
     queryset = Project.objects.all()
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter]
     filterset_fields = ["status"]
-    search_fields = ["name", "description"]
+    search_title_field = "name"
+    pagination_class = StandardPagination
 
     def get_permissions(self):
         """
@@ -45,13 +60,15 @@ class ProjectViewSet(viewsets.ModelViewSet):
         if not user.is_authenticated:
             return Project.objects.none()
 
-        if user.is_admin:
-            return Project.objects.all()
-
-        # Базовый запрос: проекты где пользователь создатель или участник
-        queryset = Project.objects.filter(Q(creator=user) | Q(members=user)).distinct()
-
-        return queryset
+        # Счётчики задач аннотацией, участники одним prefetch-запросом
+        return (
+            visible_projects(user)
+            .with_task_counts()
+            .select_related("creator")
+            .prefetch_related("members")
+            # Meta.ordering не применяется к запросам с GROUP BY
+            .order_by("-created_at")
+        )
 
     def perform_create(self, serializer):
         """Автоматически назначаем создателя проекта"""
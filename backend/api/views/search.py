@@ -0,0 +1,50 @@
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from api.serializers.project import ProjectSummarySerializer
+from api.serializers.task import TaskSerializer
+from api.views.project import visible_projects
+from api.views.task import visible_tasks
+from apps.tasks.search import search_projects, search_tasks
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+
+class SearchView(APIView):
+    """
+    Поиск по задачам и проектам, доступным пользователю.
+
+    GET /api/search/?q=<строка>&limit=20 - самые подходящие сверху.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        text = request.query_params.get("q", "").strip()
+        if not text:
+            return Response(
+                {"error": "Не указана строка поиска (q)"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            limit = int(request.query_params.get("limit", DEFAULT_LIMIT))
+        except ValueError:
+            limit = DEFAULT_LIMIT
+        limit = max(1, min(limit, MAX_LIMIT))
+
+        tasks = search_tasks(visible_tasks(request.user), text).select_related(
+            "project", "assignee", "creator"
+        )
+        projects = search_projects(visible_projects(request.user), text)
+
+        return Response(
+            {
+                "query": text,
+                "tasks": TaskSerializer(
+                    tasks[:limit], many=True, context={"request": request}
+                ).data,
+                "projects": ProjectSummarySerializer(projects[:limit], many=True).data,
+            }
+        )
@@ -1,23 +1,46 @@
-from django.db.models import Q
-from rest_framework import permissions, viewsets
+from django.db.models import Exists, OuterRef, Q
+from rest_framework import permissions, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
 
+from api.pagination import StandardPagination
 from api.permissions import IsAdminUser, IsManagerOrAdmin, IsTaskAssigneeOrAdmin
-from api.serializers.task import TaskSerializer
-from apps.tasks.models import Task
+from api.serializers.task import TaskEventSerializer, TaskSerializer
+from apps.projects.models import Project
+from apps.tasks.models import Task, TaskEvent, TaskTombstone
+from apps.tasks.sync import ExpiredCursor, InvalidCursor, SyncCursor, get_changes
+
+
+def visible_tasks(user):
+    """Задачи, доступные пользователю (правила см. TaskViewSet.get_queryset)"""
+    if user.is_admin:
+        return Task.objects.all()
+
+    if user.is_manager:
+        # Менеджеры видят задачи в проектах, где они менеджеры или участники.
+        # EXISTS вместо JOIN по участникам: не нужен DISTINCT
+        membership = Project.members.through.objects.filter(
+            project_id=OuterRef("project_id"), user_id=user.pk
+        )
+        return Task.objects.filter(Q(project__creator=user) | Exists(membership))
+
+    # Сотрудники видят только назначенные им задачи
+    return Task.objects.filter(assignee=user)
 
 
 class TaskViewSet(viewsets.ModelViewSet):
     queryset = Task.objects.all()
     serializer_class = TaskSerializer
+    pagination_class = StandardPagination
 
     def get_permissions(self):
         """
         Настраиваем права доступа для задач:
-        - Список и просмотр: авторизованные пользователи
+        - Список, просмотр, история и синхронизация: авторизованные пользователи
         - Создание: менеджеры и администраторы
         - Обновление/удаление: администраторы, менеджер проекта или исполнитель
         """
-        if self.action in ["list", "retrieve"]:
+        if self.action in ["list", "retrieve", "history", "sync"]:
             permission_classes = [permissions.IsAuthenticated]
         elif self.action == "create":
             permission_classes = [IsManagerOrAdmin]
@@ -42,14 +65,68 @@ class TaskViewSet(viewsets.ModelViewSet):
         if not user.is_authenticated:
             return Task.objects.none()
 
+        return visible_tasks(user).select_related("project", "assignee", "creator")
+
+    def perform_update(self, serializer):
+        # Автор изменения попадает в журнал событий задачи
+        serializer.save(changed_by=self.request.user)
+
+    def perform_destroy(self, instance):
+        instance.changed_by = self.request.user
+        instance.delete()
+
+    def get_tombstones(self):
+        """Удалённые задачи, которые пользователь мог видеть (те же правила)"""
+        user = self.request.user
+        tombstones = TaskTombstone.objects.all()
+
         if user.is_admin:
-            return Task.objects.all()
+            return tombstones
 
+        # Отметки об исключении из проекта адресованы самому пользователю
         if user.is_manager:
-            # Менеджеры видят задачи в проектах, где они менеджеры или участники
-            return Task.objects.filter(
-                Q(project__creator=user) | Q(project__members=user)
-            ).distinct()
+            projects = Project.objects.filter(Q(creator=user) | Q(members=user))
+            return tombstones.filter(
+                Q(project_id__in=projects.values("pk")) | Q(user_id=user.pk)
+            )
+
+        return tombstones.filter(Q(assignee_id=user.pk) | Q(user_id=user.pk))
+
+    @action(detail=True, methods=["get"])
+    def history(self, request, pk=None):
+        """Журнал изменений задачи: статус, исполнитель, срок, приоритет"""
+        task = self.get_object()
+        events = TaskEvent.objects.filter(task_id=task.pk).select_related("actor")
+        return Response(TaskEventSerializer(events, many=True).data)
+
+    @action(detail=False, methods=["get"])
+    def sync(self, request):
+        """
+        Инкрементальная синхронизация задач.
+
+        GET /api/tasks/sync/ - все видимые задачи и курсор,
+        GET /api/tasks/sync/?since=<cursor> - только изменённые и удалённые
+        после курсора. Пока has_more=true, запрос повторяют с новым курсором.
+        """
+        since = request.query_params.get("since")
+        try:
+            cursor = SyncCursor.decode(since) if since else None
+            result = get_changes(self.get_queryset(), self.get_tombstones(), cursor)
+        except InvalidCursor:
+            return Response(
+                {"error": "Неверный курсор"}, status=status.HTTP_400_BAD_REQUEST
+            )
+        except ExpiredCursor:
+            return Response(
+                {"error": "Курсор устарел, нужна полная синхронизация"},
+                status=status.HTTP_410_GONE,
+            )
 
-        # Сотрудники видят только назначенные им задачи
-        return Task.objects.filter(assignee=user)
+        return Response(
+            {
+                "changed": self.get_serializer(result.changed, many=True).data,
+                "deleted": result.deleted,
+                "cursor": result.cursor.encode(),
+                "has_more": result.has_more,
+            }
+        )
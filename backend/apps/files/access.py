@@ -0,0 +1,105 @@
+"""
+Права доступа к файлам.
+
+Одно правило для списка, скачивания и FileAttachment.can_access. Файл
+доступен, если он публичный, загружен пользователем или предназначен
+ему лично, прикреплён к проекту, где пользователь участник или создатель,
+или к задаче, где он исполнитель или автор, или которая входит в такой
+проект. Администратору доступны все файлы.
+
+visible_files_q() превращает правило в условие WHERE на подзапросах
+(IN по индексированным столбцам) - без JOIN и DISTINCT. FileAccess
+проверяет отдельные файлы в памяти: проекты пользователя загружаются
+одним запросом на объект (один раз за запрос, см. get_file_access).
+"""
+
+from functools import cached_property
+from typing import Any
+
+from django.db.models import Q
+
+from apps.projects.models import Project
+from apps.tasks.models import Task
+
+from .models import FileAttachment
+
+
+def user_project_ids(user: Any):
+    """Подзапрос id проектов, где пользователь участник или создатель"""
+    member = Project.members.through.objects.filter(user_id=user.pk).values(
+        "project_id"
+    )
+    return Project.objects.filter(Q(pk__in=member) | Q(creator_id=user.pk)).values("pk")
+
+
+def visible_files_q(user: Any) -> Q:
+    """Условие "файлы, доступные пользователю" для обычного пользователя"""
+    projects = user_project_ids(user)
+    tasks = Task.objects.filter(
+        Q(assignee_id=user.pk) | Q(creator_id=user.pk) | Q(project_id__in=projects)
+    ).values("pk")
+    return (
+        Q(is_public=True)
+        | Q(uploaded_by_id=user.pk)
+        | Q(user_id=user.pk)
+        | Q(project_id__in=projects)
+        | Q(task_id__in=tasks)
+    )
+
+
+class FileAccess:
+    """Проверка доступа одного пользователя к отдельным файлам"""
+
+    def __init__(self, user: Any):
+        self.user = user
+
+    @cached_property
+    def is_admin(self) -> bool:
+        return getattr(self.user, "role", None) == "admin"
+
+    @cached_property
+    def project_ids(self) -> frozenset:
+        return frozenset(user_project_ids(self.user).values_list("pk", flat=True))
+
+    def filter(self, queryset):
+        """Оставить в queryset только доступные файлы"""
+        if not self.user.is_authenticated:
+            return queryset.filter(is_public=True)
+        if self.is_admin:
+            return queryset
+        return queryset.filter(visible_files_q(self.user))
+
+    def can_access(self, attachment: FileAttachment) -> bool:
+        """
+        Доступен ли файл.
+
+        Запросов к БД нет, кроме первой загрузки проектов пользователя
+        (и самой задачи, если она не загружена через select_related).
+        """
+        if attachment.is_public:
+            return True
+        if not self.user.is_authenticated:
+            return False
+        if self.is_admin:
+            return True
+
+        user_id = self.user.pk
+        if user_id in (attachment.uploaded_by_id, attachment.user_id):
+            return True
+        if attachment.project_id and attachment.project_id in self.project_ids:
+            return True
+        if attachment.task_id:
+            task = attachment.task
+            if user_id in (task.assignee_id, task.creator_id):
+                return True
+            return task.project_id in self.project_ids
+        return False
+
+
+def get_file_access(request) -> FileAccess:
+    """FileAccess текущего пользователя, один на запрос"""
+    access = getattr(request, "_file_access", None)
+    if access is None or access.user != request.user:
+        access = FileAccess(request.user)
+        request._file_access = access
+    return access
@@ -0,0 +1,161 @@
+"""
+Буферизованный учёт скачиваний.
+
+Скачивание не пишет в строку FileAttachment сразу: счётчики копятся в
+памяти процесса и раз в FILE_DOWNLOAD_COUNTER_FLUSH_SECONDS (или после
+FILE_DOWNLOAD_COUNTER_MAX_PENDING скачиваний) сбрасываются в БД пачкой
+атомарных UPDATE ... SET download_count = download_count + N. Популярный
+файл больше не выстраивает все скачивания в очередь на блокировку одной
+строки.
+
+Сброс по интервалу выполняет фоновый поток процесса, а не следующее
+скачивание: счётчики записываются, даже если скачиваний больше нет. Поток
+запускается при первом скачивании (в каждом рабочем процессе отдельно,
+после fork). При SIGKILL или перезапуске воркера теряются только
+скачивания за последний интервал.
+"""
+
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Optional
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import F
+from django.http import HttpRequest, HttpResponseBase
+from django.utils import timezone
+
+from .models import FileAttachment
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLUSH_SECONDS = 10
+DEFAULT_MAX_PENDING = 100
+
+
+class DownloadCounter:
+    """Буфер скачиваний одного процесса"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: Counter = Counter()
+        self._last_accessed: dict[int, datetime] = {}
+        self._last_flush = time.monotonic()
+        self._flusher: Optional[threading.Thread] = None
+        self._flusher_pid: Optional[int] = None
+
+    def record(self, attachment_id: int) -> None:
+        with self._lock:
+            self._pending[attachment_id] += 1
+            self._last_accessed[attachment_id] = timezone.now()
+            due = self._is_due()
+        self._ensure_flusher()
+        if due:
+            self.flush()
+
+    def _ensure_flusher(self) -> None:
+        """Запустить фоновый сброс (и заново - в процессе после fork)"""
+        if not getattr(settings, "FILE_DOWNLOAD_COUNTER_FLUSH_THREAD", True):
+            return
+        pid = os.getpid()
+        with self._lock:
+            alive = self._flusher is not None and self._flusher.is_alive()
+            if alive and self._flusher_pid == pid:
+                return
+            self._flusher_pid = pid
+            self._flusher = threading.Thread(
+                target=self._flush_loop, name="download-counter", daemon=True
+            )
+            self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        while True:
+            time.sleep(self._interval())
+            if self._flusher_pid != os.getpid():
+                return
+            try:
+                self.flush()
+            finally:
+                # Соединение потока не должно висеть открытым между сбросами
+                close_old_connections()
+
+    def pending(self) -> int:
+        with self._lock:
+            return sum(self._pending.values())
+
+    def _interval(self) -> float:
+        return getattr(
+            settings, "FILE_DOWNLOAD_COUNTER_FLUSH_SECONDS", DEFAULT_FLUSH_SECONDS
+        )
+
+    def _is_due(self) -> bool:
+        max_pending = getattr(
+            settings, "FILE_DOWNLOAD_COUNTER_MAX_PENDING", DEFAULT_MAX_PENDING
+        )
+        return (
+            time.monotonic() - self._last_flush >= self._interval()
+            or sum(self._pending.values()) >= max_pending
+        )
+
+    def flush(self) -> int:
+        """Записать накопленные скачивания в БД, вернуть их количество"""
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+            last_accessed, self._last_accessed = self._last_accessed, {}
+            self._last_flush = time.monotonic()
+        if not pending:
+            return 0
+
+        # Один UPDATE на каждое различное число скачиваний
+        by_count: dict[int, list[int]] = defaultdict(list)
+        for attachment_id, count in pending.items():
+            by_count[count].append(attachment_id)
+
+        try:
+            for count, ids in by_count.items():
+                FileAttachment.objects.filter(pk__in=ids).update(
+                    download_count=F("download_count") + count,
+                    last_accessed=max(last_accessed[pk] for pk in ids),
+                )
+        except Exception as e:
+            logger.error(f"❌ [DOWNLOADS] Не удалось записать счётчики: {e}")
+            with self._lock:
+                # Вернём в буфер, запишем при следующем сбросе
+                self._pending.update(pending)
+                for pk, accessed in last_accessed.items():
+                    self._last_accessed.setdefault(pk, accessed)
+            return 0
+        return sum(pending.values())
+
+
+download_counter = DownloadCounter()
+atexit.register(download_counter.flush)
+
+
+def counts_as_download(request: HttpRequest, response: HttpResponseBase) -> bool:
+    """
+    Считать ли ответ скачиванием: весь файл или первый диапазон.
+
+    Докачка и перемотка (Range не с нуля) не увеличивают счётчик. При
+    X-Accel-Redirect ответ Django всегда 200 (диапазон отдаёт nginx),
+    поэтому смотрим на заголовок Range запроса.
+    """
+    if response.has_header("X-Accel-Redirect"):
+        if response.status_code != 200:
+            return False
+        range_header = request.META.get("HTTP_RANGE", "").replace(" ", "")
+        return not range_header or range_header.startswith("bytes=0-")
+    if response.status_code == 200:
+        return True
+    if response.status_code == 206:
+        return response.get("Content-Range", "").startswith("bytes 0-")
+    return False
+
+
+def record_download(attachment: FileAttachment) -> None:
+    download_counter.record(attachment.pk)
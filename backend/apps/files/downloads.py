@@ -0,0 +1,206 @@
+"""
+Отдача вложений на скачивание.
+
+В продакшене (FILE_DOWNLOAD_X_ACCEL_REDIRECT = True) Django только
+проверяет права и передаёт файл nginx через заголовок X-Accel-Redirect:
+байты отдаёт nginx (sendfile, Range), а не воркер Python. В разработке
+файл стримится через FileResponse с поддержкой одного диапазона Range.
+В обоих случаях поддерживаются условные запросы (ETag, Last-Modified).
+Также отдаются миниатюры и превью изображений (для показа, не скачивания).
+"""
+
+import hashlib
+import os
+import re
+from typing import Iterator, Optional
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import (
+    FileResponse,
+    HttpRequest,
+    HttpResponse,
+    HttpResponseBase,
+    StreamingHttpResponse,
+)
+from django.db.models.fields.files import FieldFile
+from django.utils.cache import get_conditional_response
+from django.utils.http import (
+    content_disposition_header,
+    http_date,
+    parse_http_date_safe,
+)
+
+from .models import FileAttachment
+
+CHUNK_SIZE = 64 * 1024
+RENDITION_MAX_AGE = 24 * 60 * 60
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def get_etag(attachment: FileAttachment) -> str:
+    """Идентификатор версии файла для ETag"""
+    uploaded = attachment.upload_date.timestamp()
+    raw = f"{attachment.file.name}:{attachment.file_size}:{uploaded}"
+    return '"%s"' % hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()
+
+
+def get_last_modified(attachment: FileAttachment) -> int:
+    return int(attachment.upload_date.timestamp())
+
+
+def parse_range(header: str, size: int) -> Optional[tuple[int, int]]:
+    """
+    Разбор заголовка Range для одного диапазона.
+
+    Возвращает (начало, конец) включительно, None если заголовок не
+    поддерживается (тогда отдаётся весь файл), ValueError если диапазон
+    не пересекается с файлом.
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        return None
+
+    start, end = match.groups()
+    if not start and not end:
+        return None
+    if not start:
+        # bytes=-500: последние 500 байт
+        length = int(end)
+        if length == 0:
+            raise ValueError(header)
+        return max(size - length, 0), size - 1
+
+    first = int(start)
+    last = min(int(end), size - 1) if end else size - 1
+    if first >= size or first > last:
+        raise ValueError(header)
+    return first, last
+
+
+def range_allowed(request: HttpRequest, etag: str, last_modified: int) -> bool:
+    """If-Range: диапазон действует, только если файл не менялся"""
+    if_range = request.META.get("HTTP_IF_RANGE")
+    if not if_range:
+        return True
+    if if_range.startswith(('"', "W/")):
+        return if_range == etag
+    return parse_http_date_safe(if_range) == last_modified
+
+
+def read_range(path: str, start: int, length: int) -> Iterator[bytes]:
+    with open(path, "rb") as f:
+        f.seek(start)
+        while length > 0:
+            chunk = f.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def build_download_response(
+    request: HttpRequest, attachment: FileAttachment
+) -> HttpResponseBase:
+    """Ответ со скачиванием файла (или 304/412/416)"""
+    return build_file_response(
+        request,
+        attachment.file,
+        etag=get_etag(attachment),
+        last_modified=get_last_modified(attachment),
+        content_type=attachment.mime_type,
+        filename=attachment.original_filename,
+    )
+
+
+def build_rendition_response(
+    request: HttpRequest, attachment: FileAttachment, name: str
+) -> HttpResponseBase:
+    """Миниатюра или превью изображения для показа в браузере"""
+    blob = attachment.blob
+    rendition = getattr(blob, name, None) if blob else None
+    if not rendition:
+        raise FileNotFoundError(name)
+
+    response = build_file_response(
+        request,
+        rendition,
+        etag=f'"{blob.sha256}-{name}"',
+        last_modified=get_last_modified(attachment),
+        content_type="image/jpeg",
+        filename=f"{os.path.splitext(attachment.original_filename)[0]}.{name}.jpg",
+        as_attachment=False,
+    )
+    # Содержимое копии по данному адресу не меняется
+    response["Cache-Control"] = f"private, max-age={RENDITION_MAX_AGE}"
+    return response
+
+
+def build_file_response(
+    request: HttpRequest,
+    file: FieldFile,
+    etag: str,
+    last_modified: int,
+    content_type: str,
+    filename: str,
+    as_attachment: bool = True,
+) -> HttpResponseBase:
+    conditional = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    if conditional is not None:
+        return conditional
+
+    path = file.path
+    if not os.path.exists(path):
+        raise FileNotFoundError(path)
+
+    if getattr(settings, "FILE_DOWNLOAD_X_ACCEL_REDIRECT", False):
+        response: HttpResponseBase = HttpResponse(content_type=content_type)
+        prefix = getattr(settings, "FILE_DOWNLOAD_X_ACCEL_PREFIX", "/protected-media/")
+        response["X-Accel-Redirect"] = prefix + quote(file.name)
+    else:
+        response = _stream_response(request, content_type, path, etag, last_modified)
+        if response.status_code == 416:
+            return response
+
+    response["Content-Disposition"] = content_disposition_header(
+        as_attachment, filename
+    )
+    response["Accept-Ranges"] = "bytes"
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    return response
+
+
+def _stream_response(
+    request: HttpRequest,
+    content_type: str,
+    path: str,
+    etag: str,
+    last_modified: int,
+) -> HttpResponseBase:
+    size = os.path.getsize(path)
+    range_header = request.META.get("HTTP_RANGE")
+
+    if range_header and range_allowed(request, etag, last_modified):
+        try:
+            byte_range = parse_range(range_header, size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+
+        if byte_range is not None:
+            start, end = byte_range
+            length = end - start + 1
+            response = StreamingHttpResponse(
+                read_range(path, start, length),
+                status=206,
+                content_type=content_type,
+            )
+            response["Content-Length"] = str(length)
+            response["Content-Range"] = f"bytes {start}-{end}/{size}"
+            return response
+
+    return FileResponse(open(path, "rb"), content_type=content_type)
@@ -0,0 +1,51 @@
+import time
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand
+
+from apps.files.models import detect_mime_type, sniff_mime_type
+
+SAMPLES = [
+    ("PDF", "report.pdf", b"%PDF-1.4\n" + b"0" * 4096),
+    ("PNG", "image.png", b"\x89PNG\r\n\x1a\n" + b"\x00" * 4096),
+    ("Текст", "notes.txt", b"plain text " * 400),
+]
+
+# Сколько раз тип запрашивается за одну загрузку:
+# FileUploadSerializer, validate_file_type, FileAttachment.save
+LOOKUPS_PER_UPLOAD = 3
+
+
+class Command(BaseCommand):
+    help = (
+        "Стоимость определения MIME типа на одну загрузку: "
+        "отдельное чтение на каждом этапе против одного кэшированного"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=10_000)
+
+    def handle(self, *args, **options):
+        iterations = options["iterations"]
+
+        for label, name, content in SAMPLES:
+            separate = self._measure(detect_mime_type, name, content, iterations)
+            cached = self._measure(sniff_mime_type, name, content, iterations)
+            self.stdout.write(
+                f"📄 {label}: {separate:.1f} мкс -> {cached:.1f} мкс на загрузку "
+                f"(x{separate / cached:.1f})"
+            )
+
+        self.stdout.write(self.style.SUCCESS("✅ Замеры завершены"))
+
+    def _measure(self, detect, name, content, iterations):
+        """Среднее время (мкс) всех определений типа за одну загрузку"""
+        uploads = [SimpleUploadedFile(name, content) for _ in range(iterations)]
+
+        started = time.perf_counter()
+        for upload in uploads:
+            for _ in range(LOOKUPS_PER_UPLOAD):
+                detect(upload)
+        elapsed = time.perf_counter() - started
+
+        return elapsed / iterations * 1_000_000
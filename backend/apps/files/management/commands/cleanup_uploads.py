@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.files.uploads import cleanup_expired_uploads
+
+
+class Command(BaseCommand):
+    help = "Удаление брошенных загрузок частями и их временных файлов"
+
+    def handle(self, *args, **options):
+        deleted = cleanup_expired_uploads()
+        self.stdout.write(self.style.SUCCESS(f"✅ Удалено загрузок: {deleted}"))
@@ -0,0 +1,67 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F
+
+from apps.files.models import FileAttachment, FileBlob, compute_sha256
+from apps.files.usage import LEGACY, change_usage
+
+
+class Command(BaseCommand):
+    help = "Перевод старых вложений на общее хранилище по SHA-256 (дедупликация)"
+
+    def handle(self, *args, **options):
+        linked = duplicates = freed = 0
+
+        legacy = (
+            FileAttachment.objects.filter(blob__isnull=True)
+            .exclude(file="")
+            .order_by("pk")
+        )
+        for attachment in legacy.iterator():
+            try:
+                with attachment.file.open("rb"):
+                    digest = compute_sha256(attachment.file)
+                size = attachment.file.size
+            except FileNotFoundError:
+                self.stdout.write(
+                    self.style.WARNING(f"⚠️ Файл не найден: {attachment.file.name}")
+                )
+                continue
+
+            storage = attachment.file.storage
+            old_name = attachment.file.name
+            with transaction.atomic():
+                blob = (
+                    FileBlob.objects.select_for_update().filter(sha256=digest).first()
+                )
+                if blob is None:
+                    # Первая копия остаётся на месте и становится блобом
+                    blob = FileBlob.objects.create(
+                        sha256=digest,
+                        file=old_name,
+                        size=size,
+                        ref_count=1,
+                        rendition_status=(
+                            "pending" if attachment.file_type == "image" else "none"
+                        ),
+                    )
+                else:
+                    FileBlob.objects.filter(pk=blob.pk).update(
+                        ref_count=F("ref_count") + 1
+                    )
+                    transaction.on_commit(lambda name=old_name: storage.delete(name))
+                    duplicates += 1
+                    freed += size
+
+                FileAttachment.objects.filter(pk=attachment.pk).update(
+                    blob=blob, file=blob.file.name
+                )
+                change_usage([(LEGACY, "")], -1, -attachment.file_size)
+            linked += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ Обработано вложений: {linked}, дубликатов: {duplicates}, "
+                f"освобождено байт: {freed}"
+            )
+        )
@@ -0,0 +1,60 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.files.renditions import process_pending
+
+
+class Command(BaseCommand):
+    help = "Создание миниатюр и превью для загруженных изображений"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=20,
+            help="Сколько изображений обрабатывать за один проход",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Работать постоянно (для запуска под supervisor/systemd)",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5.0,
+            help="Пауза между проходами в режиме --loop, сек",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+
+        if not options["loop"]:
+            done, failed = self._drain(batch_size)
+            self.stdout.write(
+                self.style.SUCCESS(f"✅ Обработано: {done}, ошибок: {failed}")
+            )
+            return
+
+        self.stdout.write(
+            f"🖼️ Воркер миниатюр запущен (интервал {options['interval']} сек)"
+        )
+        try:
+            while True:
+                done, failed = self._drain(batch_size)
+                if done or failed:
+                    self.stdout.write(f"🖼️ Обработано: {done}, ошибок: {failed}")
+                time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING("⏹️ Воркер остановлен"))
+
+    def _drain(self, batch_size):
+        """Обрабатываем пачки, пока очередь не опустеет"""
+        total_done = total_failed = 0
+        while True:
+            done, failed = process_pending(batch_size)
+            total_done += done
+            total_failed += failed
+            if done + failed < batch_size:
+                return total_done, total_failed
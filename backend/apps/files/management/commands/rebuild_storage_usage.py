@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.files.usage import rebuild_usage
+
+
+class Command(BaseCommand):
+    help = "Пересчёт счётчиков использования хранилища по данным файлов"
+
+    def handle(self, *args, **options):
+        rows = rebuild_usage()
+        self.stdout.write(self.style.SUCCESS(f"✅ Пересчитано счётчиков: {rows}"))
@@ -0,0 +1,59 @@
+# Generated by Django 6.0 on 2026-10-18 03:16
+
+from django.db import migrations, models
+
+
+def queue_image_blobs(apps, schema_editor):
+    """Поставить в очередь миниатюр уже загруженные изображения"""
+    FileBlob = apps.get_model("files", "FileBlob")
+    FileBlob.objects.filter(attachments__file_type="image").update(
+        rendition_status="pending"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("files", "0006_fileblob"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="fileblob",
+            name="preview",
+            field=models.FileField(
+                blank=True, max_length=500, upload_to="", verbose_name="Превью"
+            ),
+        ),
+        migrations.AddField(
+            model_name="fileblob",
+            name="rendition_status",
+            field=models.CharField(
+                choices=[
+                    ("none", "Не требуются"),
+                    ("pending", "Ожидают создания"),
+                    ("ready", "Созданы"),
+                    ("failed", "Ошибка"),
+                ],
+                default="none",
+                max_length=20,
+                verbose_name="Статус миниатюр",
+            ),
+        ),
+        migrations.AddField(
+            model_name="fileblob",
+            name="thumbnail",
+            field=models.FileField(
+                blank=True, max_length=500, upload_to="", verbose_name="Миниатюра"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="fileblob",
+            index=models.Index(
+                condition=models.Q(("rendition_status", "pending")),
+                fields=["id"],
+                name="fileblob_rendition_pending_idx",
+            ),
+        ),
+        migrations.RunPython(queue_image_blobs, migrations.RunPython.noop),
+    ]
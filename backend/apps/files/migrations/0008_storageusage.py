@@ -0,0 +1,112 @@
+# Generated by Django 6.0 on 2026-10-18 03:22
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def fill_storage_usage(apps, schema_editor):
+    """Начальные значения счётчиков по уже загруженным файлам"""
+    FileAttachment = apps.get_model("files", "FileAttachment")
+    FileBlob = apps.get_model("files", "FileBlob")
+    StorageUsage = apps.get_model("files", "StorageUsage")
+
+    files = FileAttachment.objects.order_by()
+    rows = []
+
+    def add(scope, key, totals):
+        rows.append(
+            StorageUsage(
+                scope=scope,
+                key=str(key),
+                file_count=totals["count"],
+                total_size=totals["size"] or 0,
+            )
+        )
+
+    add("total", "", files.aggregate(count=Count("id"), size=Sum("file_size")))
+    for scope, field, queryset in (
+        ("user", "uploaded_by_id", files),
+        ("project", "project_id", files.filter(project__isnull=False)),
+        ("file_type", "file_type", files),
+    ):
+        for item in queryset.values(field).annotate(
+            count=Count("id"), size=Sum("file_size")
+        ):
+            add(scope, item[field], item)
+    add(
+        "legacy",
+        "",
+        files.filter(blob__isnull=True).aggregate(
+            count=Count("id"), size=Sum("file_size")
+        ),
+    )
+    add("blobs", "", FileBlob.objects.aggregate(count=Count("id"), size=Sum("size")))
+    StorageUsage.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("files", "0007_blob_renditions"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StorageUsage",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "scope",
+                    models.CharField(
+                        choices=[
+                            ("total", "Всего"),
+                            ("user", "Пользователь"),
+                            ("project", "Проект"),
+                            ("file_type", "Тип файла"),
+                            ("blobs", "Хранимое содержимое"),
+                            ("legacy", "Файлы без блоба"),
+                        ],
+                        max_length=20,
+                        verbose_name="Разрез",
+                    ),
+                ),
+                (
+                    "key",
+                    models.CharField(
+                        blank=True, default="", max_length=64, verbose_name="Ключ"
+                    ),
+                ),
+                (
+                    "file_count",
+                    models.BigIntegerField(default=0, verbose_name="Количество файлов"),
+                ),
+                (
+                    "total_size",
+                    models.BigIntegerField(default=0, verbose_name="Размер (в байтах)"),
+                ),
+            ],
+            options={
+                "verbose_name": "Использование хранилища",
+                "verbose_name_plural": "Использование хранилища",
+                "indexes": [
+                    models.Index(
+                        fields=["scope", "-total_size"], name="storage_usage_top_idx"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("scope", "key"), name="storage_usage_scope_key_uniq"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(fill_storage_usage, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 6.0 on 2026-10-18 03:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("files", "0008_storageusage"),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name="storageusage",
+            name="storage_usage_scope_key_uniq",
+        ),
+        migrations.AddField(
+            model_name="storageusage",
+            name="shard",
+            field=models.PositiveSmallIntegerField(default=0, verbose_name="Шард"),
+        ),
+        migrations.AddConstraint(
+            model_name="storageusage",
+            constraint=models.UniqueConstraint(
+                fields=("scope", "key", "shard"),
+                name="storage_usage_scope_key_shard_uniq",
+            ),
+        ),
+    ]
@@ -1,15 +1,20 @@
 # mypy: ignore-errors
+import hashlib
+import logging
 import mimetypes
 import os
+import uuid
 from pathlib import Path
-from typing import TYPE_CHECKING, Optional, Any, Union, cast
+from typing import TYPE_CHECKING, Optional, Any, Union
 
 import filetype
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
 from django.core.files import File as DjangoFile
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
+from django.db.models.fields.files import FieldFile
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
@@ -23,27 +28,55 @@ if TYPE_CHECKING:
 else:
     UserType = get_user_model()
 
+logger = logging.getLogger(__name__)
+
+# Сколько байт читается для определения типа по сигнатуре
+SNIFF_SIZE = 2048
+SNIFFED_MIME_ATTR = "_sniffed_mime_type"
 
-def validate_file_type(value: DjangoFile) -> None:
-    """Валидатор для проверки типа файла с использованием filetype"""
-    # Читаем начало файла
-    value.seek(0)
-    file_content = value.read(1024)
-    value.seek(0)  # Возвращаемся в начало файла
 
-    # Используем filetype для определения реального типа файла
+def detect_mime_type(value: DjangoFile) -> Optional[str]:
+    """
+    Определение MIME типа: сигнатура (filetype), затем расширение имени,
+    затем Content-Type, присланный клиентом
+    """
+    mime = None
     try:
-        kind = filetype.guess(file_content)
+        value.seek(0)
+        header = value.read(SNIFF_SIZE)
+        value.seek(0)
+        kind = filetype.guess(header)
         if kind:
             mime = kind.mime
-        else:
-            # Если filetype не определил, используем расширение
-            filename = value.name if value.name else ""
-            mime = mimetypes.guess_type(filename)[0]
-    except Exception:
-        # Если ошибка, используем расширение
-        filename = value.name if value.name else ""
-        mime = mimetypes.guess_type(filename)[0]
+    except Exception as e:
+        logger.warning(f"⚠️ [FILES] Не удалось определить MIME тип по сигнатуре: {e}")
+
+    if not mime:
+        mime = mimetypes.guess_type(value.name or "")[0]
+    if not mime:
+        mime = getattr(value, "content_type", None)
+    return mime
+
+
+def sniff_mime_type(value: DjangoFile) -> Optional[str]:
+    """
+    MIME тип загружаемого файла, определяется один раз.
+
+    Результат запоминается на самом объекте файла (UploadedFile), поэтому
+    сериализатор, валидатор модели и FileAttachment.save не читают файл
+    повторно.
+    """
+    if isinstance(value, FieldFile):
+        # FieldFile оборачивает загруженный файл - кэш хранится на нём
+        value = value.file
+    if not hasattr(value, SNIFFED_MIME_ATTR):
+        setattr(value, SNIFFED_MIME_ATTR, detect_mime_type(value))
+    return getattr(value, SNIFFED_MIME_ATTR)
+
+
+def validate_file_type(value: DjangoFile) -> None:
+    """Валидатор для проверки типа файла с использованием filetype"""
+    mime = sniff_mime_type(value)
 
     if not mime:
         raise ValidationError(_("Не удалось определить тип файла"))
@@ -88,6 +121,141 @@ def file_upload_path(instance: "FileAttachment", filename: str) -> str:
     return os.path.join("uploads", folder, new_filename)
 
 
+def compute_sha256(value: DjangoFile) -> str:
+    """SHA-256 содержимого файла, читается потоком по частям"""
+    digest = hashlib.sha256()
+    for chunk in value.chunks():
+        digest.update(chunk)
+    value.seek(0)
+    return digest.hexdigest()
+
+
+def blob_upload_path(digest: str, filename: str) -> str:
+    """Путь блоба в хранилище: blobs/ab/cd/<sha256><расширение>"""
+    extension = Path(filename).suffix.lower()
+    return os.path.join("blobs", digest[:2], digest[2:4], f"{digest}{extension}")
+
+
+class FileBlobManager(models.Manager):
+    def acquire(self, content: DjangoFile, digest: str, filename: str) -> "FileBlob":
+        """
+        Получить блоб с данным содержимым, увеличив счётчик ссылок.
+
+        Если такого содержимого ещё нет, файл сохраняется в хранилище
+        (для временных файлов - переносом, без копирования).
+
+        Вызывается в транзакции, в которой сохраняется вложение
+        (FileAttachment.save): если вложение не запишется, счётчик ссылок
+        откатится вместе с ним.
+        """
+        with transaction.atomic():
+            blob = self.select_for_update().filter(sha256=digest).first()
+            if blob is None:
+                storage = self.model._meta.get_field("file").storage
+                name = blob_upload_path(digest, filename)
+                stored = None
+                if not storage.exists(name):
+                    name = stored = storage.save(name, content)
+                try:
+                    with transaction.atomic():
+                        return self.create(
+                            sha256=digest, file=name, size=content.size, ref_count=1
+                        )
+                except IntegrityError:
+                    # Тот же файл параллельно загрузили в другой транзакции:
+                    # используем его блоб, а свою копию удаляем
+                    blob = self.select_for_update().get(sha256=digest)
+                    if stored and stored != blob.file.name:
+                        storage.delete(stored)
+
+            self.filter(pk=blob.pk).update(ref_count=F("ref_count") + 1)
+            blob.ref_count += 1
+            return blob
+
+    def release(self, blob_id: int) -> None:
+        """Уменьшить счётчик ссылок; последний владелец удаляет файл"""
+        with transaction.atomic():
+            blob = self.select_for_update().filter(pk=blob_id).first()
+            if blob is None:
+                return
+            if blob.ref_count > 1:
+                self.filter(pk=blob.pk).update(ref_count=F("ref_count") - 1)
+                return
+
+            storage = blob.file.storage
+            name = blob.file.name
+            names = [name] + [f.name for f in (blob.thumbnail, blob.preview) if f]
+            blob.delete()
+
+            def delete_file() -> None:
+                # Файл мог снова понадобиться новому блобу с тем же содержимым
+                if not self.filter(file=name).exists():
+                    for stored in names:
+                        storage.delete(stored)
+
+            transaction.on_commit(delete_file)
+
+
+class FileBlob(models.Model):
+    """
+    Содержимое файла, хранящееся один раз.
+
+    Вложения с одинаковым содержимым ссылаются на один блоб, ``ref_count`` -
+    число таких вложений. Физический файл удаляется вместе с последней
+    ссылкой.
+
+    Для изображений фоновый воркер (generate_renditions) создаёт рядом
+    с блобом уменьшенные копии: миниатюру и превью.
+    """
+
+    RENDITION_STATUSES = (
+        ("none", "Не требуются"),
+        ("pending", "Ожидают создания"),
+        ("ready", "Созданы"),
+        ("failed", "Ошибка"),
+    )
+
+    sha256 = models.CharField(_("SHA-256"), max_length=64, unique=True)
+    file = models.FileField(_("Файл"), max_length=500)
+    size = models.PositiveBigIntegerField(_("Размер (в байтах)"))
+    ref_count = models.PositiveIntegerField(_("Количество ссылок"), default=0)
+    created_at = models.DateTimeField(_("Дата создания"), auto_now_add=True)
+
+    # Уменьшенные копии изображений
+    thumbnail = models.FileField(_("Миниатюра"), max_length=500, blank=True)
+    preview = models.FileField(_("Превью"), max_length=500, blank=True)
+    rendition_status = models.CharField(
+        _("Статус миниатюр"),
+        max_length=20,
+        choices=RENDITION_STATUSES,
+        default="none",
+    )
+
+    objects = FileBlobManager()
+
+    class Meta:
+        verbose_name = _("Блоб файла")
+        verbose_name_plural = _("Блобы файлов")
+        indexes = [
+            models.Index(
+                fields=["id"],
+                name="fileblob_rendition_pending_idx",
+                condition=models.Q(rendition_status="pending"),
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.sha256[:12]} ({self.ref_count})"
+
+
+class FileAttachmentQuerySet(models.QuerySet):
+    def visible_to(self, user: Any) -> "FileAttachmentQuerySet":
+        """Файлы, доступные пользователю (правило в apps.files.access)"""
+        from .access import FileAccess
+
+        return FileAccess(user).filter(self)
+
+
 class FileAttachment(models.Model):
     """Модель для хранения файлов и вложений"""
 
@@ -148,6 +316,16 @@ class FileAttachment(models.Model):
         verbose_name=_("Задача"),
     )
 
+    # Общее хранилище содержимого; у старых файлов может отсутствовать
+    blob = models.ForeignKey(
+        FileBlob,
+        on_delete=models.PROTECT,
+        related_name="attachments",
+        null=True,
+        blank=True,
+        verbose_name=_("Блоб"),
+    )
+
     # Описание и метаданные
     description = models.TextField(_("Описание"), blank=True, default="")
     is_public = models.BooleanField(_("Публичный файл"), default=False)
@@ -155,6 +333,8 @@ class FileAttachment(models.Model):
     last_accessed = models.DateTimeField(_("Последний доступ"), null=True, blank=True)
     download_count = models.PositiveIntegerField(_("Количество скачиваний"), default=0)
 
+    objects = FileAttachmentQuerySet.as_manager()
+
     # Индексы для оптимизации запросов
     class Meta:
         verbose_name = _("Файл")
@@ -177,9 +357,30 @@ class FileAttachment(models.Model):
         """Переопределяем save для автоматического определения типа файла"""
         if not self.pk:  # Только при создании
             self._determine_file_metadata()
+            if self.file and not self.file._committed:
+                # Ссылка на блоб и само вложение записываются вместе
+                with transaction.atomic():
+                    self._store_blob()
+                    super().save(*args, **kwargs)
+                return
 
         super().save(*args, **kwargs)
 
+    def _store_blob(self) -> None:
+        """Сохранить содержимое через блоб, одинаковые файлы не дублируются"""
+        digest = compute_sha256(self.file)
+        self.blob = FileBlob.objects.acquire(
+            self.file.file, digest, self.original_filename
+        )
+        # Строка вместо файла: FileField не будет сохранять его повторно
+        self.file = self.blob.file.name
+
+        if self.file_type == "image" and self.blob.rendition_status == "none":
+            # Миниатюры создаёт фоновый воркер, загрузка их не ждёт
+            FileBlob.objects.filter(pk=self.blob.pk, rendition_status="none").update(
+                rendition_status="pending"
+            )
+
     def _determine_file_metadata(self) -> None:
         """Определение метаданных файла (вынесено для уменьшения сложности)"""
         self._determine_mime_type()
@@ -187,28 +388,13 @@ class FileAttachment(models.Model):
         self._set_filename_and_size()
 
     def _determine_mime_type(self) -> None:
-        """Определение MIME типа с помощью filetype"""
+        """Определение MIME типа (результат проверки при загрузке переиспользуется)"""
         try:
-            # Подготовка данных для filetype
-            if hasattr(self.file, "file"):
-                self.file.seek(0)
-                file_content = self.file.read(1024)
-                self.file.seek(0)
-                kind = filetype.guess(file_content)
-            else:
-                self.file.seek(0)
-                file_content = self.file.read(1024)
-                self.file.seek(0)
-                kind = filetype.guess(file_content)
-
-            if kind:
-                self.mime_type = kind.mime
-                return
+            mime = sniff_mime_type(self.file)
         except Exception as e:
-            print(f"Error determining MIME type with filetype: {e}")
-
-        # Fallback: используем расширение
-        self.mime_type = self._get_mime_from_extension()
+            logger.warning(f"⚠️ [FILES] Не удалось определить MIME тип: {e}")
+            mime = None
+        self.mime_type = mime or self._get_mime_from_extension()
 
     def _get_mime_from_extension(self) -> str:
         """Получение MIME типа по расширению файла"""
@@ -270,20 +456,6 @@ class FileAttachment(models.Model):
         elif not hasattr(self, "file_size") or not self.file_size:
             self.file_size = 0
 
-    def delete(self, *args: Any, **kwargs: Any) -> tuple[int, dict[str, int]]:
-        """Удаляем физический файл при удалении записи"""
-        if self.file:
-            storage = self.file.storage
-            path = self.file.path
-            result = super().delete(*args, **kwargs)
-            try:
-                storage.delete(path)
-            except Exception:
-                pass  # Игнорируем ошибки удаления файла
-            return result
-        else:
-            return super().delete(*args, **kwargs)
-
     @property
     def extension(self) -> str:
         """Возвращает расширение файла"""
@@ -306,61 +478,132 @@ class FileAttachment(models.Model):
         """Возвращает URL для доступа к файлу"""
         return self.file.url if self.file else None
 
-    def increment_download_count(self) -> None:
-        """Увеличивает счетчик скачиваний"""
-        self.download_count += 1
+    def increment_download_count(self, count: int = 1, refresh: bool = False) -> None:
+        """
+        Увеличивает счетчик скачиваний атомарным UPDATE.
+
+        Новое значение перечитывается из БД только с ``refresh=True`` (если
+        его нужно показать). Для отдачи файлов используется буфер
+        apps.files.counters, который вызывает такой же UPDATE сразу для
+        пачки скачиваний.
+        """
         self.last_accessed = timezone.now()
-        self.save(update_fields=["download_count", "last_accessed"])
+        FileAttachment.objects.filter(pk=self.pk).update(
+            download_count=F("download_count") + count,
+            last_accessed=self.last_accessed,
+        )
+        if refresh:
+            self.refresh_from_db(fields=["download_count"])
 
     def can_access(self, user: Any) -> bool:
         """Проверяет, имеет ли пользователь доступ к файлу"""
-        if self.is_public:
-            return True
-
-        if not hasattr(user, "is_authenticated") or not user.is_authenticated:
-            return False
-
-        # Администратор имеет доступ ко всем файлам
-        if hasattr(user, "role") and user.role == "admin":
-            return True
-
-        # Владелец файла имеет доступ
-        if hasattr(user, "id") and hasattr(self.uploaded_by, "id"):
-            if user.id == self.uploaded_by.id:
-                return True
-
-        # Проверяем доступ через связанные объекты
-        if hasattr(user, "id") and self.user and hasattr(self.user, "id"):
-            if user.id == self.user.id:
-                return True
-
-        if self.project and hasattr(user, "id"):
-            # Для TYPE_CHECKING используем каст
-            if TYPE_CHECKING:
-                project = cast("Project", self.project)
-                return project.members.filter(id=user.id).exists()
-            else:
-                return self.project.members.filter(id=user.id).exists()
-
-        if self.task and hasattr(user, "id"):
-            # Для TYPE_CHECKING используем каст
-            if TYPE_CHECKING:
-                task = cast("Task", self.task)
-                if task.assignee and task.assignee.id == user.id:
-                    return True
-                if task.creator and task.creator.id == user.id:
-                    return True
-                if task.project and task.project.members.filter(id=user.id).exists():
-                    return True
-            else:
-                if self.task.assignee and self.task.assignee.id == user.id:
-                    return True
-                if self.task.creator and self.task.creator.id == user.id:
-                    return True
-                if (
-                    self.task.project
-                    and self.task.project.members.filter(id=user.id).exists()
-                ):
-                    return True
-
-        return False
+        from .access import FileAccess
+
+        return FileAccess(user).can_access(self)
+
+
+class StorageUsage(models.Model):
+    """
+    Счётчик занятого места (файлов и байт) в разрезе.
+
+    Поддерживается при загрузке и удалении (apps.files.usage), поэтому
+    статистика хранилища и квоты читают готовые строки, а не считают
+    агрегаты по всей таблице файлов. Общие разрезы (всего, тип файла,
+    блобы) разбиты на несколько строк-шардов, значение - их сумма.
+    """
+
+    SCOPES = (
+        ("total", "Всего"),
+        ("user", "Пользователь"),
+        ("project", "Проект"),
+        ("file_type", "Тип файла"),
+        ("blobs", "Хранимое содержимое"),
+        ("legacy", "Файлы без блоба"),
+    )
+
+    scope = models.CharField(_("Разрез"), max_length=20, choices=SCOPES)
+    key = models.CharField(_("Ключ"), max_length=64, blank=True, default="")
+    file_count = models.BigIntegerField(_("Количество файлов"), default=0)
+    total_size = models.BigIntegerField(_("Размер (в байтах)"), default=0)
+    shard = models.PositiveSmallIntegerField(_("Шард"), default=0)
+
+    class Meta:
+        verbose_name = _("Использование хранилища")
+        verbose_name_plural = _("Использование хранилища")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["scope", "key", "shard"],
+                name="storage_usage_scope_key_shard_uniq",
+            )
+        ]
+        indexes = [
+            models.Index(fields=["scope", "-total_size"], name="storage_usage_top_idx")
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.scope}:{self.key} ({self.file_count}, {self.total_size})"
+
+
+class UploadSession(models.Model):
+    """Сессия загрузки файла частями (init / PUT chunk / complete)"""
+
+    STATUSES = (
+        ("active", "Загружается"),
+        ("complete", "Завершена"),
+    )
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    uploaded_by = models.ForeignKey(
+        UserType,
+        on_delete=models.CASCADE,
+        related_name="upload_sessions",
+        verbose_name=_("Загружает пользователь"),
+    )
+    filename = models.CharField(_("Имя файла"), max_length=255)
+    size = models.PositiveBigIntegerField(_("Размер файла (в байтах)"))
+    received = models.PositiveBigIntegerField(_("Получено байт"), default=0)
+    status = models.CharField(
+        _("Статус"), max_length=20, choices=STATUSES, default="active"
+    )
+
+    # Куда прикрепить файл после завершения
+    project = models.ForeignKey(
+        "projects.Project",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        verbose_name=_("Проект"),
+    )
+    task = models.ForeignKey(
+        "tasks.Task",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        verbose_name=_("Задача"),
+    )
+    description = models.TextField(_("Описание"), blank=True, default="")
+    is_public = models.BooleanField(_("Публичный файл"), default=False)
+    attachment = models.ForeignKey(
+        FileAttachment,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        verbose_name=_("Файл"),
+    )
+
+    created_at = models.DateTimeField(_("Дата создания"), auto_now_add=True)
+    updated_at = models.DateTimeField(_("Дата обновления"), auto_now=True)
+
+    class Meta:
+        verbose_name = _("Сессия загрузки")
+        verbose_name_plural = _("Сессии загрузки")
+        ordering = ["-created_at"]
+        indexes = [models.Index(fields=["status", "updated_at"])]
+
+    def __str__(self) -> str:
+        return f"{self.filename} ({self.received}/{self.size})"
+
+    @property
+    def temp_path(self) -> Path:
+        """Временный файл, в который дописываются части"""
+        return Path(settings.CHUNKED_UPLOAD_DIR) / f"{self.id}.part"
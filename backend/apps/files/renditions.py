@@ -0,0 +1,107 @@
+"""
+Уменьшенные копии изображений (миниатюра и превью).
+
+Загрузка только помечает блоб изображения как ``pending``; копии создаёт
+фоновый воркер - команда ``manage.py generate_renditions``. Копии
+хранятся рядом с блобом (``blobs/ab/cd/<sha256>.thumbnail.jpg``) и
+создаются один раз на содержимое, а не на каждое вложение.
+"""
+
+import logging
+import os
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from .models import FileBlob
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIZES = {"preview": 1024, "thumbnail": 256}
+DEFAULT_QUALITY = 85
+
+
+def get_rendition_sizes() -> dict[str, int]:
+    return getattr(settings, "FILE_RENDITION_SIZES", DEFAULT_SIZES)
+
+
+def rendition_path(blob: FileBlob, name: str) -> str:
+    base, _ = os.path.splitext(blob.file.name)
+    return f"{base}.{name}.jpg"
+
+
+def _flatten(image: Image.Image) -> Image.Image:
+    """Привести к RGB для JPEG, прозрачность - на белом фоне"""
+    if image.mode in ("RGB", "L"):
+        return image
+    if "A" in image.getbands() or "transparency" in image.info:
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, "white")
+        background.paste(image, mask=image.getchannel("A"))
+        return background
+    return image.convert("RGB")
+
+
+def render_blob(blob: FileBlob) -> bool:
+    """Создать копии для блоба; вернуть False, если файл не открылся"""
+    sizes = sorted(get_rendition_sizes().items(), key=lambda item: -item[1])
+    quality = getattr(settings, "FILE_RENDITION_QUALITY", DEFAULT_QUALITY)
+    storage = blob.file.storage
+
+    try:
+        with blob.file.open("rb") as f, Image.open(f) as source:
+            # JPEG декодируется сразу в уменьшенном масштабе
+            source.draft("RGB", (sizes[0][1], sizes[0][1]))
+            image = _flatten(ImageOps.exif_transpose(source))
+
+            # Каждая следующая копия уменьшается из предыдущей
+            for name, size in sizes:
+                image.thumbnail((size, size))
+                buffer = BytesIO()
+                image.save(buffer, "JPEG", quality=quality, optimize=True)
+                path = rendition_path(blob, name)
+                if storage.exists(path):
+                    storage.delete(path)
+                setattr(blob, name, storage.save(path, ContentFile(buffer.getvalue())))
+    except (
+        OSError,
+        ValueError,
+        UnidentifiedImageError,
+        Image.DecompressionBombError,
+    ) as e:
+        logger.warning(f"⚠️ [RENDITIONS] Не удалось обработать {blob.file.name}: {e}")
+        blob.rendition_status = "failed"
+        blob.save(update_fields=["rendition_status"])
+        return False
+
+    blob.rendition_status = "ready"
+    blob.save(update_fields=["thumbnail", "preview", "rendition_status"])
+    return True
+
+
+def process_pending(batch_size: int = 20) -> tuple[int, int]:
+    """
+    Обработать до ``batch_size`` блобов, вернуть (создано, ошибок).
+
+    Каждый блоб блокируется с SKIP LOCKED на время обработки, поэтому
+    несколько воркеров не обрабатывают одно изображение дважды.
+    """
+    done = failed = 0
+    for _ in range(batch_size):
+        with transaction.atomic():
+            blob = (
+                FileBlob.objects.select_for_update(skip_locked=True)
+                .filter(rendition_status="pending")
+                .order_by("pk")
+                .first()
+            )
+            if blob is None:
+                break
+            if render_blob(blob):
+                done += 1
+            else:
+                failed += 1
+    return done, failed
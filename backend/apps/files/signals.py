@@ -0,0 +1,46 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import FileAttachment, FileBlob
+from .usage import BLOBS, attachment_scopes, change_usage
+
+
+@receiver(post_delete, sender=FileAttachment)
+def release_file_content(sender, instance, **kwargs):
+    """
+    Освобождаем содержимое удалённого вложения.
+
+    Сигнал срабатывает и при каскадном удалении (вместе с задачей или
+    проектом), поэтому счётчики ссылок блобов не расходятся.
+    """
+    if instance.blob_id:
+        FileBlob.objects.release(instance.blob_id)
+    elif instance.file:
+        # Старые файлы без блоба принадлежат только этому вложению
+        try:
+            instance.file.storage.delete(instance.file.name)
+        except Exception:
+            pass  # Игнорируем ошибки удаления файла
+
+
+@receiver(post_save, sender=FileAttachment)
+def count_uploaded_file(sender, instance, created, **kwargs):
+    """Учитываем новый файл в счётчиках использования хранилища"""
+    if created:
+        change_usage(attachment_scopes(instance), 1, instance.file_size)
+
+
+@receiver(post_delete, sender=FileAttachment)
+def count_deleted_file(sender, instance, **kwargs):
+    change_usage(attachment_scopes(instance), -1, -instance.file_size)
+
+
+@receiver(post_save, sender=FileBlob)
+def count_stored_blob(sender, instance, created, **kwargs):
+    if created:
+        change_usage([(BLOBS, "")], 1, instance.size)
+
+
+@receiver(post_delete, sender=FileBlob)
+def count_released_blob(sender, instance, **kwargs):
+    change_usage([(BLOBS, "")], -1, -instance.size)
@@ -0,0 +1,191 @@
+"""
+Загрузка больших файлов частями.
+
+Клиент создаёт сессию (имя и размер файла), затем отправляет части
+запросами PUT с заголовком ``Content-Range: bytes <start>-<end>/<size>``.
+Части дописываются во временный файл на диске потоком, без загрузки в
+память; после обрыва клиент узнаёт смещение (``received``) и продолжает с
+него. На завершении временный файл переносится в хранилище (rename, без
+копирования; если такое содержимое уже хранится - удаляется) и создаётся
+FileAttachment.
+"""
+
+import os
+import re
+from datetime import timedelta
+from typing import BinaryIO, Optional
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+
+from .models import FileAttachment, UploadSession, validate_file_type
+
+COPY_BUFFER_SIZE = 64 * 1024
+CONTENT_RANGE_RE = re.compile(r"^bytes (\d+)-(\d+)/(\d+)$")
+
+
+class UploadError(Exception):
+    """Ошибка загрузки части; ``offset`` - сколько байт сервер уже получил"""
+
+    def __init__(self, message: str, offset: Optional[int] = None):
+        super().__init__(message)
+        self.offset = offset
+
+
+class OffsetMismatch(UploadError):
+    """Часть не продолжает уже полученные данные"""
+
+
+class ChunkedFile(File):
+    """
+    Готовый файл на диске под исходным именем.
+
+    Наличие temporary_file_path() позволяет FileSystemStorage перенести
+    файл в хранилище вместо копирования.
+    """
+
+    def __init__(self, path: str, name: str):
+        super().__init__(open(path, "rb"), name=name)
+        self.path = path
+
+    def temporary_file_path(self) -> str:
+        return self.path
+
+
+def parse_content_range(header: str) -> tuple[int, int, int]:
+    match = CONTENT_RANGE_RE.match((header or "").strip())
+    if not match:
+        raise UploadError("Нужен заголовок Content-Range: bytes <start>-<end>/<size>")
+    start, end, total = (int(value) for value in match.groups())
+    if end < start:
+        raise UploadError("Неверный диапазон Content-Range")
+    return start, end, total
+
+
+def append_chunk(session_id, content_range: str, stream: BinaryIO) -> UploadSession:
+    """
+    Дописать часть из потока запроса во временный файл.
+
+    Строка сессии блокируется на время записи, поэтому параллельные PUT одной
+    сессии выполняются по очереди и не перемешивают данные.
+    """
+    start, end, total = parse_content_range(content_range)
+    length = end - start + 1
+
+    with transaction.atomic():
+        session = UploadSession.objects.select_for_update().get(pk=session_id)
+
+        if session.status != "active":
+            raise UploadError("Загрузка уже завершена", session.received)
+        if total != session.size or end >= session.size:
+            raise UploadError(
+                "Диапазон не совпадает с размером файла", session.received
+            )
+        if length > settings.CHUNKED_UPLOAD_CHUNK_SIZE:
+            raise UploadError(
+                f"Часть больше {settings.CHUNKED_UPLOAD_CHUNK_SIZE} байт",
+                session.received,
+            )
+        if start != session.received:
+            raise OffsetMismatch(
+                f"Ожидается часть с байта {session.received}", session.received
+            )
+
+        path = session.temp_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if start and (not path.exists() or path.stat().st_size < start):
+            # Временный файл потерян - загрузку придётся начать заново
+            session.received = 0
+            session.save(update_fields=["received", "updated_at"])
+        else:
+            written = _write_chunk(path, start, length, stream)
+            if written != length:
+                raise UploadError(
+                    "Получено меньше байт, чем указано в Content-Range",
+                    session.received,
+                )
+            session.received = start + written
+            session.save(update_fields=["received", "updated_at"])
+
+    if session.received != end + 1:
+        raise OffsetMismatch("Временный файл утерян, начните с байта 0", 0)
+    return session
+
+
+def _write_chunk(path, start: int, length: int, stream: BinaryIO) -> int:
+    """Записать часть с позиции start, при обрыве откатить файл к start"""
+    with open(path, "ab") as f:
+        # Файл мог остаться длиннее после оборванной записи
+        f.truncate(start)
+        written = 0
+        while written < length:
+            data = stream.read(min(COPY_BUFFER_SIZE, length - written))
+            if not data:
+                break
+            f.write(data)
+            written += len(data)
+
+        if written != length:
+            f.truncate(start)
+    return written
+
+
+def complete_upload(session_id) -> FileAttachment:
+    """Проверить собранный файл и создать FileAttachment"""
+    with transaction.atomic():
+        session = UploadSession.objects.select_for_update().get(pk=session_id)
+
+        if session.status == "complete" and session.attachment_id:
+            return session.attachment
+        if session.received != session.size:
+            raise UploadError(
+                f"Получено {session.received} из {session.size} байт", session.received
+            )
+
+        chunked = ChunkedFile(str(session.temp_path), session.filename)
+        try:
+            # Та же проверка содержимого, что и при обычной загрузке
+            validate_file_type(chunked)
+            attachment = FileAttachment(
+                file=chunked,
+                task=session.task,
+                project=session.project,
+                user=session.uploaded_by,
+                uploaded_by=session.uploaded_by,
+                description=session.description,
+                is_public=session.is_public,
+            )
+            attachment.save()
+        finally:
+            chunked.close()
+        # Если такое содержимое уже было в хранилище, файл не перенесён
+        session.temp_path.unlink(missing_ok=True)
+
+        session.status = "complete"
+        session.attachment = attachment
+        session.save(update_fields=["status", "attachment", "updated_at"])
+    return attachment
+
+
+def abort_upload(session: UploadSession) -> None:
+    """Отменить загрузку и удалить временный файл"""
+    try:
+        os.remove(session.temp_path)
+    except FileNotFoundError:
+        pass
+    session.delete()
+
+
+def cleanup_expired_uploads() -> int:
+    """Удалить брошенные незавершённые загрузки"""
+    hours = getattr(settings, "CHUNKED_UPLOAD_EXPIRY_HOURS", 24)
+    expired = UploadSession.objects.filter(
+        status="active", updated_at__lt=timezone.now() - timedelta(hours=hours)
+    )
+    count = 0
+    for session in expired.iterator():
+        abort_upload(session)
+        count += 1
+    return count
@@ -0,0 +1,202 @@
+"""
+Счётчики использования хранилища.
+
+StorageUsage хранит количество файлов и байт по разрезам: всего, по
+пользователю (uploaded_by), проекту, типу файла, а также реально
+занятое место (блобы и старые файлы без блоба). Сигналы загрузки и
+удаления меняют счётчики атомарным UPDATE с F(), поэтому статистика
+хранилища и проверка квоты - чтение нескольких строк по ключу.
+
+Общие разрезы (всего, тип файла, блобы, старые файлы) меняет каждая
+загрузка, поэтому они разбиты на STORAGE_USAGE_SHARDS строк: запись идёт
+в случайный шард, а не в одну строку на всех, чтение суммирует шарды.
+Если счётчики разошлись с данными, их пересчитывает команда
+``manage.py rebuild_storage_usage``.
+"""
+
+import random
+from typing import Any, Iterable, Optional
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, QuerySet, Sum
+
+from .models import FileAttachment, FileBlob, StorageUsage
+
+TOTAL = "total"
+USER = "user"
+PROJECT = "project"
+FILE_TYPE = "file_type"
+BLOBS = "blobs"
+LEGACY = "legacy"
+
+# Разрезы, которые меняет почти каждая загрузка
+SHARDED_SCOPES = frozenset({TOTAL, FILE_TYPE, BLOBS, LEGACY})
+DEFAULT_SHARDS = 8
+
+Scope = tuple[str, Any]
+
+
+def attachment_scopes(attachment: FileAttachment) -> list[Scope]:
+    scopes = [
+        (TOTAL, ""),
+        (USER, attachment.uploaded_by_id),
+        (FILE_TYPE, attachment.file_type),
+    ]
+    if attachment.project_id:
+        scopes.append((PROJECT, attachment.project_id))
+    if not attachment.blob_id:
+        scopes.append((LEGACY, ""))
+    return scopes
+
+
+def get_shard_count() -> int:
+    return max(1, int(getattr(settings, "STORAGE_USAGE_SHARDS", DEFAULT_SHARDS)))
+
+
+def pick_shard(scope: str) -> int:
+    if scope in SHARDED_SCOPES:
+        return random.randrange(get_shard_count())
+    return 0
+
+
+def change_usage(scopes: Iterable[Scope], files: int, size: int) -> None:
+    """Изменить счётчики на ``files`` файлов и ``size`` байт"""
+    for scope, key in scopes:
+        row = {"scope": scope, "key": str(key), "shard": pick_shard(scope)}
+        changes = {
+            "file_count": F("file_count") + files,
+            "total_size": F("total_size") + size,
+        }
+        if StorageUsage.objects.filter(**row).update(**changes):
+            continue
+        try:
+            with transaction.atomic():
+                StorageUsage.objects.create(**row, file_count=files, total_size=size)
+        except IntegrityError:
+            # Строку параллельно создал другой запрос
+            StorageUsage.objects.filter(**row).update(**changes)
+
+
+def summed_usage(queryset: QuerySet) -> list[StorageUsage]:
+    """Строки queryset, сложенные по разрезу и ключу (сумма шардов)"""
+    grouped = (
+        queryset.order_by()
+        .values("scope", "key")
+        .annotate(files=Sum("file_count"), size=Sum("total_size"))
+    )
+    return [
+        StorageUsage(
+            scope=usage["scope"],
+            key=usage["key"],
+            file_count=usage["files"],
+            total_size=usage["size"],
+        )
+        for usage in grouped
+    ]
+
+
+def get_usage(scope: str, key: Any = "") -> StorageUsage:
+    rows = summed_usage(StorageUsage.objects.filter(scope=scope, key=str(key)))
+    return rows[0] if rows else StorageUsage(scope=scope, key=str(key))
+
+
+def get_user_quota() -> Optional[int]:
+    return getattr(settings, "FILE_USER_QUOTA_BYTES", None)
+
+
+def quota_exceeded(user: Any, size: int) -> bool:
+    """Превысит ли загрузка ``size`` байт квоту пользователя"""
+    quota = get_user_quota()
+    if not quota or getattr(user, "role", None) == "admin":
+        return False
+    return get_usage(USER, user.pk).total_size + size > quota
+
+
+def get_storage_summary() -> dict[str, Any]:
+    """Итоговые счётчики для статистики хранилища"""
+    rows = {
+        (usage.scope, usage.key): usage
+        for usage in summed_usage(
+            StorageUsage.objects.filter(scope__in=[TOTAL, FILE_TYPE, BLOBS, LEGACY])
+        )
+    }
+
+    def row(scope: str, key: str = "") -> StorageUsage:
+        return rows.get((scope, key)) or StorageUsage(scope=scope, key=key)
+
+    total = row(TOTAL)
+    stored_size = row(BLOBS).total_size + row(LEGACY).total_size
+    return {
+        "total_files": total.file_count,
+        "total_size": total.total_size,
+        "image_count": row(FILE_TYPE, "image").file_count,
+        "document_count": row(FILE_TYPE, "document").file_count,
+        "blob_count": row(BLOBS).file_count,
+        "stored_size": stored_size,
+        "dedup_ratio": (
+            round(total.total_size / stored_size, 2) if stored_size else 1.0
+        ),
+    }
+
+
+def get_top_users(limit: int = 10) -> list[dict[str, Any]]:
+    from apps.users.models import User
+
+    top = list(
+        StorageUsage.objects.filter(scope=USER, file_count__gt=0).order_by(
+            "-total_size"
+        )[:limit]
+    )
+    users = User.objects.in_bulk([int(usage.key) for usage in top])
+    return [
+        {
+            "uploaded_by__username": getattr(
+                users.get(int(usage.key)), "username", None
+            ),
+            "file_count": usage.file_count,
+            "total_size": usage.total_size,
+        }
+        for usage in top
+    ]
+
+
+def rebuild_usage() -> int:
+    """Пересчитать все счётчики по данным, вернуть число строк"""
+    rows: list[StorageUsage] = []
+
+    def add(scope: str, key: Any, file_count: int, total_size: Optional[int]):
+        rows.append(
+            StorageUsage(
+                scope=scope,
+                key=str(key),
+                file_count=file_count,
+                total_size=total_size or 0,
+            )
+        )
+
+    files = FileAttachment.objects.order_by()
+    totals = files.aggregate(count=Count("id"), size=Sum("file_size"))
+    add(TOTAL, "", totals["count"], totals["size"])
+    for scope, field, queryset in (
+        (USER, "uploaded_by_id", files),
+        (PROJECT, "project_id", files.filter(project__isnull=False)),
+        (FILE_TYPE, "file_type", files),
+    ):
+        grouped = queryset.values(field).annotate(
+            count=Count("id"), size=Sum("file_size")
+        )
+        for item in grouped:
+            add(scope, item[field], item["count"], item["size"])
+
+    legacy = files.filter(blob__isnull=True).aggregate(
+        count=Count("id"), size=Sum("file_size")
+    )
+    add(LEGACY, "", legacy["count"], legacy["size"])
+    blobs = FileBlob.objects.aggregate(count=Count("id"), size=Sum("size"))
+    add(BLOBS, "", blobs["count"], blobs["size"])
+
+    with transaction.atomic():
+        StorageUsage.objects.all().delete()
+        StorageUsage.objects.bulk_create(rows)
+    return len(rows)
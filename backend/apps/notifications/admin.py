@@ -0,0 +1,37 @@
+from django.contrib import admin
+from django.utils import timezone
+
+from .models import OutboxMessage
+
+
+def retry_messages(modeladmin, request, queryset):
+    """Поставить выбранные сообщения на повторную отправку"""
+    updated = queryset.exclude(status=OutboxMessage.Status.SENT).update(
+        status=OutboxMessage.Status.PENDING,
+        attempts=0,
+        next_attempt_at=timezone.now(),
+    )
+    modeladmin.message_user(request, f"Поставлено в очередь: {updated}")
+
+
+retry_messages.short_description = "Отправить повторно"  # type: ignore
+
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    """Админка для исходящих уведомлений."""
+
+    list_display = [
+        "channel",
+        "recipient",
+        "subject",
+        "status",
+        "attempts",
+        "next_attempt_at",
+        "created_at",
+    ]
+    list_filter = ["channel", "status"]
+    search_fields = ["recipient", "subject", "body"]
+    readonly_fields = ["created_at", "sent_at", "last_error"]
+    raw_id_fields = ["task"]
+    actions = [retry_messages]
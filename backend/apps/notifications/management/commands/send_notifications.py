@@ -0,0 +1,60 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.notifications.outbox import process_outbox
+
+
+class Command(BaseCommand):
+    help = "Отправка уведомлений из outbox (email и Telegram)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=50,
+            help="Сколько сообщений забирать за один проход",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Работать постоянно (для запуска под supervisor/systemd)",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5.0,
+            help="Пауза между проходами в режиме --loop, сек",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+
+        if not options["loop"]:
+            sent, failed = self._drain(batch_size)
+            self.stdout.write(
+                self.style.SUCCESS(f"✅ Отправлено: {sent}, ошибок: {failed}")
+            )
+            return
+
+        self.stdout.write(
+            f"📤 Воркер уведомлений запущен (интервал {options['interval']} сек)"
+        )
+        try:
+            while True:
+                sent, failed = self._drain(batch_size)
+                if sent or failed:
+                    self.stdout.write(f"📨 Отправлено: {sent}, ошибок: {failed}")
+                time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING("⏹️ Воркер остановлен"))
+
+    def _drain(self, batch_size):
+        """Обрабатываем пачки, пока очередь не опустеет"""
+        total_sent = total_failed = 0
+        while True:
+            sent, failed = process_outbox(batch_size)
+            total_sent += sent
+            total_failed += failed
+            if sent + failed < batch_size:
+                return total_sent, total_failed
@@ -0,0 +1,58 @@
+from django.db import models
+from django.utils import timezone
+
+
+class OutboxMessage(models.Model):
+    """Исходящее уведомление (outbox), доставляемое фоновым воркером."""
+
+    class Channel(models.TextChoices):
+        EMAIL = "email", "Email"
+        TELEGRAM = "telegram", "Telegram"
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Ожидает отправки"
+        SENT = "sent", "Отправлено"
+        FAILED = "failed", "Ошибка доставки"
+
+    channel = models.CharField(
+        max_length=20, choices=Channel.choices, verbose_name="Канал"
+    )  # type: ignore
+    recipient = models.CharField(
+        max_length=255,
+        verbose_name="Получатель",
+        help_text="Email адрес или Telegram chat_id",
+    )  # type: ignore
+    subject = models.CharField(max_length=255, blank=True, verbose_name="Тема")  # type: ignore
+    body = models.TextField(verbose_name="Текст сообщения")  # type: ignore
+    task = models.ForeignKey(
+        "tasks.Task",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="outbox_messages",
+        verbose_name="Задача",
+    )  # type: ignore
+    status = models.CharField(
+        max_length=20,
+        choices=Status.choices,
+        default=Status.PENDING,
+        verbose_name="Статус",
+    )  # type: ignore
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name="Попыток")  # type: ignore
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now, verbose_name="Следующая попытка"
+    )  # type: ignore
+    last_error = models.TextField(blank=True, verbose_name="Последняя ошибка")  # type: ignore
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Дата создания")  # type: ignore
+    sent_at = models.DateTimeField(null=True, blank=True, verbose_name="Дата отправки")  # type: ignore
+
+    class Meta:
+        verbose_name = "Исходящее уведомление"
+        verbose_name_plural = "Исходящие уведомления"
+        ordering = ["next_attempt_at", "id"]
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.get_channel_display()} → {self.recipient} ({self.get_status_display()})"  # type: ignore
@@ -0,0 +1,185 @@
+"""
+Outbox исходящих уведомлений.
+
+Сигналы и представления только записывают строки OutboxMessage в текущей
+транзакции, а доставку (SMTP, Telegram) выполняет отдельный воркер -
+команда ``manage.py send_notifications``. Благодаря этому время ответа
+не зависит от внешних сервисов, а неудачные отправки повторяются
+с экспоненциальной задержкой.
+"""
+
+import logging
+from datetime import timedelta
+from typing import Iterable, Optional
+
+from django.conf import settings
+from django.core.mail import send_mail
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_BACKOFF_SECONDS = 30
+DEFAULT_MAX_BACKOFF_SECONDS = 60 * 60
+DEFAULT_LEASE_SECONDS = 5 * 60
+
+
+def _setting(name: str, default: int) -> int:
+    return int(getattr(settings, name, default))
+
+
+def enqueue_email(
+    recipient: str, subject: str, body: str, task=None
+) -> Optional[OutboxMessage]:
+    """Поставить email в очередь на отправку"""
+    if not recipient:
+        return None
+    return OutboxMessage.objects.create(
+        channel=OutboxMessage.Channel.EMAIL,
+        recipient=recipient,
+        subject=subject,
+        body=body,
+        task=task,
+    )
+
+
+def enqueue_telegram(chat_id, body: str, task=None) -> Optional[OutboxMessage]:
+    """Поставить сообщение Telegram в очередь на отправку"""
+    if not chat_id:
+        return None
+    return OutboxMessage.objects.create(
+        channel=OutboxMessage.Channel.TELEGRAM,
+        recipient=str(chat_id),
+        body=body,
+        task=task,
+    )
+
+
+def get_backoff(attempts: int) -> timedelta:
+    """Экспоненциальная задержка перед следующей попыткой"""
+    base = _setting("NOTIFICATION_OUTBOX_BACKOFF_SECONDS", DEFAULT_BACKOFF_SECONDS)
+    cap = _setting(
+        "NOTIFICATION_OUTBOX_MAX_BACKOFF_SECONDS", DEFAULT_MAX_BACKOFF_SECONDS
+    )
+    return timedelta(seconds=min(base * 2 ** max(attempts - 1, 0), cap))
+
+
+def claim_batch(batch_size: int = 50) -> list[OutboxMessage]:
+    """
+    Забрать пачку готовых к отправке сообщений.
+
+    Строки блокируются с SKIP LOCKED и получают "аренду" (сдвиг
+    next_attempt_at), поэтому несколько воркеров не отправят одно
+    сообщение дважды, а упавший воркер не потеряет его навсегда.
+    """
+    now = timezone.now()
+    lease = timedelta(
+        seconds=_setting("NOTIFICATION_OUTBOX_LEASE_SECONDS", DEFAULT_LEASE_SECONDS)
+    )
+
+    with transaction.atomic():
+        messages = list(
+            OutboxMessage.objects.select_for_update(skip_locked=True)
+            .filter(status=OutboxMessage.Status.PENDING, next_attempt_at__lte=now)
+            .order_by("next_attempt_at", "id")[:batch_size]
+        )
+        if messages:
+            OutboxMessage.objects.filter(pk__in=[m.pk for m in messages]).update(
+                next_attempt_at=now + lease
+            )
+    return messages
+
+
+def deliver(message: OutboxMessage) -> None:
+    """Доставить одно сообщение; при ошибке выбрасывает исключение"""
+    if message.channel == OutboxMessage.Channel.EMAIL:
+        from_email = getattr(settings, "DEFAULT_FROM_EMAIL", "noreply@tasktracker.ru")
+        send_mail(
+            subject=message.subject,
+            message=message.body,
+            from_email=from_email,
+            recipient_list=[message.recipient],
+            fail_silently=False,
+        )
+    elif message.channel == OutboxMessage.Channel.TELEGRAM:
+        from apps.tasks.telegram_utils import send_telegram_message
+
+        if not send_telegram_message(message.recipient, message.body):
+            raise RuntimeError("Telegram API не принял сообщение")
+    else:
+        raise ValueError(f"Неизвестный канал: {message.channel}")
+
+
+def record_result(message: OutboxMessage, error: Optional[str] = None) -> bool:
+    """Зафиксировать результат попытки доставки в БД"""
+    max_attempts = _setting("NOTIFICATION_OUTBOX_MAX_ATTEMPTS", DEFAULT_MAX_ATTEMPTS)
+    message.attempts += 1
+
+    if error is not None:
+        message.last_error = error
+        if message.attempts >= max_attempts:
+            message.status = OutboxMessage.Status.FAILED
+            logger.error(
+                f"❌ [OUTBOX] Сообщение {message.pk} не доставлено после {message.attempts} попыток: {error}"
+            )
+        else:
+            message.next_attempt_at = timezone.now() + get_backoff(message.attempts)
+            logger.warning(
+                f"⚠️ [OUTBOX] Ошибка доставки {message.pk} (попытка {message.attempts}): {error}"
+            )
+        message.save(
+            update_fields=["attempts", "status", "next_attempt_at", "last_error"]
+        )
+        return False
+
+    message.status = OutboxMessage.Status.SENT
+    message.sent_at = timezone.now()
+    message.last_error = ""
+    message.save(update_fields=["attempts", "status", "sent_at", "last_error"])
+    logger.info(
+        f"✅ [OUTBOX] Доставлено {message.get_channel_display()} → {message.recipient}"
+    )
+    return True
+
+
+def process_message(message: OutboxMessage) -> bool:
+    """Попытка доставки одного сообщения"""
+    try:
+        deliver(message)
+    except Exception as e:
+        return record_result(message, str(e))
+    return record_result(message)
+
+
+def process_messages(messages: Iterable[OutboxMessage]) -> tuple[int, int]:
+    """
+    Обработать сообщения, вернуть (отправлено, ошибок).
+
+    Telegram сообщения отправляются одной параллельной рассылкой через
+    общий клиент; результаты записываются в БД в текущем потоке.
+    """
+    from apps.tasks.telegram_utils import send_telegram_messages
+
+    messages = list(messages)
+    telegram = [m for m in messages if m.channel == OutboxMessage.Channel.TELEGRAM]
+    others = [m for m in messages if m.channel != OutboxMessage.Channel.TELEGRAM]
+    results = [process_message(m) for m in others]
+
+    if telegram:
+        delivered = send_telegram_messages([(m.recipient, m.body) for m in telegram])
+    else:
+        delivered = []
+    for message, ok in zip(telegram, delivered):
+        error = None if ok else "Telegram API не принял сообщение"
+        results.append(record_result(message, error))
+
+    sent = sum(results)
+    return sent, len(results) - sent
+
+
+def process_outbox(batch_size: int = 50) -> tuple[int, int]:
+    """Забрать и обработать одну пачку сообщений"""
+    return process_messages(claim_batch(batch_size))
@@ -1,8 +1,9 @@
-import requests
 import json
 from django.conf import settings
 from django.contrib.auth import get_user_model
 
+from .telegram_client import get_telegram_client
+
 User = get_user_model()
 
 
@@ -21,18 +22,13 @@ class TelegramService:
         if not self.bot_token or not chat_id:
             return False
 
-        url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
-
-        payload = {
-            "chat_id": chat_id,
-            "text": message,
-            "parse_mode": parse_mode,
-            "disable_notification": disable_notification,
-        }
-
         try:
-            response = requests.post(url, json=payload, timeout=10)
-            return response.status_code == 200
+            return get_telegram_client().send_message(
+                chat_id,
+                message,
+                parse_mode=parse_mode,
+                disable_notification=disable_notification,
+            )
         except Exception as e:
             print(f"Ошибка отправки в Telegram: {e}")
             return False
@@ -50,11 +46,11 @@ class TelegramService:
 
     def send_to_all(self, message, **kwargs):
         """Отправка сообщения всем зарегистрированным пользователям"""
-        success_count = 0
-        for username, chat_id in self.chat_ids.items():
-            if self.send_message(chat_id, message, **kwargs):
-                success_count += 1
-        return success_count
+        if not self.bot_token:
+            return 0
+        # Параллельная рассылка через общий клиент с лимитом потоков
+        messages = [(chat_id, message) for chat_id in self.chat_ids.values() if chat_id]
+        return sum(get_telegram_client().send_many(messages, **kwargs))
 
     def send_task_notification(self, task, action="created"):
         """Отправка уведомления о задаче"""
@@ -106,10 +102,8 @@ class TelegramService:
         if not self.bot_token:
             return False, "Токен бота не настроен"
 
-        url = f"https://api.telegram.org/bot{self.bot_token}/getMe"
-
         try:
-            response = requests.get(url, timeout=10)
+            response = get_telegram_client().call("getMe")
             if response.status_code == 200:
                 data = response.json()
                 return (
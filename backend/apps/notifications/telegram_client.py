@@ -0,0 +1,209 @@
+"""
+Общий клиент Telegram Bot API.
+
+Один процесс использует один requests.Session с пулом keep-alive
+соединений, поэтому сообщения не открывают новое HTTPS соединение каждый
+раз. Рассылка (send_many) выполняется параллельно с ограничением числа
+потоков и с учётом лимитов Telegram: глобального (~30 сообщений в секунду)
+и на чат (~1 сообщение в секунду), а также ответа 429 с retry_after.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterable, Optional
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_API_URL = "https://api.telegram.org"
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_GLOBAL_RATE = 30  # сообщений в секунду на бота
+DEFAULT_PER_CHAT_INTERVAL = 1.0  # секунд между сообщениями в один чат
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_TIMEOUT = 10
+
+
+class RateLimiter:
+    """Планировщик отправки с глобальным и per-chat интервалами"""
+
+    def __init__(self, global_rate: float, per_chat_interval: float):
+        self._lock = threading.Lock()
+        self._global_interval = 1.0 / global_rate if global_rate else 0.0
+        self._per_chat_interval = per_chat_interval
+        self._next_global = 0.0
+        self._next_chat: dict[str, float] = {}
+
+    def reserve(self, chat_id: str) -> float:
+        """Зарезервировать слот отправки, вернуть сколько нужно подождать"""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_global, self._next_chat.get(chat_id, 0.0))
+            self._next_global = start + self._global_interval
+            self._next_chat[chat_id] = start + self._per_chat_interval
+            if len(self._next_chat) > 10000:
+                self._next_chat = {
+                    key: value for key, value in self._next_chat.items() if value > now
+                }
+            return start - now
+
+    def penalize(self, chat_id: str, seconds: float) -> None:
+        """Отложить отправку в чат (ответ 429 retry_after)"""
+        with self._lock:
+            until = time.monotonic() + seconds
+            self._next_chat[chat_id] = max(self._next_chat.get(chat_id, 0.0), until)
+
+
+class TelegramClient:
+    """Клиент Bot API с пулом соединений и параллельной рассылкой"""
+
+    def __init__(
+        self,
+        token: str,
+        api_url: str = DEFAULT_API_URL,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        global_rate: float = DEFAULT_GLOBAL_RATE,
+        per_chat_interval: float = DEFAULT_PER_CHAT_INTERVAL,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        timeout: float = DEFAULT_TIMEOUT,
+    ):
+        self.token = token
+        self.api_url = api_url.rstrip("/")
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.rate_limiter = RateLimiter(global_rate, per_chat_interval)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    @classmethod
+    def from_settings(cls) -> "TelegramClient":
+        return cls(
+            token=getattr(settings, "TELEGRAM_BOT_TOKEN", "") or "",
+            api_url=getattr(settings, "TELEGRAM_API_URL", DEFAULT_API_URL),
+            max_workers=getattr(settings, "TELEGRAM_MAX_WORKERS", DEFAULT_MAX_WORKERS),
+            global_rate=getattr(settings, "TELEGRAM_GLOBAL_RATE", DEFAULT_GLOBAL_RATE),
+            per_chat_interval=getattr(
+                settings, "TELEGRAM_PER_CHAT_INTERVAL", DEFAULT_PER_CHAT_INTERVAL
+            ),
+            max_retries=getattr(settings, "TELEGRAM_MAX_RETRIES", DEFAULT_MAX_RETRIES),
+            timeout=getattr(settings, "TELEGRAM_TIMEOUT", DEFAULT_TIMEOUT),
+        )
+
+    def method_url(self, method: str) -> str:
+        return f"{self.api_url}/bot{self.token}/{method}"
+
+    def call(self, method: str, payload: Optional[dict] = None) -> requests.Response:
+        """Один запрос к Bot API через общий пул соединений"""
+        return self.session.post(
+            self.method_url(method), json=payload or {}, timeout=self.timeout
+        )
+
+    def send_message(
+        self,
+        chat_id,
+        text: str,
+        parse_mode: str = "HTML",
+        disable_notification: bool = False,
+    ) -> bool:
+        """Отправка сообщения с учётом лимитов и повтором при 429/5xx"""
+        if not self.token or not chat_id:
+            return False
+
+        chat_key = str(chat_id)
+        payload = {
+            "chat_id": chat_id,
+            "text": text,
+            "parse_mode": parse_mode,
+            "disable_notification": disable_notification,
+        }
+
+        for attempt in range(self.max_retries + 1):
+            delay = self.rate_limiter.reserve(chat_key)
+            if delay > 0:
+                time.sleep(delay)
+
+            try:
+                response = self.call("sendMessage", payload)
+            except requests.exceptions.RequestException as e:
+                logger.warning(f"⚠️ [TELEGRAM] Ошибка соединения (чат {chat_id}): {e}")
+                self._backoff(attempt)
+                continue
+
+            if response.status_code == 200:
+                return True
+
+            if response.status_code == 429:
+                retry_after = self._retry_after(response)
+                logger.warning(
+                    f"⚠️ [TELEGRAM] 429 для чата {chat_id}, повтор через {retry_after} сек"
+                )
+                self.rate_limiter.penalize(chat_key, retry_after)
+                continue
+
+            if response.status_code >= 500:
+                self._backoff(attempt)
+                continue
+
+            # 4xx (кроме 429) повторять бессмысленно
+            logger.error(
+                f"❌ [TELEGRAM] Ошибка API {response.status_code} для чата {chat_id}: "
+                f"{response.text[:200]}"
+            )
+            return False
+
+        logger.error(f"❌ [TELEGRAM] Не удалось отправить в чат {chat_id}")
+        return False
+
+    def send_many(
+        self, messages: Iterable[tuple[Any, str]], **kwargs: Any
+    ) -> list[bool]:
+        """Параллельная рассылка [(chat_id, text), ...], результаты в том же порядке"""
+        messages = list(messages)
+        if not messages:
+            return []
+
+        workers = max(1, min(self.max_workers, len(messages)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(
+                executor.map(
+                    lambda item: self.send_message(item[0], item[1], **kwargs),
+                    messages,
+                )
+            )
+
+    def _backoff(self, attempt: int) -> None:
+        """Пауза перед повтором; после последней попытки ждать нечего"""
+        if attempt < self.max_retries:
+            time.sleep(min(2**attempt, 10))
+
+    @staticmethod
+    def _retry_after(response: requests.Response) -> float:
+        try:
+            return float(response.json().get("parameters", {}).get("retry_after", 1))
+        except (ValueError, AttributeError):
+            return 1.0
+
+
+_client: Optional[TelegramClient] = None
+_client_lock = threading.Lock()
+
+
+def get_telegram_client() -> TelegramClient:
+    """Общий клиент процесса (пересоздаётся при смене токена или URL)"""
+    global _client
+
+    token = getattr(settings, "TELEGRAM_BOT_TOKEN", "") or ""
+    api_url = getattr(settings, "TELEGRAM_API_URL", DEFAULT_API_URL).rstrip("/")
+
+    with _client_lock:
+        if _client is None or _client.token != token or _client.api_url != api_url:
+            _client = TelegramClient.from_settings()
+        return _client
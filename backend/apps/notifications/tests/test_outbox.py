@@ -0,0 +1,111 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.db import DatabaseError
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.notifications.models import OutboxMessage
+from apps.notifications.outbox import enqueue_telegram, process_outbox
+from apps.projects.models import Project
+from apps.tasks.models import Task
+
+User = get_user_model()
+
+
+class OutboxTestCase(TestCase):
+    """Тесты для outbox уведомлений"""
+
+    def setUp(self):
+        self.manager = User.objects.create_user(
+            username="outbox_manager",
+            email="manager@example.com",
+            password="testpass123",
+            role="manager",
+        )
+        self.employee = User.objects.create_user(
+            username="outbox_employee",
+            email="employee@example.com",
+            password="testpass123",
+        )
+        self.project = Project.objects.create(
+            name="Outbox Project", creator=self.manager
+        )
+
+    def test_task_save_enqueues_instead_of_sending(self):
+        """Сохранение задачи только пишет в outbox"""
+        Task.objects.create(
+            title="Outbox Task",
+            project=self.project,
+            creator=self.manager,
+            assignee=self.employee,
+        )
+
+        self.assertEqual(len(mail.outbox), 0)
+        message = OutboxMessage.objects.get(channel=OutboxMessage.Channel.EMAIL)
+        self.assertEqual(message.recipient, "employee@example.com")
+        self.assertEqual(message.status, OutboxMessage.Status.PENDING)
+
+    def test_enqueue_db_error_propagates(self):
+        """Ошибка записи в outbox не глушится внутри транзакции сохранения"""
+        with mock.patch(
+            "apps.tasks.signals.enqueue_email", side_effect=DatabaseError("outbox")
+        ):
+            with self.assertRaises(DatabaseError):
+                Task.objects.create(
+                    title="Outbox Task",
+                    project=self.project,
+                    creator=self.manager,
+                    assignee=self.employee,
+                )
+
+    def test_process_outbox_delivers_email(self):
+        """Воркер отправляет письма из очереди"""
+        Task.objects.create(
+            title="Outbox Task",
+            project=self.project,
+            creator=self.manager,
+            assignee=self.employee,
+        )
+
+        sent, failed = process_outbox()
+
+        self.assertEqual((sent, failed), (1, 0))
+        self.assertEqual(len(mail.outbox), 1)
+        message = OutboxMessage.objects.get()
+        self.assertEqual(message.status, OutboxMessage.Status.SENT)
+        self.assertIsNotNone(message.sent_at)
+
+    @mock.patch(
+        "apps.tasks.telegram_utils.send_telegram_messages", return_value=[False]
+    )
+    def test_failed_delivery_is_retried_with_backoff(self, send_mock):
+        """Ошибка доставки откладывает повтор, а не теряет сообщение"""
+        message = enqueue_telegram("12345", "Тест")
+
+        sent, failed = process_outbox()
+
+        self.assertEqual((sent, failed), (0, 1))
+        message.refresh_from_db()
+        self.assertEqual(message.status, OutboxMessage.Status.PENDING)
+        self.assertEqual(message.attempts, 1)
+        self.assertGreater(message.next_attempt_at, timezone.now())
+
+        # Пока не прошла задержка, сообщение повторно не забирается
+        self.assertEqual(process_outbox(), (0, 0))
+        self.assertEqual(send_mock.call_count, 1)
+
+    @mock.patch(
+        "apps.tasks.telegram_utils.send_telegram_messages", return_value=[False]
+    )
+    def test_message_fails_after_max_attempts(self, send_mock):
+        """После исчерпания попыток сообщение помечается как ошибочное"""
+        message = enqueue_telegram("12345", "Тест")
+
+        with self.settings(NOTIFICATION_OUTBOX_MAX_ATTEMPTS=1):
+            process_outbox()
+
+        message.refresh_from_db()
+        self.assertEqual(message.status, OutboxMessage.Status.FAILED)
+        self.assertIn("Telegram", message.last_error)
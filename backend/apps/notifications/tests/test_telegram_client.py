@@ -0,0 +1,151 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from apps.notifications.telegram_client import TelegramClient
+
+
+class StubTelegramServer:
+    """Локальная заглушка Bot API для офлайн-тестов"""
+
+    def __init__(self, delay=0.0, rate_limited_chats=()):
+        self.delay = delay
+        self.rate_limited = set(rate_limited_chats)
+        self.requests = []
+        self.ports = set()
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                chat_id = str(payload.get("chat_id"))
+
+                with stub.lock:
+                    stub.requests.append((chat_id, time.monotonic()))
+                    stub.ports.add(self.client_address[1])
+                    stub.active += 1
+                    stub.max_active = max(stub.max_active, stub.active)
+                    limited = chat_id in stub.rate_limited
+                    stub.rate_limited.discard(chat_id)
+
+                time.sleep(stub.delay)
+
+                if limited:
+                    status = 429
+                    body = {"ok": False, "parameters": {"retry_after": 0.3}}
+                else:
+                    status = 200
+                    body = {"ok": True, "result": {}}
+
+                with stub.lock:
+                    stub.active -= 1
+
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class TelegramClientTestCase(SimpleTestCase):
+    """Тесты клиента Telegram на локальной заглушке"""
+
+    def make_client(self, stub, **kwargs):
+        kwargs.setdefault("per_chat_interval", 0)
+        kwargs.setdefault("global_rate", 0)
+        return TelegramClient(token="test-token", api_url=stub.url, **kwargs)
+
+    def test_connection_is_reused(self):
+        """Последовательные сообщения идут через одно keep-alive соединение"""
+        stub = StubTelegramServer()
+        self.addCleanup(stub.close)
+        client = self.make_client(stub)
+
+        for chat_id in range(1, 6):
+            self.assertTrue(client.send_message(chat_id, "hello"))
+
+        self.assertEqual(len(stub.requests), 5)
+        self.assertEqual(len(stub.ports), 1)
+
+    def test_retry_after_is_respected(self):
+        """Ответ 429 откладывает повтор на retry_after"""
+        stub = StubTelegramServer(rate_limited_chats=["42"])
+        self.addCleanup(stub.close)
+        client = self.make_client(stub)
+
+        self.assertTrue(client.send_message(42, "hello"))
+
+        self.assertEqual(len(stub.requests), 2)
+        first, second = stub.requests
+        self.assertGreaterEqual(second[1] - first[1], 0.3)
+
+    def test_send_many_is_concurrent_and_bounded(self):
+        """Рассылка параллельна, но не больше max_workers потоков"""
+        stub = StubTelegramServer(delay=0.2)
+        self.addCleanup(stub.close)
+        client = self.make_client(stub, max_workers=3)
+
+        started = time.monotonic()
+        results = client.send_many([(chat_id, "hi") for chat_id in range(1, 7)])
+        elapsed = time.monotonic() - started
+
+        self.assertEqual(results, [True] * 6)
+        self.assertLessEqual(stub.max_active, 3)
+        self.assertLess(elapsed, 6 * 0.2)
+
+    def test_per_chat_interval(self):
+        """Сообщения в один чат разнесены по времени"""
+        stub = StubTelegramServer()
+        self.addCleanup(stub.close)
+        client = self.make_client(stub, per_chat_interval=0.3)
+
+        results = client.send_many([(7, "one"), (7, "two")])
+
+        self.assertEqual(results, [True, True])
+        times = sorted(t for _, t in stub.requests)
+        self.assertGreaterEqual(times[1] - times[0], 0.25)
+
+    def test_missing_token(self):
+        """Без токена запросы не отправляются"""
+        client = TelegramClient(token="")
+        self.assertFalse(client.send_message(1, "hello"))
+
+    @override_settings(TELEGRAM_MAX_RETRIES=5, TELEGRAM_TIMEOUT=2.5)
+    def test_from_settings(self):
+        """Повторы и таймаут берутся из настроек"""
+        client = TelegramClient.from_settings()
+        self.assertEqual((client.max_retries, client.timeout), (5, 2.5))
+
+    def test_no_sleep_after_last_attempt(self):
+        """После последней неудачной попытки клиент не ждёт"""
+        stub = StubTelegramServer()
+        stub.close()  # порт закрыт: каждая попытка - ошибка соединения
+        client = self.make_client(stub, max_retries=2)
+
+        with mock.patch("apps.notifications.telegram_client.time.sleep") as sleep:
+            self.assertFalse(client.send_message(1, "hello"))
+
+        self.assertEqual([c.args[0] for c in sleep.call_args_list], [1, 2])
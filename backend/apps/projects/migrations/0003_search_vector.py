@@ -0,0 +1,65 @@
+# Generated by Django 6.0 on 2026-10-18 03:31
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+# Поиск работает только в PostgreSQL: search_vector пересчитывается
+# триггером при записи name/description (вес A и B), по нему GIN-индекс;
+# нечёткий поиск по name - триграммный GIN-индекс (pg_trgm).
+# В SQLite колонка остаётся пустой, поиск идёт через icontains.
+SEARCH_SQL = """
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE FUNCTION projects_project_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('russian', coalesce(NEW.name, '')), 'A') ||
+        setweight(to_tsvector('russian', coalesce(NEW.description, '')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER projects_project_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF name, description ON projects_project
+    FOR EACH ROW EXECUTE FUNCTION projects_project_search_vector_update();
+
+UPDATE projects_project SET name = name;
+
+CREATE INDEX project_search_vector_idx ON projects_project USING gin (search_vector);
+CREATE INDEX project_name_trgm_idx ON projects_project USING gin (name gin_trgm_ops);
+"""
+
+DROP_SEARCH_SQL = """
+DROP INDEX IF EXISTS project_name_trgm_idx;
+DROP INDEX IF EXISTS project_search_vector_idx;
+DROP TRIGGER IF EXISTS projects_project_search_vector_trigger ON projects_project;
+DROP FUNCTION IF EXISTS projects_project_search_vector_update();
+"""
+
+
+def install_search(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(SEARCH_SQL)
+
+
+def uninstall_search(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(DROP_SEARCH_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("projects", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="project",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.RunPython(install_search, uninstall_search),
+    ]
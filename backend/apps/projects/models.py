@@ -1,4 +1,5 @@
 # mypy: disable-error-code=attr-defined
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from typing import TYPE_CHECKING
 
@@ -8,6 +9,17 @@ if TYPE_CHECKING:
     from apps.tasks.models import Task
 
 
+class ProjectQuerySet(models.QuerySet):
+    def with_task_counts(self) -> "ProjectQuerySet":
+        """Количество задач и завершённых задач одним запросом (без COUNT на строку)"""
+        return self.annotate(
+            annotated_task_count=models.Count("tasks"),
+            annotated_completed_task_count=models.Count(
+                "tasks", filter=models.Q(tasks__status="done")
+            ),
+        )
+
+
 class Project(models.Model):
     """Модель проекта."""
 
@@ -37,10 +49,18 @@ class Project(models.Model):
     )  # type: ignore
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Дата создания")  # type: ignore
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Дата обновления")  # type: ignore
+    # Заполняется триггером в PostgreSQL (см. tasks.search), в SQLite пустое
+    search_vector = SearchVectorField(null=True, editable=False)  # type: ignore
+
+    objects = ProjectQuerySet.as_manager()
 
     @property
     def task_count(self) -> int:
         """Количество задач в проекте."""
+        # Значение из with_task_counts(), если queryset аннотирован
+        annotated = getattr(self, "annotated_task_count", None)
+        if annotated is not None:
+            return annotated
         # Для TYPE_CHECKING указываем тип
         if TYPE_CHECKING:
             tasks: models.QuerySet[Task] = self.tasks  # type: ignore
@@ -50,6 +70,9 @@ class Project(models.Model):
     @property
     def completed_task_count(self) -> int:
         """Количество завершённых задач."""
+        annotated = getattr(self, "annotated_completed_task_count", None)
+        if annotated is not None:
+            return annotated
         # Для TYPE_CHECKING указываем тип
         if TYPE_CHECKING:
             tasks: models.QuerySet[Task] = self.tasks  # type: ignore
@@ -0,0 +1,34 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from apps.projects.models import Project
+from apps.tasks.models import Task
+
+User = get_user_model()
+
+
+class ProjectTaskCountsTestCase(TestCase):
+    """Тесты для счётчиков задач проекта"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="counts_user", email="counts@example.com", password="pass12345"
+        )
+        self.project = Project.objects.create(name="Counts", creator=self.user)
+        for status in ["todo", "in_progress", "done"]:
+            Task.objects.create(
+                title="Task", project=self.project, creator=self.user, status=status
+            )
+
+    def test_properties_without_annotation(self):
+        """Без аннотации свойства считают задачи запросом"""
+        self.assertEqual(self.project.task_count, 3)
+        self.assertEqual(self.project.completed_task_count, 1)
+
+    def test_properties_use_annotation(self):
+        """Аннотированные значения используются без дополнительных запросов"""
+        project = Project.objects.with_task_counts().get(pk=self.project.pk)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(project.task_count, 3)
+            self.assertEqual(project.completed_task_count, 1)
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Task
+from .models import Task, TaskDailyStats, TaskEvent, TaskTombstone
 
 
 @admin.register(Task)
@@ -9,7 +9,7 @@ class TaskAdmin(admin.ModelAdmin):
     list_display = ["title", "project", "assignee", "status", "priority", "due_date"]
     list_filter = ["status", "priority", "project", "assignee"]
     search_fields = ["title", "description"]
-    readonly_fields = ["created_at", "updated_at", "creator"]
+    readonly_fields = ["created_at", "updated_at", "completed_at", "creator"]
     date_hierarchy = "due_date"
 
     fieldsets = (
@@ -21,7 +21,13 @@ class TaskAdmin(admin.ModelAdmin):
         ),
         ("Статус и приоритет", {"fields": ("status", "priority")}),
         ("Сроки", {"fields": ("due_date",)}),
-        ("Даты", {"fields": ("created_at", "updated_at"), "classes": ("collapse",)}),
+        (
+            "Даты",
+            {
+                "fields": ("created_at", "updated_at", "completed_at"),
+                "classes": ("collapse",),
+            },
+        ),
     )
 
     # Автоматически заполняем создателя при создании задачи
@@ -29,3 +35,55 @@ class TaskAdmin(admin.ModelAdmin):
         if not change:  # Только при создании новой задачи
             obj.creator = request.user
         super().save_model(request, obj, form, change)
+
+
+@admin.register(TaskTombstone)
+class TaskTombstoneAdmin(admin.ModelAdmin):
+    """Админка для отметок об удалённых задачах."""
+
+    list_display = ["task_id", "project_id", "assignee_id", "deleted_at"]
+    search_fields = ["task_id"]
+    date_hierarchy = "deleted_at"
+
+
+@admin.register(TaskDailyStats)
+class TaskDailyStatsAdmin(admin.ModelAdmin):
+    """Админка для дневных срезов задач (только просмотр)."""
+
+    list_display = [
+        "date",
+        "project",
+        "assignee",
+        "status",
+        "priority",
+        "task_count",
+        "created_count",
+        "completed_count",
+    ]
+    list_filter = ["status", "priority", "project"]
+    date_hierarchy = "date"
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(TaskEvent)
+class TaskEventAdmin(admin.ModelAdmin):
+    """Админка для журнала событий задач (только просмотр)."""
+
+    list_display = ["task_id", "kind", "old_value", "new_value", "actor", "created_at"]
+    list_filter = ["kind"]
+    search_fields = ["task_id"]
+    date_hierarchy = "created_at"
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
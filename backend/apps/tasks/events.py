@@ -0,0 +1,169 @@
+"""
+Журнал изменений задач.
+
+При каждом сохранении задачи обработчик post_save записывает в TaskEvent
+переходы отслеживаемых полей (статус, исполнитель, срок, приоритет) - все
+изменения одного сохранения одним INSERT. Кто изменил задачу, view
+сообщает атрибутом ``task.changed_by``.
+
+По журналу считаются lead time (создание -> выполнение) и cycle time
+(первый переход в работу -> выполнение) без сравнения снимков задач.
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any, Iterable, Optional
+
+from django.db.models import QuerySet
+
+from .models import Task, TaskEvent
+
+# Поле задачи -> вид события
+EVENT_FIELDS = {
+    "status": TaskEvent.Kind.STATUS,
+    "assignee": TaskEvent.Kind.ASSIGNEE,
+    "due_date": TaskEvent.Kind.DUE_DATE,
+    "priority": TaskEvent.Kind.PRIORITY,
+}
+
+
+def format_value(value: Any) -> str:
+    """Значение поля для записи в журнал"""
+    if value is None:
+        return ""
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+def build_events(
+    task: Task, created: bool, update_fields: Optional[Iterable[str]] = None
+) -> list[TaskEvent]:
+    """События для только что сохранённой задачи"""
+    actor = getattr(task, "changed_by", None)
+    common = {
+        "task_id": task.pk,
+        "project_id": task.project_id,
+        "actor_id": actor.pk if actor else None,
+    }
+
+    if created:
+        common["actor_id"] = common["actor_id"] or task.creator_id
+        return [
+            TaskEvent(
+                **common,
+                kind=TaskEvent.Kind.CREATED,
+                new_value=task.status,
+            )
+        ]
+
+    events = []
+    changed = task.changed_fields
+    for name, kind in EVENT_FIELDS.items():
+        if name not in changed:
+            continue
+        # Изменение, не попавшее в update_fields, в БД не записано
+        if update_fields is not None and name not in update_fields:
+            continue
+        attname = task._meta.get_field(name).attname
+        events.append(
+            TaskEvent(
+                **common,
+                kind=kind,
+                old_value=format_value(task.get_previous(name)),
+                new_value=format_value(getattr(task, attname)),
+            )
+        )
+    return events
+
+
+def record_task_events(
+    task: Task, created: bool, update_fields: Optional[Iterable[str]] = None
+) -> list[TaskEvent]:
+    events = build_events(task, created, update_fields)
+    if events:
+        TaskEvent.objects.bulk_create(events)
+    return events
+
+
+def deleted_event(
+    task_id: int, project_id: Optional[int], status: str, actor_id: Optional[int]
+) -> TaskEvent:
+    """Событие удаления задачи (последний статус - в old_value)"""
+    return TaskEvent(
+        task_id=task_id,
+        project_id=project_id,
+        actor_id=actor_id,
+        kind=TaskEvent.Kind.DELETED,
+        old_value=status,
+    )
+
+
+@dataclass
+class TaskTiming:
+    """Время прохождения задачи; cycle_time - None, если в работу не брали"""
+
+    task_id: int
+    completed_at: datetime
+    lead_time: timedelta
+    cycle_time: Optional[timedelta] = None
+
+
+def task_timings(events: Optional[QuerySet] = None) -> list[TaskTiming]:
+    """
+    Lead time и cycle time выполненных задач.
+
+    ``events`` - журнал, отфильтрованный по проекту или периоду (по
+    умолчанию весь). Фильтр выбирает задачи, а времена считаются по всем
+    их событиям: иначе фильтр по периоду отбросил бы событие создания.
+    Учитывается последнее выполнение задачи: если её переоткрыли и не
+    закрыли снова, она в результат не попадает.
+    """
+    if events is None:
+        events = TaskEvent.objects.all()
+    else:
+        events = TaskEvent.objects.filter(
+            task_id__in=events.order_by().values("task_id")
+        )
+    events = (
+        events.filter(kind__in=[TaskEvent.Kind.CREATED, TaskEvent.Kind.STATUS])
+        .order_by("task_id", "created_at", "id")
+        .values_list("task_id", "kind", "new_value", "created_at")
+    )
+
+    timings = []
+    current = None
+    created_at = started_at = completed_at = None
+    for task_id, kind, value, at in events.iterator():
+        if task_id != current:
+            if current is not None and created_at and completed_at:
+                timings.append(_timing(current, created_at, started_at, completed_at))
+            current = task_id
+            created_at = started_at = completed_at = None
+
+        if kind == TaskEvent.Kind.CREATED:
+            created_at = at
+        if value == Task.Status.DONE:
+            completed_at = at
+        else:
+            completed_at = None
+            if value == Task.Status.IN_PROGRESS and started_at is None:
+                started_at = at
+
+    if current is not None and created_at and completed_at:
+        timings.append(_timing(current, created_at, started_at, completed_at))
+    return timings
+
+
+def _timing(
+    task_id: int,
+    created_at: datetime,
+    started_at: Optional[datetime],
+    completed_at: datetime,
+) -> TaskTiming:
+    return TaskTiming(
+        task_id=task_id,
+        completed_at=completed_at,
+        lead_time=completed_at - created_at,
+        cycle_time=completed_at - started_at if started_at else None,
+    )
@@ -0,0 +1,179 @@
+"""
+Счётчики для фильтров списка задач (фасеты).
+
+Для текущей выборки (после фильтров и поиска) одним группирующим запросом
+считаются задачи по статусам, приоритетам, проектам и исполнителям. В
+PostgreSQL это GROUP BY GROUPING SETS: по строке на каждое значение
+каждого фасета. В остальных СУБД группировка идёт по всем четырём полям
+сразу, а суммы по фасетам складываются в Python.
+
+Результат кэшируется по сигнатуре запроса (SQL и параметры выборки, в них
+уже есть пользователь и фильтры) вместе с версиями попавших в него
+проектов. Сохранение или удаление задачи меняет версию только её проекта
+(и прежнего, если задачу перенесли), поэтому правка в одном проекте не
+сбрасывает счётчики остальных.
+
+Счётчики могут отставать не дольше TASK_FACETS_CACHE_TIMEOUT, если:
+- задачи меняются в обход сигналов (QuerySet.update(), bulk_create);
+- в выборку попадает проект, которого в ней не было (например, задачу
+  назначили пользователю, у которого по фильтру было пусто).
+"""
+
+import hashlib
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import Count, QuerySet
+
+from apps.projects.models import Project
+
+from .models import Task
+
+DEFAULT_CACHE_TIMEOUT = 300  # секунд
+VERSION_KEY = "task_facets:project:{}"
+
+# Поле модели -> колонка в запросе
+FACET_COLUMNS = {
+    "status": "status",
+    "priority": "priority",
+    "project": "project_id",
+    "assignee": "assignee_id",
+}
+
+
+@dataclass
+class TaskFacets:
+    total: int = 0
+    status: dict[str, int] = field(default_factory=dict)
+    priority: dict[str, int] = field(default_factory=dict)
+    project: dict[int, int] = field(default_factory=dict)
+    assignee: dict[Optional[int], int] = field(default_factory=dict)
+    # Проекты из выборки (id и название) для списка в фильтре
+    projects: list[Project] = field(default_factory=list)
+
+    @property
+    def done(self) -> int:
+        return self.status.get(Task.Status.DONE, 0)
+
+    @property
+    def active(self) -> int:
+        return self.total - self.done
+
+
+def compute_facets(queryset: QuerySet) -> TaskFacets:
+    """Посчитать фасеты для выборки задач"""
+    if connections[queryset.db].vendor == "postgresql":
+        facets = _grouping_sets(queryset)
+    else:
+        facets = _grouped(queryset)
+
+    if facets.project:
+        facets.projects = list(
+            Project.objects.filter(pk__in=facets.project)
+            .only("id", "name")
+            .order_by("name")
+        )
+    return facets
+
+
+def _grouping_sets(queryset: QuerySet) -> TaskFacets:
+    columns = list(FACET_COLUMNS.values())
+    inner = queryset.order_by().values(*columns)
+    sql, params = inner.query.sql_with_params()
+
+    names = ", ".join(columns)
+    sets = ", ".join(f"({column})" for column in columns)
+    # GROUPING() - битовая маска колонок, не участвующих в группировке:
+    # по ней отличаем "исполнитель не назначен" от строки другого фасета
+    query = (
+        f"SELECT {names}, GROUPING({names}), COUNT(*) "
+        f"FROM ({sql}) AS facet_tasks "
+        f"GROUP BY GROUPING SETS ({sets}, ())"
+    )
+
+    facets = TaskFacets()
+    all_bits = (1 << len(columns)) - 1
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(query, params)
+        for *values, mask, count in cursor.fetchall():
+            if mask == all_bits:
+                facets.total = count
+                continue
+            for position, name in enumerate(FACET_COLUMNS):
+                bit = 1 << (len(columns) - 1 - position)
+                if not mask & bit:
+                    getattr(facets, name)[values[position]] = count
+    return facets
+
+
+def _grouped(queryset: QuerySet) -> TaskFacets:
+    rows = (
+        queryset.order_by().values(*FACET_COLUMNS.values()).annotate(count=Count("id"))
+    )
+
+    counters: dict[str, Counter] = {name: Counter() for name in FACET_COLUMNS}
+    total = 0
+    for row in rows:
+        total += row["count"]
+        for name, column in FACET_COLUMNS.items():
+            counters[name][row[column]] += row["count"]
+
+    return TaskFacets(
+        total=total, **{name: dict(counter) for name, counter in counters.items()}
+    )
+
+
+def project_version_key(project_id: int) -> str:
+    return VERSION_KEY.format(project_id)
+
+
+def invalidate_facets(*project_ids: Optional[int]) -> None:
+    """Сбросить кэш фасетов, в которые входят задачи этих проектов"""
+    versions = {
+        project_version_key(pk): uuid.uuid4().hex
+        for pk in set(project_ids)
+        if pk is not None
+    }
+    if versions:
+        cache.set_many(versions, None)
+
+
+def get_project_versions(project_ids) -> dict[str, str]:
+    keys = [project_version_key(pk) for pk in project_ids]
+    versions = cache.get_many(keys)
+    missing = [key for key in keys if key not in versions]
+    if missing:
+        # add, а не set: не затираем версию, записанную параллельно
+        for key in missing:
+            cache.add(key, uuid.uuid4().hex, None)
+        versions.update(cache.get_many(missing))
+    return versions
+
+
+def get_facets_cache_timeout() -> int:
+    return int(getattr(settings, "TASK_FACETS_CACHE_TIMEOUT", DEFAULT_CACHE_TIMEOUT))
+
+
+def get_cached_facets(queryset: QuerySet) -> TaskFacets:
+    """Фасеты с кэшированием по сигнатуре выборки"""
+    sql, params = queryset.order_by().query.sql_with_params()
+    signature = hashlib.md5(
+        f"{sql}|{params!r}".encode(), usedforsecurity=False
+    ).hexdigest()
+    cache_key = f"task_facets:{signature}"
+
+    cached = cache.get(cache_key)
+    if cached is not None:
+        versions, facets = cached
+        if not versions or cache.get_many(list(versions)) == versions:
+            return facets
+
+    facets = compute_facets(queryset)
+    versions = get_project_versions(facets.project)
+    cache.set(cache_key, (versions, facets), get_facets_cache_timeout())
+    return facets
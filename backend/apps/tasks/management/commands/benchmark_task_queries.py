@@ -0,0 +1,137 @@
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.projects.models import Project
+from apps.tasks.models import Task
+from apps.tasks.stats import overdue_q
+
+
+class Rollback(Exception):
+    """Откат транзакции после замеров"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Планы запросов к задачам с индексами и без них на сгенерированных данных. "
+        "Все данные и изменения схемы откатываются в конце."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tasks",
+            type=int,
+            default=1_000_000,
+            help="Сколько задач сгенерировать",
+        )
+        parser.add_argument("--users", type=int, default=200)
+        parser.add_argument("--projects", type=int, default=500)
+        parser.add_argument("--batch-size", type=int, default=10_000)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        random.seed(options["seed"])
+        try:
+            with transaction.atomic():
+                self._seed(options)
+                self._report("С индексами")
+
+                self._drop_indexes()
+                self._analyze()
+                self._report("Без индексов")
+                raise Rollback
+        except Rollback:
+            pass
+
+        self.stdout.write(self.style.SUCCESS("✅ Замеры завершены, данные откатены"))
+
+    def _seed(self, options):
+        User = get_user_model()
+        started = time.monotonic()
+
+        users = User.objects.bulk_create(
+            User(username=f"bench_user_{i}", email=f"bench_{i}@example.com")
+            for i in range(options["users"])
+        )
+        projects = Project.objects.bulk_create(
+            Project(name=f"Bench {i}", creator=random.choice(users))
+            for i in range(options["projects"])
+        )
+
+        statuses = [choice for choice, _ in Task.Status.choices]
+        priorities = [choice for choice, _ in Task.Priority.choices]
+        today = timezone.now().date()
+
+        total = options["tasks"]
+        batch_size = options["batch_size"]
+        for offset in range(0, total, batch_size):
+            batch = []
+            for i in range(min(batch_size, total - offset)):
+                priority = random.choice(priorities)
+                batch.append(
+                    Task(
+                        title=f"Bench task {offset + i}",
+                        project=random.choice(projects),
+                        creator=random.choice(users),
+                        assignee=(
+                            random.choice(users) if random.random() < 0.9 else None
+                        ),
+                        status=random.choice(statuses),
+                        # bulk_create не вызывает save(), ранг задаём сами
+                        priority=priority,
+                        priority_rank=Task.PRIORITY_RANKS[priority],
+                        due_date=(
+                            today + timedelta(days=random.randint(-60, 60))
+                            if random.random() < 0.7
+                            else None
+                        ),
+                    )
+                )
+            Task.objects.bulk_create(batch)
+
+        self._analyze()
+        self.stdout.write(
+            f"📦 Сгенерировано задач: {total} за {time.monotonic() - started:.1f} сек"
+        )
+        self.user = users[0]
+        self.project = projects[0]
+
+    def _drop_indexes(self):
+        """Удаляем индексы из Task.Meta (DROP INDEX откатится вместе с транзакцией)"""
+        with connection.cursor() as cursor:
+            for index in Task._meta.indexes:
+                cursor.execute(f"DROP INDEX {connection.ops.quote_name(index.name)}")
+
+    def _analyze(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {Task._meta.db_table}")
+
+    def _queries(self):
+        today = timezone.now().date()
+        return {
+            "Мои задачи по статусу": Task.objects.filter(
+                assignee=self.user, status=Task.Status.TODO
+            ).order_by("-created_at")[:20],
+            "Задачи проекта по статусу": Task.objects.filter(
+                project=self.project, status=Task.Status.IN_PROGRESS
+            ),
+            "Самые срочные": Task.objects.all()[:20],
+            "Просроченные задачи": Task.objects.filter(overdue_q(today)),
+            "Последние созданные": Task.objects.order_by("-created_at")[:50],
+            "Последние изменённые": Task.objects.order_by("-updated_at")[:50],
+        }
+
+    def _report(self, title):
+        self.stdout.write(self.style.MIGRATE_HEADING(f"\n=== {title} ==="))
+        for name, queryset in self._queries().items():
+            started = time.monotonic()
+            len(queryset)
+            elapsed = (time.monotonic() - started) * 1000
+
+            self.stdout.write(f"\n📌 {name}: {elapsed:.1f} мс")
+            self.stdout.write(queryset.explain())
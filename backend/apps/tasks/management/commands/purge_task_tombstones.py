@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.tasks.sync import purge_tombstones
+
+
+class Command(BaseCommand):
+    help = "Удаление устаревших отметок об удалённых задачах (TaskTombstone)"
+
+    def handle(self, *args, **options):
+        deleted = purge_tombstones()
+        self.stdout.write(self.style.SUCCESS(f"✅ Удалено отметок: {deleted}"))
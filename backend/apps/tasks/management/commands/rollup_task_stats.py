@@ -0,0 +1,42 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.tasks.rollups import backfill, rollup_pending
+
+
+class Command(BaseCommand):
+    help = "Дневные срезы задач для отчётов (запускать раз в сутки)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--backfill",
+            action="store_true",
+            help="Пересчитать все прошедшие дни, а не только недостающие",
+        )
+        parser.add_argument(
+            "--since",
+            help="С какого дня пересчитывать при --backfill (ГГГГ-ММ-ДД)",
+        )
+
+    def handle(self, *args, **options):
+        if options["backfill"]:
+            since = None
+            if options["since"]:
+                try:
+                    since = date.fromisoformat(options["since"])
+                except ValueError:
+                    raise CommandError("Дата --since в формате ГГГГ-ММ-ДД")
+            days = backfill(since)
+        else:
+            days = rollup_pending()
+
+        if not days:
+            self.stdout.write("ℹ️ Все срезы уже посчитаны")
+            return
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ Посчитано дней: {len(days)} "
+                f"({days[0]:%d.%m.%Y} - {days[-1]:%d.%m.%Y})"
+            )
+        )
@@ -1,42 +1,53 @@
+from datetime import timedelta
+
+from django.conf import settings
 from django.core.management.base import BaseCommand
 from django.utils import timezone
-from datetime import timedelta
-from apps.tasks.models import Task
+
+from apps.tasks.rollups import period_report, rollup_pending
 from apps.tasks.signals import send_telegram_message
-from django.conf import settings
+
+PERIODS = {
+    "week": (7, "ЕЖЕНЕДЕЛЬНЫЙ ОТЧЕТ", "За неделю"),
+    "month": (30, "ЕЖЕМЕСЯЧНЫЙ ОТЧЕТ", "За месяц"),
+}
 
 
 class Command(BaseCommand):
-    help = "Еженедельный отчет по задачам"
+    help = "Еженедельный (или ежемесячный) отчет по задачам"
 
-    def handle(self, *args, **options):
-        week_ago = timezone.now() - timedelta(days=7)
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--period",
+            choices=sorted(PERIODS),
+            default="week",
+            help="Период отчета",
+        )
 
-        # Статистика
-        created_this_week = Task.objects.filter(created_at__gte=week_ago).count()
-        completed_this_week = Task.objects.filter(
-            status="completed",  # Изменил 'done' на 'completed'
-            updated_at__gte=week_ago,
-        ).count()
+    def handle(self, *args, **options):
+        days, title, period_name = PERIODS[options["period"]]
 
-        total_tasks = Task.objects.count()
-        active_tasks = Task.objects.exclude(status="completed").count()
+        # Отчет читает дневные срезы; недостающие (если ночной запуск
+        # rollup_task_stats пропущен) досчитываются здесь
+        rollup_pending()
+        end = timezone.localdate() - timedelta(days=1)
+        report = period_report(end - timedelta(days=days - 1), end)
 
         telegram_chat_ids = getattr(settings, "TELEGRAM_CHAT_IDS", {})
 
         if "admin" in telegram_chat_ids:
-            report = f"""📊 <b>ЕЖЕНЕДЕЛЬНЫЙ ОТЧЕТ</b>
+            message = f"""📊 <b>{title}</b>
 
-📈 За неделю:
-   🆕 Создано задач: {created_this_week}
-   ✅ Выполнено задач: {completed_this_week}
+📈 {period_name} ({report.start:%d.%m} - {report.end:%d.%m}):
+   🆕 Создано задач: {report.created}
+   ✅ Выполнено задач: {report.completed}
 
 📋 Общая статистика:
-   📌 Всего задач: {total_tasks}
-   ⚡ Активных задач: {active_tasks}
-   ✅ Выполнено: {total_tasks - active_tasks}
+   📌 Всего задач: {report.total}
+   ⚡ Активных задач: {report.active}
+   ✅ Выполнено: {report.done}
 
 📅 Отчет сформирован: {timezone.now().strftime('%d.%m.%Y %H:%M')}"""
 
-            send_telegram_message(telegram_chat_ids["admin"], report)
+            send_telegram_message(telegram_chat_ids["admin"], message)
             self.stdout.write(self.style.SUCCESS("✅ Еженедельный отчет отправлен"))
@@ -0,0 +1,53 @@
+# Generated by Django 6.0 on 2026-10-18 03:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+PRIORITY_RANKS = {"low": 1, "medium": 2, "high": 3, "critical": 4}
+
+
+def fill_priority_rank(apps, schema_editor):
+    Task = apps.get_model("tasks", "Task")
+    Task.objects.update(
+        priority_rank=models.Case(
+            *[
+                models.When(priority=priority, then=models.Value(rank))
+                for priority, rank in PRIORITY_RANKS.items()
+            ],
+            default=models.Value(0),
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("projects", "0002_initial"),
+        ("tasks", "0003_task_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="task",
+            options={
+                "ordering": ["-priority_rank", "-created_at"],
+                "verbose_name": "Задача",
+                "verbose_name_plural": "Задачи",
+            },
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="priority_rank",
+            field=models.PositiveSmallIntegerField(
+                default=2, editable=False, verbose_name="Ранг приоритета"
+            ),
+        ),
+        migrations.RunPython(fill_priority_rank, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["-priority_rank", "-created_at"], name="task_priority_rank_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 6.0 on 2026-10-18 03:06
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0004_task_priority_rank"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskTombstone",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("task_id", models.BigIntegerField(verbose_name="ID задачи")),
+                (
+                    "project_id",
+                    models.BigIntegerField(null=True, verbose_name="ID проекта"),
+                ),
+                (
+                    "assignee_id",
+                    models.BigIntegerField(null=True, verbose_name="ID исполнителя"),
+                ),
+                (
+                    "deleted_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now, verbose_name="Дата удаления"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Удалённая задача",
+                "verbose_name_plural": "Удалённые задачи",
+                "ordering": ["deleted_at", "id"],
+                "indexes": [
+                    models.Index(
+                        fields=["deleted_at"], name="tasks_taskt_deleted_f1de3a_idx"
+                    )
+                ],
+            },
+        ),
+    ]
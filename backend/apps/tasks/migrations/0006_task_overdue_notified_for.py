@@ -0,0 +1,23 @@
+# Generated by Django 6.0 on 2026-10-18 03:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0005_tasktombstone"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="overdue_notified_for",
+            field=models.DateField(
+                blank=True,
+                editable=False,
+                null=True,
+                verbose_name="Уведомлено о просрочке срока",
+            ),
+        ),
+    ]
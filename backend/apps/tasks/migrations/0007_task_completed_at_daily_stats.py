@@ -0,0 +1,118 @@
+# Generated by Django 6.0 on 2026-10-18 03:25
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def fill_completed_at(apps, schema_editor):
+    # Для уже выполненных задач точного момента нет, берём последнюю правку
+    Task = apps.get_model("tasks", "Task")
+    Task.objects.filter(status="done", completed_at__isnull=True).update(
+        completed_at=F("updated_at")
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("projects", "0002_initial"),
+        ("tasks", "0006_task_overdue_notified_for"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="completed_at",
+            field=models.DateTimeField(
+                blank=True, editable=False, null=True, verbose_name="Дата выполнения"
+            ),
+        ),
+        migrations.CreateModel(
+            name="TaskDailyStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField(verbose_name="Дата")),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("todo", "К выполнению"),
+                            ("in_progress", "В работе"),
+                            ("review", "На проверке"),
+                            ("done", "Выполнена"),
+                            ("blocked", "Заблокирована"),
+                        ],
+                        max_length=20,
+                        verbose_name="Статус",
+                    ),
+                ),
+                (
+                    "priority",
+                    models.CharField(
+                        choices=[
+                            ("low", "Низкий"),
+                            ("medium", "Средний"),
+                            ("high", "Высокий"),
+                            ("critical", "Критический"),
+                        ],
+                        max_length=20,
+                        verbose_name="Приоритет",
+                    ),
+                ),
+                (
+                    "task_count",
+                    models.PositiveIntegerField(default=0, verbose_name="Задач"),
+                ),
+                (
+                    "created_count",
+                    models.PositiveIntegerField(default=0, verbose_name="Создано"),
+                ),
+                (
+                    "completed_count",
+                    models.PositiveIntegerField(default=0, verbose_name="Выполнено"),
+                ),
+                (
+                    "assignee",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Исполнитель",
+                    ),
+                ),
+                (
+                    "project",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_stats",
+                        to="projects.project",
+                        verbose_name="Проект",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Дневная статистика задач",
+                "verbose_name_plural": "Дневная статистика задач",
+                "ordering": ["date"],
+                "indexes": [
+                    models.Index(
+                        fields=["date", "project"], name="task_daily_stats_date_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(fill_completed_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,118 @@
+# Generated by Django 6.0 on 2026-10-18 03:28
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_events(apps, schema_editor):
+    # Для существующих задач известны только создание и выполнение
+    Task = apps.get_model("tasks", "Task")
+    TaskEvent = apps.get_model("tasks", "TaskEvent")
+    tasks = Task.objects.values_list(
+        "pk", "project_id", "creator_id", "created_at", "completed_at"
+    )
+    events = []
+    for pk, project_id, creator_id, created_at, completed_at in tasks.iterator():
+        common = {"task_id": pk, "project_id": project_id}
+        events.append(
+            TaskEvent(
+                **common, actor_id=creator_id, kind="created", created_at=created_at
+            )
+        )
+        if completed_at:
+            events.append(
+                TaskEvent(
+                    **common, kind="status", new_value="done", created_at=completed_at
+                )
+            )
+        if len(events) >= 1000:
+            TaskEvent.objects.bulk_create(events)
+            events = []
+    TaskEvent.objects.bulk_create(events)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0007_task_completed_at_daily_stats"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskEvent",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("task_id", models.BigIntegerField(verbose_name="ID задачи")),
+                (
+                    "project_id",
+                    models.BigIntegerField(null=True, verbose_name="ID проекта"),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("created", "Создана"),
+                            ("status", "Статус"),
+                            ("assignee", "Исполнитель"),
+                            ("due_date", "Срок"),
+                            ("priority", "Приоритет"),
+                            ("deleted", "Удалена"),
+                        ],
+                        max_length=20,
+                        verbose_name="Событие",
+                    ),
+                ),
+                (
+                    "old_value",
+                    models.CharField(blank=True, max_length=50, verbose_name="Было"),
+                ),
+                (
+                    "new_value",
+                    models.CharField(blank=True, max_length=50, verbose_name="Стало"),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now, verbose_name="Дата"
+                    ),
+                ),
+                (
+                    "actor",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Автор изменения",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Событие задачи",
+                "verbose_name_plural": "События задач",
+                "ordering": ["created_at", "id"],
+                "indexes": [
+                    models.Index(
+                        fields=["task_id", "created_at"], name="task_event_task_idx"
+                    ),
+                    models.Index(
+                        fields=["project_id", "created_at"],
+                        name="task_event_project_idx",
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_events, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 6.0 on 2026-10-18 03:31
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+# Поиск работает только в PostgreSQL: search_vector пересчитывается
+# триггером при записи title/description (вес A и B), по нему GIN-индекс;
+# нечёткий поиск по title - триграммный GIN-индекс (pg_trgm).
+# В SQLite колонка остаётся пустой, поиск идёт через icontains.
+SEARCH_SQL = """
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE FUNCTION tasks_task_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('russian', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('russian', coalesce(NEW.description, '')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER tasks_task_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, description ON tasks_task
+    FOR EACH ROW EXECUTE FUNCTION tasks_task_search_vector_update();
+
+UPDATE tasks_task SET title = title;
+
+CREATE INDEX task_search_vector_idx ON tasks_task USING gin (search_vector);
+CREATE INDEX task_title_trgm_idx ON tasks_task USING gin (title gin_trgm_ops);
+"""
+
+DROP_SEARCH_SQL = """
+DROP INDEX IF EXISTS task_title_trgm_idx;
+DROP INDEX IF EXISTS task_search_vector_idx;
+DROP TRIGGER IF EXISTS tasks_task_search_vector_trigger ON tasks_task;
+DROP FUNCTION IF EXISTS tasks_task_search_vector_update();
+"""
+
+
+def install_search(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(SEARCH_SQL)
+
+
+def uninstall_search(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(DROP_SEARCH_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0008_taskevent"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.RunPython(install_search, uninstall_search),
+    ]
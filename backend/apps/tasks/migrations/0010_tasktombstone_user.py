@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-18 03:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0009_search_vector"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="tasktombstone",
+            name="user_id",
+            field=models.BigIntegerField(null=True, verbose_name="ID пользователя"),
+        ),
+    ]
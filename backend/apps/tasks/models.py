@@ -1,7 +1,69 @@
+from typing import Any
+
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.utils import timezone
+
+
+class FieldTrackerMixin:
+    """
+    Отслеживание изменений полей модели без дополнительных запросов.
+
+    Значения полей из ``tracked_fields`` запоминаются при создании
+    экземпляра (в том числе при загрузке из БД через ``from_db``) и после
+    каждого сохранения. Обработчики pre_save/post_save могут узнать, что
+    изменилось, через ``changed_fields`` и ``get_previous()``.
+    """
+
+    tracked_fields: tuple[str, ...] = ()
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._snapshot_tracked_fields()
+
+    def _tracked_attnames(self) -> dict[str, str]:
+        opts = self._meta  # type: ignore[attr-defined]
+        return {name: opts.get_field(name).attname for name in self.tracked_fields}
+
+    def _snapshot_tracked_fields(self, fields=None) -> None:
+        """Запоминаем текущие (загруженные) значения отслеживаемых полей"""
+        snapshot = getattr(self, "_tracked_snapshot", {})
+        for name, attname in self._tracked_attnames().items():
+            if fields is not None and name not in fields and attname not in fields:
+                continue
+            # Отложенные (deferred) поля не трогаем, чтобы не вызвать запрос
+            if attname in self.__dict__:
+                snapshot[name] = self.__dict__[attname]
+        self._tracked_snapshot = snapshot
+
+    @property
+    def changed_fields(self) -> list[str]:
+        """Список отслеживаемых полей, изменённых с момента загрузки"""
+        changed = []
+        for name, attname in self._tracked_attnames().items():
+            if name in self._tracked_snapshot and attname in self.__dict__:
+                if self._tracked_snapshot[name] != self.__dict__[attname]:
+                    changed.append(name)
+        return changed
+
+    def has_changed(self, field: str) -> bool:
+        return field in self.changed_fields
+
+    def get_previous(self, field: str, default: Any = None) -> Any:
+        """Значение поля на момент загрузки/последнего сохранения"""
+        return self._tracked_snapshot.get(field, default)
+
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        super().save(*args, **kwargs)  # type: ignore[misc]
+        # Сигналы post_save уже отработали со старым снимком
+        self._snapshot_tracked_fields(kwargs.get("update_fields"))
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs: Any) -> None:
+        super().refresh_from_db(using=using, fields=fields, **kwargs)  # type: ignore[misc]
+        self._snapshot_tracked_fields(fields)
 
 
-class Task(models.Model):
+class Task(FieldTrackerMixin, models.Model):
     """Модель задачи."""
 
     class Status(models.TextChoices):
@@ -17,6 +79,14 @@ class Task(models.Model):
         HIGH = "high", "Высокий"
         CRITICAL = "critical", "Критический"
 
+    # Числовой ранг приоритета для сортировки (строки сортируются по алфавиту)
+    PRIORITY_RANKS = {
+        Priority.LOW: 1,
+        Priority.MEDIUM: 2,
+        Priority.HIGH: 3,
+        Priority.CRITICAL: 4,
+    }
+
     title = models.CharField(max_length=200, verbose_name="Заголовок")  # type: ignore
     description = models.TextField(blank=True, verbose_name="Описание")  # type: ignore
     project = models.ForeignKey(
@@ -53,9 +123,60 @@ class Task(models.Model):
         default=Priority.MEDIUM,
         verbose_name="Приоритет",
     )  # type: ignore
+    priority_rank = models.PositiveSmallIntegerField(
+        default=2,
+        editable=False,
+        verbose_name="Ранг приоритета",
+    )  # type: ignore
     due_date = models.DateField(null=True, blank=True, verbose_name="Срок выполнения")  # type: ignore
+    # Срок, о просрочке которого уже отправлены уведомления (см. tasks.overdue)
+    overdue_notified_for = models.DateField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name="Уведомлено о просрочке срока",
+    )  # type: ignore
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Дата создания")  # type: ignore
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Дата обновления")  # type: ignore
+    # Момент перевода в "Выполнено": updated_at для отчётов не годится,
+    # его сдвигает любая правка
+    completed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name="Дата выполнения",
+    )  # type: ignore
+    # Заполняется триггером в PostgreSQL (см. tasks.search), в SQLite пустое
+    search_vector = SearchVectorField(null=True, editable=False)  # type: ignore
+
+    tracked_fields = (
+        "status",
+        "assignee",
+        "due_date",
+        "priority",
+        "title",
+        "description",
+        "project",
+    )
+
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        # priority_rank всегда вычисляется из priority
+        self.priority_rank = self.PRIORITY_RANKS.get(self.priority, 0)
+        if self.status != self.Status.DONE:
+            self.completed_at = None
+        elif self.completed_at is None or self.has_changed("status"):
+            self.completed_at = timezone.now()
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            extra = set()
+            if "priority" in update_fields:
+                extra.add("priority_rank")
+            if "status" in update_fields:
+                extra.add("completed_at")
+            if extra:
+                kwargs["update_fields"] = {*update_fields, *extra}
+        super().save(*args, **kwargs)
 
     @property
     def is_overdue(self) -> bool:
@@ -69,7 +190,155 @@ class Task(models.Model):
     class Meta:
         verbose_name = "Задача"
         verbose_name_plural = "Задачи"
-        ordering = ["-priority", "-created_at"]
+        ordering = ["-priority_rank", "-created_at"]
+        indexes = [
+            # Сортировка по умолчанию и выборка "самых срочных"
+            models.Index(
+                fields=["-priority_rank", "-created_at"],
+                name="task_priority_rank_idx",
+            ),
+            # "Мои задачи" с фильтром по статусу, новые сверху
+            models.Index(
+                fields=["assignee", "status", "-created_at"],
+                name="task_assignee_status_idx",
+            ),
+            models.Index(fields=["project", "status"], name="task_project_status_idx"),
+            # Проверка просроченных: только открытые задачи со сроком
+            models.Index(
+                fields=["due_date"],
+                name="task_open_due_date_idx",
+                condition=models.Q(
+                    status__in=["todo", "in_progress", "review"],
+                    due_date__isnull=False,
+                ),
+            ),
+            models.Index(fields=["-created_at"], name="task_created_at_idx"),
+            models.Index(fields=["-updated_at"], name="task_updated_at_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.title} ({self.get_status_display()})"  # type: ignore
+
+
+class TaskTombstone(models.Model):
+    """
+    Отметка об удалённой задаче для инкрементальной синхронизации.
+
+    Пишется и когда задача пропадает из видимости: при смене исполнителя
+    или проекта (project_id и assignee_id - прежние) и при исключении
+    участника из проекта (user_id - исключённый). Связи хранятся как
+    простые id: задача и проект могут быть уже удалены.
+    """
+
+    task_id = models.BigIntegerField(verbose_name="ID задачи")  # type: ignore
+    project_id = models.BigIntegerField(null=True, verbose_name="ID проекта")  # type: ignore
+    assignee_id = models.BigIntegerField(null=True, verbose_name="ID исполнителя")  # type: ignore
+    user_id = models.BigIntegerField(null=True, verbose_name="ID пользователя")  # type: ignore
+    deleted_at = models.DateTimeField(default=timezone.now, verbose_name="Дата удаления")  # type: ignore
+
+    class Meta:
+        verbose_name = "Удалённая задача"
+        verbose_name_plural = "Удалённые задачи"
+        ordering = ["deleted_at", "id"]
+        indexes = [models.Index(fields=["deleted_at"])]
+
+    def __str__(self) -> str:
+        return f"Задача #{self.task_id} удалена {self.deleted_at:%d.%m.%Y %H:%M}"
+
+
+class TaskDailyStats(models.Model):
+    """
+    Дневной срез задач для отчётов (см. tasks.rollups).
+
+    Строка - группа задач одного проекта, исполнителя, статуса и приоритета
+    на конец дня ``date``: сколько их было, сколько из них создано и
+    выполнено в этот день.
+    """
+
+    date = models.DateField(verbose_name="Дата")  # type: ignore
+    project = models.ForeignKey(
+        "projects.Project",
+        on_delete=models.CASCADE,
+        related_name="daily_stats",
+        verbose_name="Проект",
+    )  # type: ignore
+    assignee = models.ForeignKey(
+        "users.User",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+        verbose_name="Исполнитель",
+    )  # type: ignore
+    status = models.CharField(
+        max_length=20, choices=Task.Status.choices, verbose_name="Статус"
+    )  # type: ignore
+    priority = models.CharField(
+        max_length=20, choices=Task.Priority.choices, verbose_name="Приоритет"
+    )  # type: ignore
+    task_count = models.PositiveIntegerField(default=0, verbose_name="Задач")  # type: ignore
+    created_count = models.PositiveIntegerField(default=0, verbose_name="Создано")  # type: ignore
+    completed_count = models.PositiveIntegerField(default=0, verbose_name="Выполнено")  # type: ignore
+
+    class Meta:
+        verbose_name = "Дневная статистика задач"
+        verbose_name_plural = "Дневная статистика задач"
+        ordering = ["date"]
+        indexes = [
+            models.Index(fields=["date", "project"], name="task_daily_stats_date_idx")
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.date:%d.%m.%Y}: {self.task_count} задач"
+
+
+class TaskEvent(models.Model):
+    """
+    Запись журнала изменений задачи (см. tasks.events).
+
+    Журнал только дополняется: записи не изменяются и не удаляются вместе с
+    задачей, поэтому задача и проект хранятся как простые id.
+    """
+
+    class Kind(models.TextChoices):
+        CREATED = "created", "Создана"
+        STATUS = "status", "Статус"
+        ASSIGNEE = "assignee", "Исполнитель"
+        DUE_DATE = "due_date", "Срок"
+        PRIORITY = "priority", "Приоритет"
+        DELETED = "deleted", "Удалена"
+
+    task_id = models.BigIntegerField(verbose_name="ID задачи")  # type: ignore
+    project_id = models.BigIntegerField(null=True, verbose_name="ID проекта")  # type: ignore
+    actor = models.ForeignKey(
+        "users.User",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+        verbose_name="Автор изменения",
+    )  # type: ignore
+    kind = models.CharField(max_length=20, choices=Kind.choices, verbose_name="Событие")  # type: ignore
+    # Коды статуса и приоритета, id исполнителя, дата в ISO; "" - не задано
+    old_value = models.CharField(max_length=50, blank=True, verbose_name="Было")  # type: ignore
+    new_value = models.CharField(max_length=50, blank=True, verbose_name="Стало")  # type: ignore
+    created_at = models.DateTimeField(default=timezone.now, verbose_name="Дата")  # type: ignore
+
+    class Meta:
+        verbose_name = "Событие задачи"
+        verbose_name_plural = "События задач"
+        ordering = ["created_at", "id"]
+        indexes = [
+            models.Index(fields=["task_id", "created_at"], name="task_event_task_idx"),
+            models.Index(
+                fields=["project_id", "created_at"], name="task_event_project_idx"
+            ),
+        ]
+
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        if not self._state.adding:
+            raise ValueError("Журнал событий задач только дополняется")
+        super().save(*args, **kwargs)
+
+    def __str__(self) -> str:
+        return f"Задача #{self.task_id}: {self.get_kind_display()}"  # type: ignore
@@ -0,0 +1,155 @@
+"""
+Уведомления о просроченных задачах.
+
+Просроченные задачи читаются потоком (iterator с chunk_size) вместе с
+исполнителем и проектом, группируются и превращаются в сводки: одна
+исполнителю (его задачи), одна создателю проекта (задачи проекта) и
+одна администратору (итоги по проектам). Сообщения ставятся в outbox
+уведомлений, их доставляет send_notifications.
+
+Задача получает отметку overdue_notified_for = due_date, поэтому
+повторный запуск отправляет только новые просрочки; если срок задачи
+перенесли и он снова прошёл, задача попадёт в сводку ещё раз.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.html import escape
+
+from apps.notifications.outbox import enqueue_telegram
+
+from .models import Task
+from .stats import overdue_q
+from .telegram_utils import get_user_chat_id
+
+DEFAULT_CHUNK_SIZE = 2000
+# Сколько задач перечислять в одной сводке, остальные - числом
+DIGEST_MAX_LINES = 20
+
+
+@dataclass
+class Digest:
+    """Сводка для одного получателя"""
+
+    recipient: Any
+    title: str
+    lines: list[str] = field(default_factory=list)
+    count: int = 0
+
+    def add(self, line: str) -> None:
+        self.count += 1
+        if len(self.lines) < DIGEST_MAX_LINES:
+            self.lines.append(line)
+
+    def render(self) -> str:
+        text = "\n".join([self.title, ""] + self.lines)
+        if self.count > len(self.lines):
+            text += f"\n…и ещё {self.count - len(self.lines)}"
+        return text
+
+
+@dataclass
+class OverdueReport:
+    tasks: int = 0
+    messages: int = 0
+    assignees: int = 0
+    projects: int = 0
+
+
+def newly_overdue(today: Optional[date] = None):
+    """Просроченные задачи, о которых ещё не уведомляли с текущим сроком"""
+    return (
+        Task.objects.filter(overdue_q(today))
+        .filter(
+            Q(overdue_notified_for__isnull=True)
+            | ~Q(overdue_notified_for=F("due_date"))
+        )
+        .select_related("assignee", "project__creator")
+        .order_by("pk")
+    )
+
+
+def _task_line(task: Task, today: date, with_assignee: bool = False) -> str:
+    days = (today - task.due_date).days
+    line = f"• {escape(task.title)} - {days} дн. ({task.get_priority_display()})"
+    if with_assignee:
+        assignee = task.assignee
+        name = (assignee.get_full_name() or assignee.username) if assignee else ""
+        line += f", {escape(name or 'не назначен')}"
+    return line
+
+
+def scan_overdue(
+    today: Optional[date] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    dry_run: bool = False,
+) -> OverdueReport:
+    """Разослать сводки о новых просрочках и отметить задачи"""
+    today = today or timezone.now().date()
+    report = OverdueReport()
+    by_assignee: dict[int, Digest] = {}
+    by_project: dict[int, Digest] = {}
+    # По id: у разных проектов может быть одинаковое название
+    project_counts: dict[int, int] = defaultdict(int)
+    project_names: dict[int, str] = {}
+    notified: list[int] = []
+
+    with transaction.atomic():
+        for task in newly_overdue(today).iterator(chunk_size=chunk_size):
+            report.tasks += 1
+            notified.append(task.pk)
+            project_counts[task.project_id] += 1
+            project_names[task.project_id] = task.project.name
+
+            if task.assignee_id:
+                digest = by_assignee.get(task.assignee_id)
+                if digest is None:
+                    digest = by_assignee[task.assignee_id] = Digest(
+                        task.assignee, "⏰ <b>Ваши просроченные задачи</b>"
+                    )
+                digest.add(_task_line(task, today))
+
+            digest = by_project.get(task.project_id)
+            if digest is None:
+                title = (
+                    f"🚨 <b>Просрочены задачи проекта {escape(task.project.name)}</b>"
+                )
+                digest = by_project[task.project_id] = Digest(
+                    task.project.creator, title
+                )
+            digest.add(_task_line(task, today, with_assignee=True))
+
+        report.assignees = len(by_assignee)
+        report.projects = len(by_project)
+        if dry_run or not notified:
+            return report
+
+        for digest in [*by_assignee.values(), *by_project.values()]:
+            if enqueue_telegram(get_user_chat_id(digest.recipient), digest.render()):
+                report.messages += 1
+
+        admin_chat_id = getattr(settings, "TELEGRAM_CHAT_IDS", {}).get("admin")
+        if admin_chat_id:
+            summary = Digest(
+                None, f"🚨 <b>Новых просроченных задач: {report.tasks}</b>"
+            )
+            for project_id, count in sorted(
+                project_counts.items(), key=lambda i: -i[1]
+            ):
+                summary.add(f"📁 {escape(project_names[project_id])}: {count}")
+            enqueue_telegram(admin_chat_id, summary.render())
+            report.messages += 1
+
+        # Отметка "уведомлено" без изменения updated_at
+        for start in range(0, len(notified), chunk_size):
+            Task.objects.filter(pk__in=notified[start : start + chunk_size]).update(
+                overdue_notified_for=F("due_date")
+            )
+    return report
@@ -0,0 +1,180 @@
+"""
+Дневные срезы задач для отчётов.
+
+Раз в сутки (команда rollup_task_stats) по задачам выполняется один
+группирующий запрос, и итог за прошедший день записывается в
+TaskDailyStats: сколько задач в каждом проекте, у каждого исполнителя, в
+каждом статусе и приоритете, сколько из них создано и выполнено за день.
+Недельный, месячный отчёты и burndown читают эти строки и не
+пересчитывают всю таблицу Task.
+
+"Выполнено за день" считается по Task.completed_at. При расчёте прошлых
+дней (--backfill) точен только признак "выполнена к концу дня"; задачи,
+выполненные позже, попадают в статус "В работе", остальные - в текущий.
+"""
+
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+
+from django.db import transaction
+from django.db.models import Case, Count, F, Max, Min, Q, Sum, Value, When
+from django.utils import timezone
+
+from .models import Task, TaskDailyStats
+
+
+def day_bounds(day: date) -> tuple[datetime, datetime]:
+    """Начало дня и начало следующего дня в часовом поясе проекта"""
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    end = timezone.make_aware(datetime.combine(day + timedelta(days=1), time.min))
+    return start, end
+
+
+def daterange(start: date, end: date) -> list[date]:
+    """Дни с start по end включительно"""
+    return [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+
+def rollup_day(day: date) -> int:
+    """Пересчитать срез за день, возвращает число строк"""
+    start, end = day_bounds(day)
+    day_status = Case(
+        When(completed_at__lt=end, then=Value(Task.Status.DONE)),
+        When(status=Task.Status.DONE, then=Value(Task.Status.IN_PROGRESS)),
+        default=F("status"),
+    )
+    groups = (
+        Task.objects.filter(created_at__lt=end)
+        .order_by()
+        .annotate(day_status=day_status)
+        .values("project_id", "assignee_id", "priority", "day_status")
+        .annotate(
+            task_count=Count("id"),
+            created_count=Count("id", filter=Q(created_at__gte=start)),
+            completed_count=Count(
+                "id", filter=Q(completed_at__gte=start, completed_at__lt=end)
+            ),
+        )
+    )
+    rows = [
+        TaskDailyStats(
+            date=day,
+            project_id=group["project_id"],
+            assignee_id=group["assignee_id"],
+            status=group["day_status"],
+            priority=group["priority"],
+            task_count=group["task_count"],
+            created_count=group["created_count"],
+            completed_count=group["completed_count"],
+        )
+        for group in groups
+    ]
+
+    # Повторный запуск за тот же день заменяет срез целиком
+    with transaction.atomic():
+        TaskDailyStats.objects.filter(date=day).delete()
+        TaskDailyStats.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def first_task_day() -> Optional[date]:
+    first = Task.objects.aggregate(first=Min("created_at"))["first"]
+    return timezone.localdate(first) if first else None
+
+
+def rollup_pending(until: Optional[date] = None) -> list[date]:
+    """
+    Досчитать дни после последнего готового среза по ``until`` включительно.
+
+    По умолчанию ``until`` - вчера: текущий день ещё не закончился.
+    """
+    until = until or timezone.localdate() - timedelta(days=1)
+    last = TaskDailyStats.objects.aggregate(last=Max("date"))["last"]
+    start = last + timedelta(days=1) if last else first_task_day()
+    if start is None or start > until:
+        return []
+
+    days = daterange(start, until)
+    for day in days:
+        rollup_day(day)
+    return days
+
+
+def backfill(since: Optional[date] = None, until: Optional[date] = None) -> list[date]:
+    """Пересчитать все срезы за период (по умолчанию - с первой задачи)"""
+    until = until or timezone.localdate() - timedelta(days=1)
+    since = since or first_task_day()
+    if since is None or since > until:
+        return []
+
+    days = daterange(since, until)
+    for day in days:
+        rollup_day(day)
+    return days
+
+
+@dataclass
+class PeriodReport:
+    """Итоги за период с start по end включительно"""
+
+    start: date
+    end: date
+    created: int = 0
+    completed: int = 0
+    by_status: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def total(self) -> int:
+        """Всего задач на конец периода"""
+        return sum(self.by_status.values())
+
+    @property
+    def done(self) -> int:
+        return self.by_status.get(Task.Status.DONE, 0)
+
+    @property
+    def active(self) -> int:
+        return self.total - self.done
+
+
+def period_report(start: date, end: date, project=None) -> PeriodReport:
+    """Создано и выполнено за период, состояние задач на его последний день"""
+    stats = TaskDailyStats.objects.all()
+    if project is not None:
+        stats = stats.filter(project=project)
+
+    flow = stats.filter(date__range=(start, end)).aggregate(
+        created=Sum("created_count"), completed=Sum("completed_count")
+    )
+    by_status = dict(
+        stats.filter(date=end)
+        .order_by()
+        .values("status")
+        .annotate(count=Sum("task_count"))
+        .values_list("status", "count")
+    )
+    return PeriodReport(
+        start=start,
+        end=end,
+        created=flow["created"] or 0,
+        completed=flow["completed"] or 0,
+        by_status=by_status,
+    )
+
+
+def burndown(start: date, end: date, project=None) -> list[tuple[date, int]]:
+    """Число незавершённых задач на конец каждого дня периода"""
+    stats = TaskDailyStats.objects.filter(date__range=(start, end)).exclude(
+        status=Task.Status.DONE
+    )
+    if project is not None:
+        stats = stats.filter(project=project)
+
+    remaining = dict(
+        stats.order_by()
+        .values("date")
+        .annotate(count=Sum("task_count"))
+        .values_list("date", "count")
+    )
+    return [(day, remaining.get(day, 0)) for day in daterange(start, end)]
@@ -0,0 +1,76 @@
+"""
+Поиск по задачам и проектам.
+
+В PostgreSQL ищем по колонке search_vector (tsvector, поддерживается
+триггером, GIN-индекс) с ранжированием ts_rank, а по названию ещё и
+нечётко - оператором <% из pg_trgm (триграммный GIN-индекс), чтобы
+находились опечатки и части слов. <% сравнивает запрос с самым похожим
+фрагментом названия (word_similarity), а не со всем названием: иначе
+короткий запрос к длинному названию не набирает порога сходства. Оба
+условия идут по индексам, без последовательного сканирования.
+
+Ветка PostgreSQL в CI не выполняется (тесты идут на SQLite), её тест
+пропускается без PostgreSQL.
+
+В SQLite (разработка, тесты) индексов нет: каждое слово запроса ищется
+через icontains в названии или описании, совпадения в названии выше.
+"""
+
+from django.contrib.postgres.lookups import TrigramWordSimilar
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    TrigramWordSimilarity,
+)
+from django.db import connections
+from django.db.models import Case, F, IntegerField, Q, QuerySet, Value, When
+
+# Конфигурация должна совпадать с триггерами в миграциях
+SEARCH_CONFIG = "russian"
+
+
+def search(
+    queryset: QuerySet,
+    text: str,
+    title: str = "title",
+    description: str = "description",
+) -> QuerySet:
+    """
+    Отфильтровать queryset по строке поиска, самые подходящие сверху.
+
+    Релевантность доступна в аннотации ``search_rank``.
+    """
+    text = text.strip()
+    if not text:
+        return queryset.none()
+
+    if connections[queryset.db].vendor == "postgresql":
+        query = SearchQuery(text, config=SEARCH_CONFIG, search_type="websearch")
+        return (
+            queryset.annotate(
+                search_rank=SearchRank(F("search_vector"), query)
+                + TrigramWordSimilarity(text, title)
+            )
+            .filter(Q(search_vector=query) | Q(TrigramWordSimilar(F(title), text)))
+            .order_by("-search_rank", "-pk")
+        )
+
+    condition = Q()
+    rank = Value(0, output_field=IntegerField())
+    for word in text.split():
+        in_title = Q(**{f"{title}__icontains": word})
+        condition &= in_title | Q(**{f"{description}__icontains": word})
+        rank = rank + Case(When(in_title, then=Value(1)), default=Value(0))
+    return (
+        queryset.filter(condition)
+        .annotate(search_rank=rank)
+        .order_by("-search_rank", "-pk")
+    )
+
+
+def search_tasks(queryset: QuerySet, text: str) -> QuerySet:
+    return search(queryset, text, title="title")
+
+
+def search_projects(queryset: QuerySet, text: str) -> QuerySet:
+    return search(queryset, text, title="name")
@@ -1,71 +1,183 @@
 import logging
-from django.db.models.signals import post_save, pre_save
+from django.db.models import QuerySet
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 from django.dispatch import receiver
-from django.core.mail import send_mail
 from django.conf import settings
-from .models import Task
+from .events import deleted_event, record_task_events
+from .facets import invalidate_facets
+from .models import Task, TaskEvent, TaskTombstone
+from .stats import invalidate_stats, user_stats_key
+from .sync import record_hidden_tasks
 from .telegram_utils import send_telegram_message, get_user_chat_id
+from apps.notifications.outbox import enqueue_email, enqueue_telegram
+from apps.projects.models import Project
 from apps.users.models import User
 
 logger = logging.getLogger(__name__)
 
-# Глобальный словарь для хранения предыдущих состояний задач
-_task_cache = {}
 
+def deleted_with_project(origin) -> bool:
+    """Задача удаляется каскадом вместе с проектом (см. record_project_deletion)"""
+    if isinstance(origin, Project):
+        return True
+    return isinstance(origin, QuerySet) and origin.model is Project
 
-@receiver(pre_save, sender=Task)
-def save_task_state(sender, instance, **kwargs):
+
+@receiver(post_delete, sender=Task)
+def record_task_tombstone(sender, instance, origin=None, **kwargs):
+    """Запоминаем удаление задачи для клиентов инкрементальной синхронизации"""
+    if deleted_with_project(origin):
+        return
+    TaskTombstone.objects.create(
+        task_id=instance.pk,
+        project_id=instance.project_id,
+        assignee_id=instance.assignee_id,
+    )
+
+
+@receiver(pre_delete, sender=Project)
+def record_project_deletion(sender, instance, **kwargs):
     """
-    Сохраняем состояние задачи перед сохранением
+    Отметки об удалении и события журнала для всех задач проекта - двумя
+    пачечными INSERT, а не двумя INSERT на каждую каскадно удаляемую задачу
     """
-    if instance.pk:
-        try:
-            old_instance = Task.objects.get(pk=instance.pk)
-            # Сохраняем ВСЕ важные поля
-            _task_cache[instance.pk] = {
-                "status": old_instance.status,
-                "assignee_id": (
-                    old_instance.assignee_id if old_instance.assignee else None
-                ),
-                "due_date": old_instance.due_date,
-                "priority": old_instance.priority,
-                "title": old_instance.title,
-                "description": old_instance.description,
-            }
-        except Task.DoesNotExist:
-            _task_cache[instance.pk] = None
+    tasks = list(
+        Task.objects.filter(project=instance)
+        .order_by()
+        .values_list("pk", "assignee_id", "status")
+    )
+    if not tasks:
+        return
+
+    actor = getattr(instance, "changed_by", None)
+    TaskTombstone.objects.bulk_create(
+        [
+            TaskTombstone(task_id=pk, project_id=instance.pk, assignee_id=assignee_id)
+            for pk, assignee_id, _ in tasks
+        ],
+        batch_size=1000,
+    )
+    TaskEvent.objects.bulk_create(
+        [
+            deleted_event(pk, instance.pk, status, actor.pk if actor else None)
+            for pk, _, status in tasks
+        ],
+        batch_size=1000,
+    )
+
+
+@receiver(post_save, sender=Task)
+def record_task_reassignment(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Смена исполнителя или проекта: прежний исполнитель и участники
+    прежнего проекта должны убрать задачу при синхронизации
+    """
+    if created:
+        return
+    changed = {
+        name
+        for name in ("assignee", "project")
+        if instance.has_changed(name)
+        and (update_fields is None or name in update_fields)
+    }
+    # Назначение задачи без исполнителя ни у кого её не забирает
+    if changed == {"assignee"} and instance.get_previous("assignee") is None:
+        return
+    if changed:
+        TaskTombstone.objects.create(
+            task_id=instance.pk,
+            project_id=instance.get_previous("project"),
+            assignee_id=instance.get_previous("assignee"),
+        )
+
+
+@receiver(m2m_changed, sender=Project.members.through)
+def record_member_removal(sender, instance, action, reverse, pk_set, **kwargs):
+    """Исключённый из проекта участник должен убрать его задачи при синхронизации"""
+    related = instance.projects if reverse else instance.members
+    if action == "pre_clear":
+        # После очистки связанные id уже не узнать
+        instance._cleared_member_ids = set(related.values_list("pk", flat=True))
+        return
+    if action == "post_remove":
+        removed = set(pk_set or ())
+    elif action == "post_clear":
+        removed = getattr(instance, "_cleared_member_ids", set())
+    else:
+        return
+    if not removed:
+        return
+
+    if reverse:
+        # user.projects.remove(...): instance - пользователь, removed - проекты
+        tasks = Task.objects.filter(project_id__in=removed)
+        record_hidden_tasks(tasks, [instance.pk])
     else:
-        _task_cache.get(instance.pk, None)
+        record_hidden_tasks(Task.objects.filter(project=instance), removed)
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def reset_task_facets(sender, instance, origin=None, **kwargs):
+    """Счётчики фильтров с проектом задачи пересчитаются при следующем запросе"""
+    if deleted_with_project(origin):
+        return
+    invalidate_facets(instance.project_id, instance.get_previous("project"))
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def reset_project_facets(sender, instance, **kwargs):
+    """Название или состав проекта изменились - сбрасываем его счётчики"""
+    invalidate_facets(instance.pk)
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def reset_assignee_stats(sender, instance, **kwargs):
+    """Сбрасываем счётчики дашборда нового и прежнего исполнителя"""
+    assignees = {instance.assignee_id, instance.get_previous("assignee")} - {None}
+    if assignees:
+        invalidate_stats(*(user_stats_key(pk) for pk in assignees))
+
+
+@receiver(post_save, sender=Task)
+def record_task_history(sender, instance, created, update_fields=None, **kwargs):
+    """Записываем переходы статуса, исполнителя, срока и приоритета в журнал"""
+    record_task_events(instance, created, update_fields)
+
+
+@receiver(post_delete, sender=Task)
+def record_task_deletion_history(sender, instance, origin=None, **kwargs):
+    """Записываем удаление задачи в журнал"""
+    if deleted_with_project(origin):
+        return
+    actor = getattr(instance, "changed_by", None)
+    deleted_event(
+        instance.pk, instance.project_id, instance.status, actor.pk if actor else None
+    ).save()
 
 
 @receiver(post_save, sender=Task)
 def task_notification_system(sender, instance, created, **kwargs):
     """
-    Полная система уведомлений для задач
+    Полная система уведомлений для задач.
+
+    Сообщения не отправляются напрямую, а записываются в outbox в той же
+    транзакции; доставкой занимается команда send_notifications.
     """
     logger.info(
         f"🔔 [NOTIFICATION] Обработка задачи: '{instance.title}' (ID: {instance.id})"
     )
 
-    old_data = _task_cache.get(instance.pk) if not created else None
-
-    # Определяем, какие поля изменились
-    changed_fields = []
-    if old_data:
-        if old_data.get("status") != instance.status:
-            changed_fields.append("status")
-        if old_data.get("assignee_id") != (
-            instance.assignee_id if instance.assignee else None
-        ):
-            changed_fields.append("assignee")
-        if old_data.get("due_date") != instance.due_date:
-            changed_fields.append("due_date")
-        if old_data.get("priority") != instance.priority:
-            changed_fields.append("priority")
-        if old_data.get("title") != instance.title:
-            changed_fields.append("title")
-        if old_data.get("description") != instance.description:
-            changed_fields.append("description")
+    # Предыдущие значения берём из снимка полей (FieldTrackerMixin),
+    # без повторного чтения задачи из БД
+    changed_fields = [] if created else instance.changed_fields
+    old_data = (
+        None
+        if created
+        else {field: instance.get_previous(field) for field in Task.tracked_fields}
+    )
 
     project_name = instance.project.name if instance.project else "Без проекта"
 
@@ -121,9 +233,9 @@ def task_notification_system(sender, instance, created, **kwargs):
 🏷️ <b>Приоритет:</b> {instance.get_priority_display()}
 📊 <b>Статус:</b> {instance.get_status_display()}"""
 
-                send_telegram_message(chat_id, message)
+                enqueue_telegram(chat_id, message, task=instance)
                 logger.info(
-                    f"✅ [TELEGRAM] Уведомление о новой задаче отправлено: {instance.assignee.username}"
+                    f"✅ [TELEGRAM] Уведомление о новой задаче поставлено в очередь: {instance.assignee.username}"
                 )
 
             # B. При изменении статуса
@@ -139,9 +251,9 @@ def task_notification_system(sender, instance, created, **kwargs):
 🔄 <b>Статус:</b> {old_status_display} → {new_status_display}
 👤 <b>Изменил:</b> {instance.creator.username if instance.creator else 'Система'}"""
 
-                send_telegram_message(chat_id, message)
+                enqueue_telegram(chat_id, message, task=instance)
                 logger.info(
-                    f"✅ [TELEGRAM] Уведомление о смене статуса отправлено: {instance.assignee.username}"
+                    f"✅ [TELEGRAM] Уведомление о смене статуса поставлено в очередь: {instance.assignee.username}"
                 )
 
             # C. При изменении сроков
@@ -155,9 +267,9 @@ def task_notification_system(sender, instance, created, **kwargs):
 📌 <b>Задача:</b> {instance.title}
 🔄 <b>Срок:</b> {old_date.strftime('%d.%m.%Y')} → {new_date.strftime('%d.%m.%Y')}"""
 
-                    send_telegram_message(chat_id, message)
+                    enqueue_telegram(chat_id, message, task=instance)
                     logger.info(
-                        f"✅ [TELEGRAM] Уведомление об изменении срока отправлено: {instance.assignee.username}"
+                        f"✅ [TELEGRAM] Уведомление об изменении срока поставлено в очередь: {instance.assignee.username}"
                     )
 
     # Уведомление админу при ВСЕХ изменениях (если не админ менял)
@@ -172,8 +284,8 @@ def task_notification_system(sender, instance, created, **kwargs):
             )
         if "assignee" in changed_fields:
             old_assignee = (
-                User.objects.filter(id=old_data.get("assignee_id")).first()
-                if old_data.get("assignee_id")
+                User.objects.filter(id=old_data.get("assignee")).first()
+                if old_data.get("assignee")
                 else None
             )
             changes_list.append(
@@ -197,21 +309,17 @@ def task_notification_system(sender, instance, created, **kwargs):
 <b>Изменения:</b>
 {changes_text}"""
 
-            send_telegram_message(admin_chat_id, message)
+            enqueue_telegram(admin_chat_id, message, task=instance)
             logger.info(
-                "✅ [TELEGRAM] Уведомление об изменениях отправлено администратору"
+                "✅ [TELEGRAM] Уведомление об изменениях поставлено в очередь для администратора"
             )
 
-    # Очищаем кэш
-    if instance.pk in _task_cache:
-        del _task_cache[instance.pk]
-
 
 def send_task_email(
     task, recipient, email_type, project_name, old_status=None, old_due_date=None
 ):
     """
-    Отправка email уведомления
+    Постановка email уведомления в outbox
     """
     try:
         recipient_name = (
@@ -280,22 +388,17 @@ def send_task_email(
         else:
             return
 
-        from_email = getattr(settings, "DEFAULT_FROM_EMAIL", "noreply@tasktracker.ru")
-
-        send_mail(
-            subject=subject,
-            message=message,
-            from_email=from_email,
-            recipient_list=[recipient.email],
-            fail_silently=False,
-        )
-
-        logger.info(f"✅ [EMAIL] Отправлен {email_type} на: {recipient.email}")
-
     except Exception as e:
         logger.error(
-            f"❌ [EMAIL] Ошибка отправки пользователю {recipient.username}: {e}"
+            f"❌ [EMAIL] Ошибка формирования письма для {recipient.username}: {e}"
         )
+        return
+
+    # Запись в outbox идёт в транзакции вызывающего кода: ошибку БД не
+    # глушим, иначе транзакция останется сломанной
+    enqueue_email(recipient.email, subject, message, task=task)
+
+    logger.info(f"✅ [EMAIL] {email_type} поставлен в очередь на: {recipient.email}")
 
 
 # Обновим старую функцию, чтобы она использовала новую
@@ -351,19 +454,3 @@ def send_telegram_notification(
     except Exception as e:
         print(f"❌ [TELEGRAM] Ошибка формирования сообщения: {e}")
         return False
-
-
-# Сигнал для сохранения предыдущего статуса
-@receiver(post_save, sender=Task)
-def save_previous_status(sender, instance, **kwargs):
-    """
-    Сохраняем предыдущий статус задачи для отслеживания изменений
-    """
-    if instance.pk:
-        try:
-            old_instance = Task.objects.get(pk=instance.pk)
-            instance._previous_status = old_instance.status
-        except Task.DoesNotExist:
-            instance._previous_status = None
-    else:
-        instance._previous_status = None
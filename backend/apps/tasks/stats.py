@@ -0,0 +1,156 @@
+"""
+Агрегированная статистика по задачам.
+
+Все счётчики (по статусам, приоритетам, просроченные, без исполнителя)
+считаются одним запросом с условной агрегацией (COUNT ... FILTER / CASE),
+поэтому стоимость не зависит от количества вариантов статуса и приоритета.
+"""
+
+from datetime import date
+from typing import Any, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q, QuerySet
+from django.utils import timezone
+
+from .models import Task
+
+DEFAULT_CACHE_TIMEOUT = 60  # секунд
+
+# Статусы, в которых задача с прошедшим сроком считается просроченной
+OVERDUE_STATUSES = [Task.Status.TODO, Task.Status.IN_PROGRESS, Task.Status.REVIEW]
+
+
+def overdue_q(today: Optional[date] = None) -> Q:
+    """Условие просроченной задачи"""
+    today = today or timezone.now().date()
+    return Q(due_date__lt=today, status__in=OVERDUE_STATUSES)
+
+
+class TaskStats:
+    """Счётчики по набору задач, полученные одним запросом"""
+
+    def __init__(self, data: dict[str, int]):
+        self.data = data
+        self.total = data["total"]
+        self.overdue = data["overdue"]
+        self.unassigned = data["unassigned"]
+        self.by_status = {
+            code: data[f"status_{code}"] for code, _ in Task.Status.choices
+        }
+        self.by_priority = {
+            code: data[f"priority_{code}"] for code, _ in Task.Priority.choices
+        }
+
+    @classmethod
+    def for_queryset(
+        cls,
+        queryset: Optional[QuerySet] = None,
+        today: Optional[date] = None,
+        extra: Optional[dict[str, Q]] = None,
+    ) -> "TaskStats":
+        """
+        Посчитать статистику по queryset задач.
+
+        ``extra`` - дополнительные именованные счётчики вида
+        {"created_this_week": Q(created_at__gte=...)}, они попадают в тот же
+        запрос и доступны через ``stats[name]``.
+        """
+        if queryset is None:
+            queryset = Task.objects.all()
+
+        aggregates: dict[str, Any] = {
+            "total": Count("id"),
+            "overdue": Count("id", filter=overdue_q(today)),
+            "unassigned": Count("id", filter=Q(assignee__isnull=True)),
+        }
+        for code, _ in Task.Status.choices:
+            aggregates[f"status_{code}"] = Count("id", filter=Q(status=code))
+        for code, _ in Task.Priority.choices:
+            aggregates[f"priority_{code}"] = Count("id", filter=Q(priority=code))
+        for name, condition in (extra or {}).items():
+            aggregates[name] = Count("id", filter=condition)
+
+        data = queryset.order_by().aggregate(**aggregates)
+        return cls({key: value or 0 for key, value in data.items()})
+
+    def __getitem__(self, key: str) -> int:
+        return self.data[key]
+
+    @property
+    def done(self) -> int:
+        return self.by_status[Task.Status.DONE]
+
+    @property
+    def active(self) -> int:
+        """Все незавершённые задачи"""
+        return self.total - self.done
+
+    def percentage(self, count: int) -> float:
+        if not self.total:
+            return 0
+        return round((count / self.total) * 100, 1)
+
+    def status_breakdown(self) -> dict[str, dict[str, Any]]:
+        """{код: {"name", "count", "percentage"}} по статусам"""
+        return {
+            code: {
+                "name": name,
+                "count": self.by_status[code],
+                "percentage": self.percentage(self.by_status[code]),
+            }
+            for code, name in Task.Status.choices
+        }
+
+    def priority_breakdown(self) -> dict[str, dict[str, Any]]:
+        """{код: {"name", "count", "percentage"}} по приоритетам"""
+        return {
+            code: {
+                "name": name,
+                "count": self.by_priority[code],
+                "percentage": self.percentage(self.by_priority[code]),
+            }
+            for code, name in Task.Priority.choices
+        }
+
+    def as_dict(self) -> dict[str, int]:
+        """Плоский словарь: total, коды статусов и приоритетов, overdue..."""
+        return {
+            "total": self.total,
+            **self.by_status,
+            **self.by_priority,
+            "overdue": self.overdue,
+            "unassigned": self.unassigned,
+            "active": self.active,
+        }
+
+
+def get_stats_cache_timeout() -> int:
+    return int(getattr(settings, "TASK_STATS_CACHE_TIMEOUT", DEFAULT_CACHE_TIMEOUT))
+
+
+def user_stats_key(user_id: int) -> str:
+    """Ключ статистики задач исполнителя (дашборд сотрудника)"""
+    return f"user:{user_id}"
+
+
+def invalidate_stats(*keys: str) -> None:
+    """Сбросить кэш статистики (после изменения задач)"""
+    cache.delete_many([f"task_stats:{key}" for key in keys])
+
+
+def get_cached_stats(key: str, queryset: Optional[QuerySet] = None) -> TaskStats:
+    """
+    Статистика с коротким кэшированием.
+
+    ``key`` определяет, чья это статистика (например, "user:42"), при промахе
+    выполняется один агрегирующий запрос. Статистику исполнителя сбрасывает
+    сигнал сохранения и удаления задачи, остальные ключи живут до таймаута.
+    """
+    cache_key = f"task_stats:{key}"
+    data = cache.get(cache_key)
+    if data is None:
+        data = TaskStats.for_queryset(queryset).data
+        cache.set(cache_key, data, get_stats_cache_timeout())
+    return TaskStats(data)
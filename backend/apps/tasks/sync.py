@@ -0,0 +1,174 @@
+"""
+Инкрементальная синхронизация задач.
+
+Клиент хранит курсор (updated_at и id последней полученной задачи) и
+получает только задачи, изменённые после него, и id удалённых или
+пропавших из видимости задач (TaskTombstone). Курсор отстаёт от текущего времени на
+TASK_SYNC_SAFETY_SECONDS: строки из ещё не закоммиченных транзакций не
+теряются, а повторно присланные изменения клиент просто перезаписывает.
+"""
+
+import base64
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+from django.conf import settings
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+
+from .models import Task, TaskTombstone
+
+DEFAULT_PAGE_SIZE = 500
+DEFAULT_SAFETY_SECONDS = 5
+DEFAULT_TOMBSTONE_RETENTION_DAYS = 30
+
+
+class InvalidCursor(ValueError):
+    """Курсор не разобран"""
+
+
+class ExpiredCursor(Exception):
+    """Курсор старше срока хранения удалений, нужна полная синхронизация"""
+
+
+@dataclass
+class SyncCursor:
+    updated_at: datetime
+    pk: int = 0
+    # Начало синхронизации, к которой относится курсор (по умолчанию -
+    # updated_at). Срок хранения удалений проверяется по нему, а не по
+    # позиции: продолжение выдачи давно изменённых задач не устаревает
+    started_at: Optional[datetime] = None
+
+    def __post_init__(self) -> None:
+        if self.started_at is None:
+            self.started_at = self.updated_at
+
+    def encode(self) -> str:
+        started_at = self.started_at or self.updated_at
+        raw = f"{self.updated_at.isoformat()}|{self.pk}|{started_at.isoformat()}"
+        return base64.urlsafe_b64encode(raw.encode("ascii")).decode("ascii")
+
+    @classmethod
+    def decode(cls, value: str) -> "SyncCursor":
+        try:
+            raw = base64.urlsafe_b64decode(value.encode("ascii")).decode("ascii")
+            # Старые курсоры без начала синхронизации: "updated_at|pk"
+            updated_at, pk, *started_at = raw.split("|")
+            if len(started_at) > 1:
+                raise ValueError(value)
+            return cls(
+                datetime.fromisoformat(updated_at),
+                int(pk),
+                datetime.fromisoformat(started_at[0]) if started_at else None,
+            )
+        except (TypeError, ValueError, UnicodeError):
+            raise InvalidCursor(value)
+
+
+@dataclass
+class SyncResult:
+    changed: list[Task]
+    deleted: list[int] = field(default_factory=list)
+    cursor: Optional[SyncCursor] = None
+    has_more: bool = False
+
+
+def get_tombstone_retention() -> timedelta:
+    days = getattr(
+        settings, "TASK_TOMBSTONE_RETENTION_DAYS", DEFAULT_TOMBSTONE_RETENTION_DAYS
+    )
+    return timedelta(days=days)
+
+
+def get_changes(
+    tasks: QuerySet,
+    tombstones: QuerySet,
+    since: Optional[SyncCursor] = None,
+    limit: Optional[int] = None,
+) -> SyncResult:
+    """
+    Изменения после курсора ``since``.
+
+    ``tasks`` и ``tombstones`` уже отфильтрованы по правам пользователя.
+    Без ``since`` возвращаются все задачи (первая синхронизация) без
+    удалений. Если изменений больше ``limit``, возвращается первая часть и
+    ``has_more=True``, курсор указывает на последнюю отданную задачу.
+    """
+    now = timezone.now()
+    limit = limit or getattr(settings, "TASK_SYNC_PAGE_SIZE", DEFAULT_PAGE_SIZE)
+    safety = timedelta(
+        seconds=getattr(settings, "TASK_SYNC_SAFETY_SECONDS", DEFAULT_SAFETY_SECONDS)
+    )
+
+    if since is not None and since.started_at < now - get_tombstone_retention():
+        raise ExpiredCursor()
+
+    visible = tasks
+    tasks = tasks.order_by("updated_at", "pk")
+    if since is not None:
+        tasks = tasks.filter(
+            Q(updated_at__gt=since.updated_at)
+            | Q(updated_at=since.updated_at, pk__gt=since.pk)
+        )
+
+    changed = list(tasks[: limit + 1])
+    has_more = len(changed) > limit
+    changed = changed[:limit]
+
+    if has_more:
+        last = changed[-1]
+        # Продолжение той же синхронизации: начало не меняется
+        started_at = since.started_at if since is not None else now
+        cursor = SyncCursor(last.updated_at, last.pk, started_at)
+        deleted_until = last.updated_at
+    else:
+        watermark = SyncCursor(now - safety)
+        if since is not None and since.updated_at >= watermark.updated_at:
+            watermark = SyncCursor(since.updated_at, since.pk)
+        cursor = watermark
+        deleted_until = now
+
+    deleted: list[int] = []
+    if since is not None:
+        tombstoned = list(
+            tombstones.filter(
+                deleted_at__gt=since.updated_at, deleted_at__lte=deleted_until
+            )
+            .order_by("deleted_at", "pk")
+            .values_list("task_id", flat=True)
+        )
+        if tombstoned:
+            # Задача могла пропасть из видимости другого пользователя
+            # (или вернуться): видимые сейчас задачи не удаляем
+            still_visible = set(
+                visible.filter(pk__in=tombstoned).values_list("pk", flat=True)
+            )
+            deleted = [
+                pk for pk in dict.fromkeys(tombstoned) if pk not in still_visible
+            ]
+
+    return SyncResult(changed, deleted, cursor, has_more)
+
+
+def record_hidden_tasks(
+    tasks: QuerySet, user_ids: Iterable[int], batch_size: int = 1000
+) -> int:
+    """Отметить задачи как пропавшие из видимости пользователей ``user_ids``"""
+    user_ids = list(user_ids)
+    rows = [
+        TaskTombstone(task_id=pk, project_id=project_id, user_id=user_id)
+        for pk, project_id in tasks.order_by().values_list("pk", "project_id")
+        for user_id in user_ids
+    ]
+    TaskTombstone.objects.bulk_create(rows, batch_size=batch_size)
+    return len(rows)
+
+
+def purge_tombstones() -> int:
+    """Удалить отметки об удалении старше срока хранения"""
+    deleted, _ = TaskTombstone.objects.filter(
+        deleted_at__lt=timezone.now() - get_tombstone_retention()
+    ).delete()
+    return deleted
@@ -1,8 +1,9 @@
-import requests
 from django.conf import settings
 import logging
 from typing import Optional
 
+from apps.notifications.telegram_client import get_telegram_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -21,23 +22,37 @@ def send_telegram_message(chat_id: str, message: str, parse_mode: str = "HTML")
         return False
 
     try:
-        url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
-        payload = {"chat_id": chat_id, "text": message, "parse_mode": parse_mode}
-
-        response = requests.post(url, json=payload, timeout=10)
-        response.raise_for_status()
-
-        logger.info(f"✅ [TELEGRAM] Сообщение отправлено в чат {chat_id}")
-        return True
-
-    except requests.exceptions.RequestException as e:
-        logger.error(f"❌ [TELEGRAM] Ошибка отправки: {e}")
+        # Общий клиент: пул keep-alive соединений и учёт лимитов Telegram
+        client = get_telegram_client()
+        if client.send_message(chat_id, message, parse_mode=parse_mode):
+            logger.info(f"✅ [TELEGRAM] Сообщение отправлено в чат {chat_id}")
+            return True
         return False
+
     except Exception as e:
         logger.error(f"❌ [TELEGRAM] Неожиданная ошибка: {e}")
         return False
 
 
+def send_telegram_messages(messages, parse_mode: str = "HTML") -> list:
+    """
+    Параллельная отправка [(chat_id, message), ...].
+    Возвращает список результатов (bool) в том же порядке.
+    """
+    messages = list(messages)
+
+    if not getattr(settings, "TELEGRAM_BOT_TOKEN", None):
+        if messages:
+            logger.warning("⚠️ [TELEGRAM] Токен бота не настроен")
+        return [False] * len(messages)
+
+    try:
+        return get_telegram_client().send_many(messages, parse_mode=parse_mode)
+    except Exception as e:
+        logger.error(f"❌ [TELEGRAM] Неожиданная ошибка рассылки: {e}")
+        return [False] * len(messages)
+
+
 def get_user_chat_id(user) -> Optional[str]:
     """
     Получение chat_id пользователя в порядке приоритета:
@@ -141,8 +156,7 @@ def test_telegram_connection() -> dict:
 
     try:
         # Тест получения информации о боте
-        url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/getMe"
-        response = requests.get(url, timeout=10)
+        response = get_telegram_client().call("getMe")
         response.raise_for_status()
 
         bot_info = response.json()
@@ -0,0 +1,31 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+
+from apps.tasks.models import Task
+
+
+class BenchmarkTaskQueriesTestCase(TestCase):
+    """Тесты команды benchmark_task_queries"""
+
+    def test_reports_plans_and_rolls_back(self):
+        """Планы выводятся для обоих вариантов, данные и схема откатываются"""
+        out = StringIO()
+        call_command(
+            "benchmark_task_queries", tasks=200, users=5, projects=3, stdout=out
+        )
+
+        output = out.getvalue()
+        self.assertIn("С индексами", output)
+        self.assertIn("Без индексов", output)
+        self.assertIn("task_assignee_status_idx", output)
+        self.assertEqual(Task.objects.count(), 0)
+
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(
+                cursor, Task._meta.db_table
+            )
+        for index in Task._meta.indexes:
+            self.assertIn(index.name, constraints)
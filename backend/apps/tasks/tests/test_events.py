@@ -0,0 +1,190 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.projects.models import Project
+from apps.tasks.events import task_timings
+from apps.tasks.models import Task, TaskEvent, TaskTombstone
+
+User = get_user_model()
+
+
+class TaskEventLogTestCase(TestCase):
+    """Тесты журнала событий задач"""
+
+    def setUp(self):
+        self.manager = User.objects.create_user(username="manager", password="x")
+        self.worker = User.objects.create_user(username="worker", password="x")
+        self.project = Project.objects.create(name="Проект", creator=self.manager)
+        self.task = Task.objects.create(
+            title="Задача", project=self.project, creator=self.manager
+        )
+
+    def test_created_event(self):
+        """Создание задачи записывается с автором-создателем"""
+        event = TaskEvent.objects.get(task_id=self.task.pk)
+        self.assertEqual(event.kind, TaskEvent.Kind.CREATED)
+        self.assertEqual(event.new_value, Task.Status.TODO)
+        self.assertEqual(event.actor, self.manager)
+        self.assertEqual(event.project_id, self.project.pk)
+
+    def test_transitions_in_one_insert(self):
+        """Все переходы одного сохранения пишутся одним INSERT"""
+        due_date = timezone.localdate() + timedelta(days=3)
+        self.task.status = Task.Status.IN_PROGRESS
+        self.task.assignee = self.worker
+        self.task.due_date = due_date
+        self.task.priority = Task.Priority.HIGH
+        self.task.title = "Не попадает в журнал"
+        self.task.changed_by = self.worker
+
+        TaskEvent.objects.all().delete()
+        self.task.save()
+
+        events = {e.kind: e for e in TaskEvent.objects.filter(task_id=self.task.pk)}
+        self.assertEqual(
+            set(events),
+            {
+                TaskEvent.Kind.STATUS,
+                TaskEvent.Kind.ASSIGNEE,
+                TaskEvent.Kind.DUE_DATE,
+                TaskEvent.Kind.PRIORITY,
+            },
+        )
+        status = events[TaskEvent.Kind.STATUS]
+        self.assertEqual((status.old_value, status.new_value), ("todo", "in_progress"))
+        self.assertEqual(status.actor, self.worker)
+        assignee = events[TaskEvent.Kind.ASSIGNEE]
+        self.assertEqual(
+            (assignee.old_value, assignee.new_value), ("", str(self.worker.pk))
+        )
+        self.assertEqual(
+            events[TaskEvent.Kind.DUE_DATE].new_value, due_date.isoformat()
+        )
+
+    def test_unsaved_fields_not_logged(self):
+        """Изменения вне update_fields и правки без переходов не пишутся"""
+        self.task.status = Task.Status.DONE
+        self.task.title = "Новое название"
+        self.task.save(update_fields=["title"])
+        self.task.save()  # повторное сохранение без изменений
+
+        kinds = TaskEvent.objects.filter(task_id=self.task.pk).values_list(
+            "kind", flat=True
+        )
+        self.assertEqual(list(kinds), [TaskEvent.Kind.CREATED, TaskEvent.Kind.STATUS])
+
+    def test_log_survives_task_deletion(self):
+        """Журнал остаётся после удаления задачи, удаление тоже записывается"""
+        task_id = self.task.pk
+        self.task.delete()
+
+        kinds = TaskEvent.objects.filter(task_id=task_id).values_list("kind", flat=True)
+        self.assertEqual(list(kinds), [TaskEvent.Kind.CREATED, TaskEvent.Kind.DELETED])
+
+    def test_project_deletion_batches_history(self):
+        """Удаление проекта пишет отметки и события всех задач двумя INSERT"""
+        tasks = [self.task] + [
+            Task.objects.create(
+                title=f"Задача {i}", project=self.project, creator=self.manager
+            )
+            for i in range(3)
+        ]
+        task_ids = [task.pk for task in tasks]
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.project.delete()
+
+        inserts = [q for q in ctx.captured_queries if q["sql"].startswith("INSERT")]
+        self.assertEqual(len(inserts), 2)
+        deleted = TaskEvent.objects.filter(kind=TaskEvent.Kind.DELETED)
+        self.assertCountEqual(deleted.values_list("task_id", flat=True), task_ids)
+        self.assertCountEqual(
+            TaskTombstone.objects.values_list("task_id", flat=True), task_ids
+        )
+
+    def test_events_are_append_only(self):
+        """Записи журнала нельзя изменить"""
+        event = TaskEvent.objects.get(task_id=self.task.pk)
+        event.new_value = "done"
+        with self.assertRaises(ValueError):
+            event.save()
+
+    def create_timing_events(self, start):
+        TaskEvent.objects.all().delete()
+        TaskEvent.objects.bulk_create(
+            [
+                TaskEvent(
+                    task_id=1, kind="created", new_value="todo", created_at=start
+                ),
+                TaskEvent(
+                    task_id=1,
+                    kind="status",
+                    new_value="in_progress",
+                    created_at=start + timedelta(days=2),
+                ),
+                TaskEvent(
+                    task_id=1,
+                    kind="status",
+                    new_value="done",
+                    created_at=start + timedelta(days=5),
+                ),
+                # Переоткрыта и выполнена снова - считается последнее выполнение
+                TaskEvent(
+                    task_id=1,
+                    kind="status",
+                    new_value="review",
+                    created_at=start + timedelta(days=6),
+                ),
+                TaskEvent(
+                    task_id=1,
+                    kind="status",
+                    new_value="done",
+                    created_at=start + timedelta(days=7),
+                ),
+                # Выполнена без работы
+                TaskEvent(
+                    task_id=2, kind="created", new_value="todo", created_at=start
+                ),
+                TaskEvent(
+                    task_id=2,
+                    kind="status",
+                    new_value="done",
+                    created_at=start + timedelta(days=1),
+                ),
+                # Не выполнена
+                TaskEvent(
+                    task_id=3, kind="created", new_value="todo", created_at=start
+                ),
+            ]
+        )
+
+    def test_task_timings(self):
+        """Lead time и cycle time считаются по журналу"""
+        self.create_timing_events(timezone.now() - timedelta(days=10))
+
+        with self.assertNumQueries(1):
+            timings = {t.task_id: t for t in task_timings()}
+
+        self.assertEqual(set(timings), {1, 2})
+        self.assertEqual(timings[1].lead_time, timedelta(days=7))
+        self.assertEqual(timings[1].cycle_time, timedelta(days=5))
+        self.assertEqual(timings[2].lead_time, timedelta(days=1))
+        self.assertIsNone(timings[2].cycle_time)
+
+    def test_task_timings_for_period(self):
+        """Фильтр по периоду выбирает задачи, события создания не теряются"""
+        start = timezone.now() - timedelta(days=10)
+        self.create_timing_events(start)
+
+        events = TaskEvent.objects.filter(created_at__gte=start + timedelta(days=4))
+        with self.assertNumQueries(1):
+            timings = task_timings(events)
+
+        self.assertEqual([t.task_id for t in timings], [1])
+        self.assertEqual(timings[0].lead_time, timedelta(days=7))
+        self.assertEqual(timings[0].cycle_time, timedelta(days=5))
@@ -0,0 +1,135 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from apps.projects.models import Project
+from apps.tasks.facets import compute_facets, get_cached_facets
+from apps.tasks.models import Task
+from apps.tasks.search import search_tasks
+
+User = get_user_model()
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class TaskFacetsTestCase(TestCase):
+    """Тесты счётчиков фильтров списка задач"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="owner", password="x")
+        self.worker = User.objects.create_user(username="worker", password="x")
+        self.alpha = Project.objects.create(name="Альфа", creator=self.user)
+        self.beta = Project.objects.create(name="Бета", creator=self.user)
+
+        Task.objects.bulk_create(
+            [
+                Task(
+                    title="Отчёт",
+                    project=self.alpha,
+                    assignee=self.worker,
+                    status=Task.Status.DONE,
+                    priority=Task.Priority.HIGH,
+                ),
+                Task(
+                    title="Отчёт для клиента",
+                    project=self.alpha,
+                    assignee=self.worker,
+                    status=Task.Status.IN_PROGRESS,
+                ),
+                Task(title="Вёрстка", project=self.beta),
+            ]
+        )
+
+    def test_counts_in_one_grouped_query(self):
+        """Все фасеты одним группирующим запросом (плюс названия проектов)"""
+        with self.assertNumQueries(2):
+            facets = compute_facets(Task.objects.all())
+
+        self.assertEqual(facets.total, 3)
+        self.assertEqual((facets.done, facets.active), (1, 2))
+        self.assertEqual(
+            facets.status,
+            {Task.Status.DONE: 1, Task.Status.IN_PROGRESS: 1, Task.Status.TODO: 1},
+        )
+        self.assertEqual(
+            facets.priority, {Task.Priority.HIGH: 1, Task.Priority.MEDIUM: 2}
+        )
+        self.assertEqual(facets.project, {self.alpha.pk: 2, self.beta.pk: 1})
+        self.assertEqual(facets.assignee, {self.worker.pk: 2, None: 1})
+        self.assertEqual([p.name for p in facets.projects], ["Альфа", "Бета"])
+
+    def test_counts_follow_filters_and_search(self):
+        """Счётчики считаются по отфильтрованной выборке"""
+        tasks = search_tasks(Task.objects.exclude(status=Task.Status.DONE), "Отчёт")
+
+        facets = compute_facets(tasks)
+
+        self.assertEqual(facets.total, 1)
+        self.assertEqual(facets.status, {Task.Status.IN_PROGRESS: 1})
+        self.assertEqual([p.pk for p in facets.projects], [self.alpha.pk])
+
+    def test_cached_by_filter_signature(self):
+        """Повторный запрос с теми же фильтрами берётся из кэша"""
+        facets = get_cached_facets(Task.objects.filter(project=self.alpha))
+        self.assertEqual(facets.total, 2)
+
+        with self.assertNumQueries(0):
+            cached = get_cached_facets(Task.objects.filter(project=self.alpha))
+        self.assertEqual(cached.status, facets.status)
+
+        with self.assertNumQueries(2):
+            other = get_cached_facets(Task.objects.filter(project=self.beta))
+        self.assertEqual(other.total, 1)
+
+    def test_cache_reset_on_task_change(self):
+        """После изменения задачи счётчики пересчитываются"""
+        tasks = Task.objects.filter(project=self.alpha)
+        self.assertEqual(get_cached_facets(tasks).done, 1)
+
+        task = Task.objects.get(status=Task.Status.IN_PROGRESS)
+        task.status = Task.Status.DONE
+        task.save()
+
+        self.assertEqual(get_cached_facets(tasks).done, 2)
+
+    def test_change_in_other_project_keeps_cache(self):
+        """Изменение задачи сбрасывает счётчики только её проекта"""
+        alpha = Task.objects.filter(project=self.alpha)
+        beta = Task.objects.filter(project=self.beta)
+        get_cached_facets(alpha)
+        get_cached_facets(beta)
+
+        task = Task.objects.get(project=self.beta)
+        task.status = Task.Status.DONE
+        task.save()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_cached_facets(alpha).done, 1)
+        self.assertEqual(get_cached_facets(beta).done, 1)
+
+    def test_moved_task_resets_both_projects(self):
+        """Перенос задачи сбрасывает счётчики прежнего и нового проекта"""
+        alpha = Task.objects.filter(project=self.alpha)
+        beta = Task.objects.filter(project=self.beta)
+        get_cached_facets(alpha)
+        get_cached_facets(beta)
+
+        task = Task.objects.get(project=self.beta)
+        task.project = self.alpha
+        task.save()
+
+        self.assertEqual(get_cached_facets(alpha).total, 3)
+        self.assertEqual(get_cached_facets(beta).total, 0)
+
+    def test_project_rename_resets_cache(self):
+        """Новое название проекта сразу видно в фильтре"""
+        tasks = Task.objects.all()
+        get_cached_facets(tasks)
+
+        self.beta.name = "Гамма"
+        self.beta.save()
+
+        names = [p.name for p in get_cached_facets(tasks).projects]
+        self.assertEqual(names, ["Альфа", "Гамма"])
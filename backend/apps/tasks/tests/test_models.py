@@ -154,4 +154,92 @@ class TaskModelTestCase(TestCase):
         """Тест verbose_name в Meta классе"""
         self.assertEqual(Task._meta.verbose_name, "Задача")
         self.assertEqual(Task._meta.verbose_name_plural, "Задачи")
-        self.assertEqual(Task._meta.ordering, ["-priority", "-created_at"])
+        self.assertEqual(Task._meta.ordering, ["-priority_rank", "-created_at"])
+
+
+class TaskFieldTrackerTestCase(TestCase):
+    """Тесты для отслеживания изменений полей задачи"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="tracker_user", email="tracker@example.com", password="pass12345"
+        )
+        self.project = Project.objects.create(name="Tracker", creator=self.user)
+        self.task = Task.objects.create(
+            title="Tracked", project=self.project, creator=self.user
+        )
+
+    def test_no_changes_after_load(self):
+        """Загруженная задача не имеет изменений"""
+        task = Task.objects.get(pk=self.task.pk)
+        self.assertEqual(task.changed_fields, [])
+
+    def test_changed_fields_and_previous_values(self):
+        """Изменённые поля и их прежние значения"""
+        task = Task.objects.get(pk=self.task.pk)
+        task.status = Task.Status.IN_PROGRESS
+        task.assignee = self.user
+
+        self.assertEqual(task.changed_fields, ["status", "assignee"])
+        self.assertEqual(task.get_previous("status"), Task.Status.TODO)
+        self.assertIsNone(task.get_previous("assignee"))
+
+    def test_snapshot_reset_after_save(self):
+        """После сохранения снимок обновляется"""
+        self.task.status = Task.Status.DONE
+        self.task.save()
+
+        self.assertEqual(self.task.changed_fields, [])
+        self.assertEqual(self.task.get_previous("status"), Task.Status.DONE)
+
+    def test_save_does_not_reload_task(self):
+        """Сохранение не перечитывает задачу из БД ради сравнения полей"""
+        task = Task.objects.select_related("project").get(pk=self.task.pk)
+        task.title = "Renamed"
+
+        # Только UPDATE самой задачи
+        with self.assertNumQueries(1):
+            task.save()
+
+    def test_deferred_fields_are_not_loaded(self):
+        """Отложенные поля не загружаются трекером"""
+        task = Task.objects.only("id", "title").get(pk=self.task.pk)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(task.changed_fields, [])
+
+
+class TaskPriorityRankTestCase(TestCase):
+    """Тесты для числового ранга приоритета"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="rank_user", email="rank@example.com", password="pass12345"
+        )
+        self.project = Project.objects.create(name="Rank", creator=self.user)
+
+    def create_task(self, priority):
+        return Task.objects.create(
+            title=priority, project=self.project, creator=self.user, priority=priority
+        )
+
+    def test_default_ordering_by_priority(self):
+        """Сортировка по умолчанию: от критических к низким"""
+        for priority in ["low", "critical", "medium", "high"]:
+            self.create_task(priority)
+
+        self.assertEqual(
+            list(Task.objects.values_list("priority", flat=True)),
+            ["critical", "high", "medium", "low"],
+        )
+
+    def test_rank_synced_with_update_fields(self):
+        """Ранг обновляется и при save(update_fields=["priority"])"""
+        task = self.create_task(Task.Priority.LOW)
+        self.assertEqual(task.priority_rank, 1)
+
+        task.priority = Task.Priority.CRITICAL
+        task.save(update_fields=["priority"])
+
+        task.refresh_from_db()
+        self.assertEqual(task.priority_rank, 4)
@@ -0,0 +1,148 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.notifications.models import OutboxMessage
+from apps.projects.models import Project
+from apps.tasks.models import Task
+from apps.tasks.overdue import DIGEST_MAX_LINES, scan_overdue
+
+User = get_user_model()
+
+
+@override_settings(TELEGRAM_CHAT_IDS={"admin": "100"})
+class OverdueScanTestCase(TestCase):
+    """Тесты сводок о просроченных задачах"""
+
+    def setUp(self):
+        self.today = timezone.now().date()
+        self.manager = User.objects.create_user(
+            username="manager", password="x", telegram_chat_id="200"
+        )
+        self.assignees = [
+            User.objects.create_user(
+                username=f"worker_{i}", password="x", telegram_chat_id=str(300 + i)
+            )
+            for i in range(3)
+        ]
+        self.projects = [
+            Project.objects.create(name=f"Проект {i}", creator=self.manager)
+            for i in range(2)
+        ]
+
+        tasks = []
+        for i in range(60):
+            tasks.append(
+                Task(
+                    title=f"Задача {i}",
+                    project=self.projects[i % 2],
+                    creator=self.manager,
+                    assignee=self.assignees[i % 3],
+                    status=Task.Status.IN_PROGRESS,
+                    due_date=self.today - timedelta(days=1 + i % 5),
+                )
+            )
+        tasks.append(
+            Task(
+                title="Готова",
+                project=self.projects[0],
+                creator=self.manager,
+                status=Task.Status.DONE,
+                due_date=self.today - timedelta(days=3),
+            )
+        )
+        tasks.append(
+            Task(
+                title="Срок не прошёл",
+                project=self.projects[0],
+                creator=self.manager,
+                due_date=self.today + timedelta(days=1),
+            )
+        )
+        Task.objects.bulk_create(tasks)
+
+    def messages(self):
+        return list(OutboxMessage.objects.order_by("id"))
+
+    def test_digests_per_assignee_and_project(self):
+        """Десятки задач - по одной сводке на исполнителя, проект и админа"""
+        report = scan_overdue(chunk_size=7)
+
+        self.assertEqual(report.tasks, 60)
+        self.assertEqual((report.assignees, report.projects), (3, 2))
+        messages = self.messages()
+        self.assertEqual(len(messages), 3 + 2 + 1)
+        self.assertEqual(report.messages, len(messages))
+
+        recipients = {m.recipient for m in messages}
+        self.assertEqual(recipients, {"100", "200", "300", "301", "302"})
+
+        worker = next(m for m in messages if m.recipient == "300")
+        self.assertIn("Ваши просроченные задачи", worker.body)
+        self.assertEqual(worker.body.count("•"), 20)
+
+        project = next(m for m in messages if "Проект 0" in m.body)
+        self.assertEqual(project.body.count("•"), DIGEST_MAX_LINES)
+        self.assertIn(f"и ещё {30 - DIGEST_MAX_LINES}", project.body)
+
+    def test_projects_with_same_name(self):
+        """Проекты с одинаковым названием в сводке админа не сливаются"""
+        Project.objects.filter(pk=self.projects[1].pk).update(name="Проект 0")
+
+        scan_overdue()
+
+        summary = OutboxMessage.objects.get(recipient="100").body
+        self.assertEqual(summary.count("📁 Проект 0: 30"), 2)
+
+    def test_streaming_query_count(self):
+        """Задачи читаются одним запросом с JOIN, без ленивых загрузок"""
+        with CaptureQueriesContext(connection) as queries:
+            scan_overdue(chunk_size=20)
+
+        selects = [q["sql"] for q in queries if q["sql"].startswith("SELECT")]
+        self.assertEqual(len(selects), 1)
+        self.assertIn("JOIN", selects[0])
+        updates = [q["sql"] for q in queries if q["sql"].startswith("UPDATE")]
+        self.assertEqual(len(updates), 3)
+
+    def test_repeat_run_only_new(self):
+        """Повторный запуск не повторяет уведомления"""
+        scan_overdue()
+        OutboxMessage.objects.all().delete()
+
+        report = scan_overdue()
+        self.assertEqual(report.tasks, 0)
+        self.assertEqual(self.messages(), [])
+
+        # Срок перенесли, и он снова прошёл - новое уведомление
+        task = Task.objects.filter(title="Задача 0").get()
+        Task.objects.filter(pk=task.pk).update(due_date=self.today - timedelta(days=10))
+        report = scan_overdue()
+        self.assertEqual(report.tasks, 1)
+        self.assertIn("Задача 0", self.messages()[0].body)
+
+    def test_notified_does_not_touch_updated_at(self):
+        """Отметка об уведомлении не меняет updated_at (синхронизация)"""
+        before = dict(Task.objects.values_list("pk", "updated_at"))
+        scan_overdue()
+        self.assertEqual(dict(Task.objects.values_list("pk", "updated_at")), before)
+
+    def test_command_dry_run(self):
+        """check_overdue --dry-run ничего не отправляет и не отмечает"""
+        out = StringIO()
+        call_command("check_overdue", dry_run=True, stdout=out)
+
+        self.assertIn("Новых просроченных задач: 60", out.getvalue())
+        self.assertEqual(self.messages(), [])
+        self.assertFalse(
+            Task.objects.filter(overdue_notified_for__isnull=False).exists()
+        )
+
+        call_command("check_overdue", stdout=out)
+        self.assertIn("сводок в очереди: 6", out.getvalue())
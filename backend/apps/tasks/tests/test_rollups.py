@@ -0,0 +1,193 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.projects.models import Project
+from apps.tasks.models import Task, TaskDailyStats
+from apps.tasks.rollups import (
+    backfill,
+    burndown,
+    day_bounds,
+    period_report,
+    rollup_day,
+    rollup_pending,
+)
+
+User = get_user_model()
+
+
+class TaskCompletedAtTestCase(TestCase):
+    """Тесты отметки времени выполнения задачи"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="owner", password="x")
+        self.project = Project.objects.create(name="Проект", creator=self.user)
+        self.task = Task.objects.create(
+            title="Задача", project=self.project, creator=self.user
+        )
+
+    def test_set_on_done_and_cleared_on_reopen(self):
+        """completed_at ставится при выполнении и сбрасывается при возврате"""
+        self.assertIsNone(self.task.completed_at)
+
+        self.task.status = Task.Status.DONE
+        self.task.save(update_fields=["status"])
+        self.task.refresh_from_db()
+        self.assertIsNotNone(self.task.completed_at)
+
+        self.task.status = Task.Status.IN_PROGRESS
+        self.task.save()
+        self.task.refresh_from_db()
+        self.assertIsNone(self.task.completed_at)
+
+    def test_other_edits_keep_completed_at(self):
+        """Правка выполненной задачи не сдвигает completed_at"""
+        self.task.status = Task.Status.DONE
+        self.task.save()
+        completed_at = timezone.now() - timedelta(days=10)
+        Task.objects.filter(pk=self.task.pk).update(completed_at=completed_at)
+
+        task = Task.objects.get(pk=self.task.pk)
+        task.title = "Новое название"
+        task.save()
+        task.refresh_from_db()
+        self.assertEqual(task.completed_at, completed_at)
+
+
+class TaskRollupTestCase(TestCase):
+    """Тесты дневных срезов задач и отчётов по ним"""
+
+    def setUp(self):
+        self.today = timezone.localdate()
+        self.user = User.objects.create_user(username="owner", password="x")
+        self.worker = User.objects.create_user(username="worker", password="x")
+        self.project = Project.objects.create(name="Проект", creator=self.user)
+        self.other = Project.objects.create(name="Другой", creator=self.user)
+
+    def at(self, days_ago: int):
+        """Полдень дня, бывшего days_ago дней назад"""
+        start, _ = day_bounds(self.today - timedelta(days=days_ago))
+        return start + timedelta(hours=12)
+
+    def make_task(self, created_ago, completed_ago=None, project=None, **kwargs):
+        status = Task.Status.DONE if completed_ago is not None else Task.Status.TODO
+        task = Task.objects.create(
+            title="Задача",
+            project=project or self.project,
+            creator=self.user,
+            status=kwargs.pop("status", status),
+            **kwargs,
+        )
+        Task.objects.filter(pk=task.pk).update(
+            created_at=self.at(created_ago),
+            completed_at=(
+                self.at(completed_ago) if completed_ago is not None else None
+            ),
+        )
+        return task
+
+    def test_rollup_day_groups_tasks(self):
+        """Срез группирует задачи и считает созданные и выполненные за день"""
+        self.make_task(5, assignee=self.worker, priority=Task.Priority.HIGH)
+        self.make_task(2, assignee=self.worker, priority=Task.Priority.HIGH)
+        self.make_task(3, completed_ago=2, assignee=self.worker)
+        self.make_task(1)  # ещё не существовала
+
+        day = self.today - timedelta(days=2)
+        # Группировка, delete и insert (и savepoint вокруг них)
+        with self.assertNumQueries(5):
+            self.assertEqual(rollup_day(day), 2)
+
+        high = TaskDailyStats.objects.get(date=day, priority=Task.Priority.HIGH)
+        self.assertEqual(high.status, Task.Status.TODO)
+        self.assertEqual(high.assignee, self.worker)
+        self.assertEqual((high.task_count, high.created_count), (2, 1))
+
+        done = TaskDailyStats.objects.get(date=day, status=Task.Status.DONE)
+        self.assertEqual((done.task_count, done.completed_count), (1, 1))
+
+    def test_task_completed_later_counts_as_open(self):
+        """Задача, выполненная позже, в прошлом срезе не считается выполненной"""
+        self.make_task(5, completed_ago=1)
+
+        rollup_day(self.today - timedelta(days=3))
+
+        row = TaskDailyStats.objects.get()
+        self.assertEqual(row.status, Task.Status.IN_PROGRESS)
+        self.assertEqual(row.completed_count, 0)
+
+    def test_rollup_pending_fills_only_missing_days(self):
+        """Досчитываются дни после последнего среза, по вчерашний"""
+        self.make_task(4)
+
+        days = rollup_pending()
+        self.assertEqual(len(days), 4)
+        self.assertEqual(days[-1], self.today - timedelta(days=1))
+        self.assertEqual(rollup_pending(), [])
+
+        # Повторный пересчёт не дублирует строки
+        backfill()
+        self.assertEqual(TaskDailyStats.objects.count(), 4)
+
+    def test_period_report_and_burndown(self):
+        """Отчёт за период и burndown читают только срезы"""
+        self.make_task(10)
+        self.make_task(6, completed_ago=3)
+        self.make_task(5, completed_ago=1, project=self.other)
+        self.make_task(2)
+        backfill()
+
+        end = self.today - timedelta(days=1)
+        with self.assertNumQueries(2):
+            report = period_report(end - timedelta(days=6), end)
+        self.assertEqual((report.created, report.completed), (3, 2))
+        self.assertEqual((report.total, report.active, report.done), (4, 2, 2))
+
+        project_report = period_report(end - timedelta(days=6), end, self.project)
+        self.assertEqual((project_report.created, project_report.completed), (2, 1))
+
+        with self.assertNumQueries(1):
+            points = burndown(end - timedelta(days=3), end)
+        self.assertEqual([count for _, count in points], [3, 2, 3, 2])
+
+    @override_settings(TELEGRAM_CHAT_IDS={"admin": "100"})
+    def test_weekly_report_ignores_edits_of_old_tasks(self):
+        """Правка давно выполненной задачи не попадает в выполненные за неделю"""
+        old = self.make_task(30, completed_ago=20)
+        self.make_task(3, completed_ago=2)
+        old = Task.objects.get(pk=old.pk)
+        old.title = "Поправили описание"
+        old.save()
+
+        with mock.patch(
+            "apps.tasks.management.commands.weekly_report.send_telegram_message"
+        ) as send:
+            call_command("weekly_report", stdout=StringIO())
+
+        message = send.call_args.args[1]
+        self.assertIn("Создано задач: 1", message)
+        self.assertIn("Выполнено задач: 1", message)
+        self.assertIn("Всего задач: 2", message)
+        self.assertFalse(TaskDailyStats.objects.filter(date=self.today).exists())
+
+    def test_rollup_command(self):
+        """Команда rollup_task_stats досчитывает и пересчитывает срезы"""
+        self.make_task(3)
+
+        out = StringIO()
+        call_command("rollup_task_stats", stdout=out)
+        self.assertIn("Посчитано дней: 3", out.getvalue())
+
+        out = StringIO()
+        call_command("rollup_task_stats", stdout=out)
+        self.assertIn("Все срезы уже посчитаны", out.getvalue())
+
+        since = (self.today - timedelta(days=1)).isoformat()
+        out = StringIO()
+        call_command("rollup_task_stats", backfill=True, since=since, stdout=out)
+        self.assertIn("Посчитано дней: 1", out.getvalue())
@@ -0,0 +1,70 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db.models import Q
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.projects.models import Project
+from apps.tasks.models import Task
+from apps.tasks.stats import TaskStats
+
+User = get_user_model()
+
+
+class TaskStatsTestCase(TestCase):
+    """Тесты для агрегированной статистики задач"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="stats_user", email="stats@example.com", password="pass12345"
+        )
+        self.project = Project.objects.create(name="Stats", creator=self.user)
+        yesterday = timezone.now().date() - timedelta(days=1)
+
+        def create(**kwargs):
+            return Task.objects.create(
+                title="Task", project=self.project, creator=self.user, **kwargs
+            )
+
+        create(status=Task.Status.TODO, priority=Task.Priority.HIGH)
+        create(status=Task.Status.TODO, due_date=yesterday, assignee=self.user)
+        create(status=Task.Status.DONE, due_date=yesterday, assignee=self.user)
+        create(status=Task.Status.BLOCKED, priority=Task.Priority.CRITICAL)
+
+    def test_single_query(self):
+        """Все счётчики считаются одним запросом"""
+        with self.assertNumQueries(1):
+            TaskStats.for_queryset(Task.objects.all())
+
+    def test_counters(self):
+        """Корректность счётчиков"""
+        stats = TaskStats.for_queryset(Task.objects.all())
+
+        self.assertEqual(stats.total, 4)
+        self.assertEqual(stats.by_status["todo"], 2)
+        self.assertEqual(stats.by_status["done"], 1)
+        self.assertEqual(stats.by_status["in_progress"], 0)
+        self.assertEqual(stats.by_priority["medium"], 2)
+        self.assertEqual(stats.by_priority["critical"], 1)
+        self.assertEqual(stats.overdue, 1)
+        self.assertEqual(stats.unassigned, 2)
+        self.assertEqual(stats.active, 3)
+
+    def test_breakdown_and_extra(self):
+        """Проценты и дополнительные счётчики"""
+        stats = TaskStats.for_queryset(
+            Task.objects.filter(project=self.project),
+            extra={"high_or_critical": Q(priority__in=["high", "critical"])},
+        )
+
+        self.assertEqual(stats["high_or_critical"], 2)
+        self.assertEqual(stats.status_breakdown()["todo"]["percentage"], 50.0)
+        self.assertEqual(stats.as_dict()["blocked"], 1)
+
+    def test_empty_queryset(self):
+        """Пустой набор задач"""
+        stats = TaskStats.for_queryset(Task.objects.none())
+
+        self.assertEqual(stats.total, 0)
+        self.assertEqual(stats.percentage(0), 0)
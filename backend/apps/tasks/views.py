@@ -7,7 +7,10 @@ from datetime import date
 from django.http import HttpResponseForbidden, JsonResponse
 from django.views.decorators.http import require_POST
 
+from .facets import get_cached_facets
 from .models import Task
+from .search import search_tasks
+from .stats import TaskStats
 from apps.projects.models import Project
 from apps.users.models import User
 from django.db import models
@@ -68,6 +71,8 @@ def create_task(request):
                 priority=priority,
                 status=Task.Status.TODO,
             )
+            # Автор следующих изменений (исполнитель, срок) в журнале событий
+            task.changed_by = request.user
 
             # Назначаем исполнителя
             if assignee_id:
@@ -162,31 +167,25 @@ def task_list(request):
         if project_filter and project_filter != "all":
             tasks = tasks.filter(project_id=project_filter)
 
-        # Поиск
-        search_query = request.GET.get("q")
+        # Поиск (полнотекстовый в PostgreSQL), самые подходящие сверху
+        search_query = request.GET.get("q", "").strip()
         if search_query:
-            tasks = tasks.filter(title__icontains=search_query)
+            tasks = search_tasks(tasks, search_query)
 
-        # Статистика
-        total_tasks = tasks.count()
-        active_tasks = tasks.exclude(status=Task.Status.DONE).count()
-        completed_tasks = tasks.filter(status=Task.Status.DONE).count()
-
-        # Получаем доступные проекты для фильтра
-        available_projects = Project.objects.filter(
-            id__in=tasks.values_list("project", flat=True).distinct()
-        )
+        # Статистика и счётчики фильтров одним запросом (с кэшем)
+        facets = get_cached_facets(tasks)
 
         context = {
             "tasks": tasks,
             "view_type": view_type,
-            "total_tasks": total_tasks,
-            "active_tasks": active_tasks,
-            "completed_tasks": completed_tasks,
+            "total_tasks": facets.total,
+            "active_tasks": facets.active,
+            "completed_tasks": facets.done,
+            "facets": facets,
             "status_filter": status_filter or "all",
             "project_filter": project_filter or "all",
             "search_query": search_query or "",
-            "available_projects": available_projects,
+            "available_projects": facets.projects,
             "status_choices": Task.Status.choices,
             "priority_choices": Task.Priority.choices,
             "today": timezone.now().date(),
@@ -220,6 +219,7 @@ def task_detail(request, task_id):
             new_status = request.POST.get("new_status")
             if new_status in dict(Task.Status.choices):
                 task.status = new_status
+                task.changed_by = request.user
                 task.save()
                 messages.success(
                     request,
@@ -301,6 +301,7 @@ def edit_task(request, task_id):
             else:
                 task.due_date = None
 
+            task.changed_by = request.user
             task.save()
             messages.success(request, f'✅ Задача "{task.title}" обновлена успешно!')
             return redirect("tasks:task_detail", task_id=task.id)
@@ -336,6 +337,7 @@ def delete_task(request, task_id):
 
         if request.method == "POST":
             task_title = task.title
+            task.changed_by = request.user
             task.delete()
             messages.success(request, f'✅ Задача "{task_title}" удалена успешно!')
             return redirect("tasks:task_list")
@@ -377,6 +379,7 @@ def change_task_status(request, task_id):
         # Обновляем статус
         old_status_display = dict(Task.Status.choices)[task.status]
         task.status = new_status
+        task.changed_by = request.user
         task.save()
         new_status_display = dict(Task.Status.choices)[task.status]
 
@@ -399,47 +402,16 @@ def change_task_status(request, task_id):
 def my_tasks(request):
     """Мои задачи (для сотрудников)"""
     try:
-        # Задачи, где пользователь исполнитель
-        assigned_tasks = Task.objects.filter(assignee=request.user).order_by(
-            "-created_at"
-        )
-
-        # Задачи, созданные пользователем
-        created_tasks = Task.objects.filter(creator=request.user).order_by(
-            "-created_at"
-        )
-
-        # Объединяем и убираем дубликаты
-        task_ids = set(assigned_tasks.values_list("id", flat=True))
-        task_ids.update(created_tasks.values_list("id", flat=True))
-        tasks = Task.objects.filter(id__in=task_ids).order_by("-created_at")
-
-        # Статистика
-        stats = {
-            "total": tasks.count(),
-            "todo": tasks.filter(status=Task.Status.TODO).count(),
-            "in_progress": tasks.filter(status=Task.Status.IN_PROGRESS).count(),
-            "review": tasks.filter(status=Task.Status.REVIEW).count(),
-            "done": tasks.filter(status=Task.Status.DONE).count(),
-            "blocked": tasks.filter(status=Task.Status.BLOCKED).count(),
-        }
-
-        # Просроченные задачи
-        stats["overdue"] = tasks.filter(
-            due_date__lt=timezone.now().date(),
-            status__in=[Task.Status.TODO, Task.Status.IN_PROGRESS, Task.Status.REVIEW],
-        ).count()
+        # Назначенные и созданные пользователем задачи одним условием
+        tasks = Task.objects.filter(
+            models.Q(assignee=request.user) | models.Q(creator=request.user)
+        ).order_by("-created_at")
 
-        # Задачи по приоритету
-        stats["critical"] = tasks.filter(priority=Task.Priority.CRITICAL).count()
-        stats["high"] = tasks.filter(priority=Task.Priority.HIGH).count()
-        stats["medium"] = tasks.filter(priority=Task.Priority.MEDIUM).count()
-        stats["low"] = tasks.filter(priority=Task.Priority.LOW).count()
+        # Статистика одним запросом
+        stats = TaskStats.for_queryset(tasks).as_dict()
 
         context = {
             "tasks": tasks,
-            "assigned_tasks": assigned_tasks,
-            "created_tasks": created_tasks,
             "stats": stats,
             "status_choices": Task.Status.choices,
             "priority_choices": Task.Priority.choices,
@@ -466,42 +438,13 @@ def task_statistics(request):
                 models.Q(assignee=request.user) | models.Q(creator=request.user)
             )
 
-        # Статистика по статусам
-        status_stats = {}
-        for status_code, status_name in Task.Status.choices:
-            status_stats[status_code] = {
-                "name": status_name,
-                "count": tasks.filter(status=status_code).count(),
-                "percentage": 0,
-            }
-
-        # Статистика по приоритетам
-        priority_stats = {}
-        for priority_code, priority_name in Task.Priority.choices:
-            priority_stats[priority_code] = {
-                "name": priority_name,
-                "count": tasks.filter(priority=priority_code).count(),
-                "percentage": 0,
-            }
-
-        total_tasks = tasks.count()
-
-        # Рассчитываем проценты
-        if total_tasks > 0:
-            for stat in status_stats.values():
-                stat["percentage"] = round((stat["count"] / total_tasks) * 100, 1)
-
-            for stat in priority_stats.values():
-                stat["percentage"] = round((stat["count"] / total_tasks) * 100, 1)
-
-        # Просроченные задачи
-        overdue_tasks = tasks.filter(
-            due_date__lt=timezone.now().date(),
-            status__in=[Task.Status.TODO, Task.Status.IN_PROGRESS, Task.Status.REVIEW],
-        ).count()
-
-        # Задачи без исполнителя
-        unassigned_tasks = tasks.filter(assignee__isnull=True).count()
+        # Все счётчики одним запросом
+        stats = TaskStats.for_queryset(tasks)
+        status_stats = stats.status_breakdown()
+        priority_stats = stats.priority_breakdown()
+        total_tasks = stats.total
+        overdue_tasks = stats.overdue
+        unassigned_tasks = stats.unassigned
 
         # Последние обновленные задачи
         recent_tasks = tasks.order_by("-updated_at")[:10]
@@ -542,6 +485,7 @@ def complete_task(request, task_id):
 
         # Меняем статус (убрали ненужную переменную old_status)
         task.status = Task.Status.DONE
+        task.changed_by = request.user
         task.save()
 
         # Логируем (добавили импорт logger или создаем локально)
@@ -549,12 +493,7 @@ def complete_task(request, task_id):
         logger = logging.getLogger(__name__)
         logger.info(f"✅ Пользователь {request.user.username} завершил задачу {task.id}")
 
-        # Отправляем уведомление (если сигналы настроены)
-        try:
-            from .signals import task_notification_system
-            task_notification_system(Task, task, created=False, kwargs={})
-        except Exception as e:  # Исправили голый except
-            logger.warning(f"⚠️ Не удалось отправить уведомление: {e}")
+        # Уведомления ставит в outbox сигнал post_save при task.save()
 
         messages.success(request, f"✅ Задача '{task.title}' выполнена!")
 
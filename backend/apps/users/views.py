@@ -29,6 +29,7 @@ def employee_required(view_func):
 def employee_dashboard(request):
     """Дашборд для сотрудника"""
     from apps.tasks.models import Task
+    from apps.tasks.stats import get_cached_stats, user_stats_key
 
     user = request.user
 
@@ -44,11 +45,12 @@ def employee_dashboard(request):
         due_date__lt=timezone.now().date(), status__in=["todo", "in_progress", "review"]
     )
 
-    # Статистика по статусам
-    status_stats = {}
-    for task in tasks:
-        status = task.status
-        status_stats[status] = status_stats.get(status, 0) + 1
+    # Счётчики для карточек: один агрегирующий запрос, кэш сбрасывается
+    # при изменении задач пользователя (apps.tasks.signals)
+    stats = get_cached_stats(user_stats_key(user.pk), tasks)
+
+    # Статистика по статусам (только встречающиеся статусы)
+    status_stats = {status: count for status, count in stats.by_status.items() if count}
 
     context = {
         "user": user,
@@ -57,6 +59,7 @@ def employee_dashboard(request):
         "completed_tasks": completed_tasks,
         "overdue_tasks": overdue_tasks,
         "status_stats": status_stats,
+        "stats": stats,
         "today": timezone.now().date(),
     }
 
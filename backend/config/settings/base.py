@@ -121,6 +121,11 @@ STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 MEDIA_URL = "media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Скачивание вложений: при True файл отдаёт nginx (X-Accel-Redirect),
+# путь FILE_DOWNLOAD_X_ACCEL_PREFIX должен быть internal location на MEDIA_ROOT
+FILE_DOWNLOAD_X_ACCEL_REDIRECT = False
+FILE_DOWNLOAD_X_ACCEL_PREFIX = "/protected-media/"
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
@@ -211,8 +216,34 @@ EMAIL_PORT = 25
 EMAIL_USE_TLS = False
 DEFAULT_FROM_EMAIL = "noreply@tasktracker.local"
 
+# Telegram Bot API (общий клиент с пулом соединений)
+TELEGRAM_API_URL = os.getenv("TELEGRAM_API_URL", "https://api.telegram.org")
+TELEGRAM_MAX_WORKERS = int(os.getenv("TELEGRAM_MAX_WORKERS", "8"))
+TELEGRAM_GLOBAL_RATE = 30  # сообщений в секунду на бота
+TELEGRAM_PER_CHAT_INTERVAL = 1.0  # секунд между сообщениями в один чат
+TELEGRAM_MAX_RETRIES = 3  # повторов при 429, 5xx и ошибках соединения
+TELEGRAM_TIMEOUT = 10  # секунд на запрос к Bot API
+
 # File upload settings
 MAX_UPLOAD_SIZE = 10 * 1024 * 1024  # 10MB
+# Загрузка частями (/api/files/uploads/): лимит больше, чем для одного POST,
+# каждая часть не больше CHUNKED_UPLOAD_CHUNK_SIZE (< client_max_body_size nginx)
+CHUNKED_UPLOAD_MAX_SIZE = 1024 * 1024 * 1024  # 1GB
+CHUNKED_UPLOAD_CHUNK_SIZE = 5 * 1024 * 1024  # 5MB
+CHUNKED_UPLOAD_DIR = MEDIA_ROOT / "chunks"
+CHUNKED_UPLOAD_EXPIRY_HOURS = 24
+# Уменьшенные копии изображений (наибольшая сторона, px), создаёт generate_renditions
+FILE_RENDITION_SIZES = {"preview": 1024, "thumbnail": 256}
+FILE_RENDITION_QUALITY = 85
+# Счётчики скачиваний копятся в памяти и пишутся в БД пачкой
+FILE_DOWNLOAD_COUNTER_FLUSH_SECONDS = 10
+FILE_DOWNLOAD_COUNTER_MAX_PENDING = 100
+# Фоновый поток сбрасывает буфер раз в FLUSH_SECONDS, даже без новых скачиваний
+FILE_DOWNLOAD_COUNTER_FLUSH_THREAD = True
+# Квота на суммарный размер загруженных пользователем файлов (None - без квоты)
+FILE_USER_QUOTA_BYTES = None
+# Строк-шардов на общий счётчик хранилища (всего, тип файла, блобы)
+STORAGE_USAGE_SHARDS = 8
 ALLOWED_FILE_TYPES = [
     "image/jpeg",
     "image/png",
@@ -279,6 +310,13 @@ CACHES = {
         "LOCATION": "unique-snowflake",
     }
 }
+TASK_STATS_CACHE_TIMEOUT = 60  # секунд, счётчики главной и дашборда
+TASK_FACETS_CACHE_TIMEOUT = 300  # секунд, счётчики фильтров списка задач
+
+# Инкрементальная синхронизация задач (/api/tasks/sync/)
+TASK_SYNC_PAGE_SIZE = 500
+TASK_SYNC_SAFETY_SECONDS = 5  # отставание курсора от текущего времени
+TASK_TOMBSTONE_RETENTION_DAYS = 30  # срок хранения отметок об удалении
 
 LOGIN_URL = "/employee/login/"
 LOGIN_REDIRECT_URL = "/dashboard/"  # Для сотрудников
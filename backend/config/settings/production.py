@@ -100,6 +100,11 @@ except (json.JSONDecodeError, TypeError):
 
 SITE_URL = os.getenv("SITE_URL", "")
 
+# Файлы отдаёт nginx (см. nginx/conf.d/task-tracker.conf)
+FILE_DOWNLOAD_X_ACCEL_REDIRECT = (
+    os.environ.get("FILE_DOWNLOAD_X_ACCEL_REDIRECT", "True") == "True"
+)
+
 # Email настройки
 EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
 EMAIL_HOST = os.environ.get("EMAIL_HOST", "smtp.gmail.com")
@@ -57,8 +57,12 @@ SIMPLE_JWT["REFRESH_TOKEN_LIFETIME"] = timedelta(hours=1)  # type: ignore
 
 # Тестовые медиа файлы
 MEDIA_ROOT = BASE_DIR / "test_media"  # type: ignore
+CHUNKED_UPLOAD_DIR = MEDIA_ROOT / "chunks"
 os.makedirs(MEDIA_ROOT, exist_ok=True)
 
+# Счётчики скачиваний сбрасываются явно (у потока своё соединение с БД)
+FILE_DOWNLOAD_COUNTER_FLUSH_THREAD = False
+
 # Настройки для тестов
 TEST_RUNNER = "django.test.runner.DiscoverRunner"
 
@@ -19,6 +19,8 @@ from api.views import diagnostic, telegram
 from django.contrib.auth.views import LogoutView
 from django.contrib.auth import logout as auth_logout
 
+HOME_COUNTERS_CACHE_KEY = "home_view:counters"
+
 
 def home_view(request):
     """Главная страница для неавторизованных пользователей"""
@@ -48,31 +50,32 @@ def home_view(request):
         try:
             from apps.projects.models import Project
             from apps.tasks.models import Task
+            from apps.tasks.stats import get_stats_cache_timeout, TaskStats
             from django.contrib.auth import get_user_model
-
-            context["projects_count"] = Project.objects.count()
-            context["total_tasks"] = Task.objects.count()
-            context["users_count"] = get_user_model().objects.count()
-
-            # Статистика по статусам
-            status_counts = {}
-            for task in Task.objects.all():
-                status = task.status
-                status_counts[status] = status_counts.get(status, 0) + 1
-
-            context.update(
-                {
-                    "todo_count": status_counts.get("todo", 0),
-                    "in_progress_count": status_counts.get("in_progress", 0),
-                    "review_count": status_counts.get("review", 0),
-                    "completed_tasks_count": status_counts.get("done", 0),
+            from django.core.cache import cache
+
+            # Счётчики общие для всех посетителей главной, держим их в кэше
+            counters = cache.get(HOME_COUNTERS_CACHE_KEY)
+            if counters is None:
+                stats = TaskStats.for_queryset(Task.objects.all())
+                by_status = stats.by_status
+                counters = {
+                    "projects_count": Project.objects.count(),
+                    "total_tasks": stats.total,
+                    "users_count": get_user_model().objects.count(),
+                    "todo_count": by_status[Task.Status.TODO],
+                    "in_progress_count": by_status[Task.Status.IN_PROGRESS],
+                    "review_count": by_status[Task.Status.REVIEW],
+                    "completed_tasks_count": by_status[Task.Status.DONE],
                     "active_tasks_count": (
-                        status_counts.get("todo", 0)
-                        + status_counts.get("in_progress", 0)
-                        + status_counts.get("review", 0)
+                        by_status[Task.Status.TODO]
+                        + by_status[Task.Status.IN_PROGRESS]
+                        + by_status[Task.Status.REVIEW]
                     ),
                 }
-            )
+                cache.set(HOME_COUNTERS_CACHE_KEY, counters, get_stats_cache_timeout())
+
+            context.update(counters)
 
         except Exception as db_error:
             # Если таблицы еще не созданы